@@ -0,0 +1,97 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, ClassVar, TypeVar
+
+import grpc
+import msgspec
+from dishka import AsyncContainer
+
+from app.domain.errors.base import DomainError
+
+T = TypeVar("T")
+
+# DomainError.code carries an HTTP status
+STATUS_CODES: dict[int, grpc.StatusCode] = {
+    400: grpc.StatusCode.INVALID_ARGUMENT,
+    404: grpc.StatusCode.NOT_FOUND,
+    409: grpc.StatusCode.ALREADY_EXISTS,
+    422: grpc.StatusCode.INVALID_ARGUMENT,
+    429: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    503: grpc.StatusCode.UNAVAILABLE,
+}
+
+
+class BaseGrpcController:
+    """
+    Services are registered as generic handlers that carry msgpack-encoded
+    msgspec Structs, the same request and response types the HTTP API uses,
+    so there are no protobuf stubs to generate or convert. Every call opens a
+    dishka request scope and resolves its use case handler from it.
+    """
+
+    service: ClassVar[str] = ""
+
+    _encoder: ClassVar[msgspec.msgpack.Encoder] = msgspec.msgpack.Encoder()
+
+    def __init__(self, container: AsyncContainer):
+        self._container = container
+        self._methods: dict[str, grpc.RpcMethodHandler] = {}
+        self.register_methods()
+
+    def register_methods(self) -> None:
+        raise NotImplementedError
+
+    def generic_handler(self) -> grpc.GenericRpcHandler:
+        return grpc.method_handlers_generic_handler(self.service, self._methods)
+
+    def add_unary(
+        self,
+        name: str,
+        behavior: Callable[[Any, AsyncContainer], Awaitable[Any]],
+        request_type: type[T],
+    ) -> None:
+        decoder = msgspec.msgpack.Decoder(request_type)
+
+        async def call(payload: bytes, context: grpc.aio.ServicerContext) -> Any:
+            request = await self._decode(decoder, payload, context)
+            async with self._container() as container:
+                try:
+                    return await behavior(request, container)
+                except DomainError as exc:
+                    await self._abort(context, exc)
+
+        self._methods[name] = grpc.unary_unary_rpc_method_handler(
+            call, response_serializer=self._encoder.encode
+        )
+
+    def add_server_stream(
+        self,
+        name: str,
+        behavior: Callable[[Any, AsyncContainer], Awaitable[AsyncIterator[Any]]],
+        request_type: type[T],
+    ) -> None:
+        decoder = msgspec.msgpack.Decoder(request_type)
+
+        async def call(payload: bytes, context: grpc.aio.ServicerContext) -> AsyncIterator[Any]:
+            request = await self._decode(decoder, payload, context)
+            async with self._container() as container:
+                try:
+                    async for message in await behavior(request, container):
+                        yield message
+                except DomainError as exc:
+                    await self._abort(context, exc)
+
+        self._methods[name] = grpc.unary_stream_rpc_method_handler(
+            call, response_serializer=self._encoder.encode
+        )
+
+    @staticmethod
+    async def _decode(decoder: msgspec.msgpack.Decoder, payload: bytes, context: grpc.aio.ServicerContext) -> Any:
+        # Decoded here rather than as a request_deserializer, which can only fail with INTERNAL
+        try:
+            return decoder.decode(payload)
+        except msgspec.DecodeError as exc:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(exc))
+
+    @staticmethod
+    async def _abort(context: grpc.aio.ServicerContext, exc: DomainError) -> None:
+        code = STATUS_CODES.get(exc.code, grpc.StatusCode.INTERNAL)
+        await context.abort(code, exc.message)
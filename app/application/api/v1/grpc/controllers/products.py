@@ -0,0 +1,50 @@
+from typing import AsyncIterator
+
+from dishka import AsyncContainer
+
+from app.services.use_cases.products.add import AddProductRequest, AddProductResponse
+from app.services.use_cases.products.add.handler import AddProductHandler
+from app.services.use_cases.products.batch_get import BatchGetProductsRequest
+from app.services.use_cases.products.batch_get.handler import BatchGetProductsHandler
+from app.services.use_cases.products.batch_get.response import BatchGetProductsResponse
+from app.services.use_cases.products.get.handler import GetProductHandler
+from app.services.use_cases.products.get.request import GetProductRequest
+from app.services.use_cases.products.get.response import GetProductResponse
+from app.services.use_cases.products.list_products import ListProductsPage, ListProductsRequest
+from app.services.use_cases.products.list_products.handler import ListProductsHandler
+
+from .base import BaseGrpcController
+
+
+class ProductGrpcController(BaseGrpcController):
+    service = "products.v1.ProductService"
+
+    def register_methods(self) -> None:
+        self.add_unary("Get", self.get_product, GetProductRequest)
+        self.add_unary("BatchGet", self.batch_get_products, BatchGetProductsRequest)
+        self.add_unary("Add", self.add_product, AddProductRequest)
+        self.add_server_stream("List", self.list_products, ListProductsRequest)
+
+    @staticmethod
+    async def get_product(request: GetProductRequest, container: AsyncContainer) -> GetProductResponse:
+        handler = await container.get(GetProductHandler)
+        return await handler.handle(request)
+
+    @staticmethod
+    async def batch_get_products(
+        request: BatchGetProductsRequest, container: AsyncContainer
+    ) -> BatchGetProductsResponse:
+        handler = await container.get(BatchGetProductsHandler)
+        return await handler.handle(request)
+
+    @staticmethod
+    async def add_product(request: AddProductRequest, container: AsyncContainer) -> AddProductResponse:
+        handler = await container.get(AddProductHandler)
+        return await handler.handle(request)
+
+    @staticmethod
+    async def list_products(
+        request: ListProductsRequest, container: AsyncContainer
+    ) -> AsyncIterator[ListProductsPage]:
+        handler = await container.get(ListProductsHandler)
+        return await handler.handle(request)
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+
+import grpc
+from dishka import AsyncContainer
+
+from app.domain.common.constants import GRPC_ADDRESS
+from app.infrastructure.adapters.di.lifecycle import started
+from app.infrastructure.adapters.di.main import build_container
+
+from .controllers.products import ProductGrpcController
+
+logger = logging.getLogger(__name__)
+
+# Seconds in-flight calls get to finish on shutdown
+GRACE_PERIOD = 5.0
+
+
+def create_server(container: AsyncContainer, address: str = GRPC_ADDRESS) -> grpc.aio.Server:
+    server = grpc.aio.server(
+        options=[
+            ("grpc.so_reuseport", 1),
+            ("grpc.keepalive_time_ms", 30_000),
+        ],
+    )
+    server.add_generic_rpc_handlers([ProductGrpcController(container).generic_handler()])
+    server.add_insecure_port(address)
+    return server
+
+
+async def serve(container: AsyncContainer | None = None, address: str = GRPC_ADDRESS) -> None:
+    container = container or build_container()
+    server = create_server(container, address)
+
+    # Same startup and shutdown as the HTTP lifespan
+    async with started(container):
+        await server.start()
+        logger.info(f"gRPC server listening on {address}")
+        try:
+            await server.wait_for_termination()
+        except asyncio.CancelledError:
+            await server.stop(GRACE_PERIOD)
+            raise
@@ -0,0 +1,74 @@
+import inspect
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import msgspec
+from dishka import AsyncContainer
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI, Request, Response
+
+from app.domain.errors.base import DomainError
+from app.infrastructure.adapters.di.lifecycle import started
+from app.infrastructure.adapters.di.main import build_container
+
+from ..websocket.controllers.products import ProductChangesController
+from .controllers.base import BaseController
+from .controllers.diagnostics import DiagnosticsController
+from .controllers.health import HealthController
+from .controllers.metrics import MetricsController
+from .controllers.products import ProductController
+from .middleware import AdmissionControlMiddleware, RateLimitMiddleware, TracingMiddleware
+
+API_PREFIX = "/api/v1"
+
+# Newer FastAPI releases trace requests, dependencies and serialization on their
+# own once an SDK provider is installed. TracingMiddleware owns the server span,
+# so that would double the spans per request; older releases lack the option.
+FASTAPI_OPTIONS = (
+    {"telemetry": {"tracing": False, "operation_spans": False, "metrics": False, "logs": False}}
+    if "telemetry" in inspect.signature(FastAPI).parameters
+    else {}
+)
+
+
+async def domain_error_handler(request: Request, exc: DomainError) -> Response:
+    return BaseController.encode(exc.to_dict(), status_code=exc.code or 400)
+
+
+async def decode_error_handler(request: Request, exc: msgspec.DecodeError) -> Response:
+    # msgspec.ValidationError subclasses DecodeError: malformed JSON is a 400, bad fields a 422
+    status_code = 422 if isinstance(exc, msgspec.ValidationError) else 400
+    return BaseController.encode(
+        {"error": exc.__class__.__name__, "message": str(exc), "code": status_code},
+        status_code=status_code,
+    )
+
+
+def create_app(container: AsyncContainer | None = None) -> FastAPI:
+    container = container or build_container()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        async with started(container):
+            yield
+
+    app = FastAPI(lifespan=lifespan, **FASTAPI_OPTIONS)
+
+    # Routers are flattened onto the app, nested routers cost a match pass per level
+    app.include_router(ProductController().router, prefix=API_PREFIX)
+    app.include_router(ProductChangesController().router, prefix=API_PREFIX)
+    app.include_router(HealthController().router)
+    app.include_router(MetricsController().router)
+    app.include_router(DiagnosticsController().router)
+
+    # Last added runs first: rejected requests still get a request id, and
+    # throttled ones are turned away before they take an admission slot
+    app.add_middleware(AdmissionControlMiddleware, container=container)
+    app.add_middleware(RateLimitMiddleware, container=container)
+    app.add_middleware(TracingMiddleware)
+
+    app.add_exception_handler(DomainError, domain_error_handler)
+    app.add_exception_handler(msgspec.DecodeError, decode_error_handler)
+
+    setup_dishka(container, app)
+    return app
@@ -0,0 +1,50 @@
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from app.domain.dto import ProductValidator
+
+# Shared caches may store product bodies but must revalidate them on every use
+CACHE_CONTROL = "public, no-cache"
+
+
+def etag_for(validator: ProductValidator) -> str:
+    return f'"{validator.guid.hex}-{validator.version:x}"'
+
+
+def validator_headers(validator: ProductValidator) -> dict[str, str]:
+    return {
+        "ETag": etag_for(validator),
+        "Last-Modified": format_datetime(validator.last_modified, usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+    }
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, validator: ProductValidator) -> bool:
+    """RFC 9110 13.2.2: If-None-Match wins, If-Modified-Since only applies without it."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        etag = etag_for(validator)
+        # Weak comparison, as GET allows
+        return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return validator.last_modified <= since
+
+
+def not_modified(validator: ProductValidator) -> Response:
+    return Response(status_code=304, headers=validator_headers(validator))
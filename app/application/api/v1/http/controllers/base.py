@@ -1,5 +1,48 @@
+from typing import Any, ClassVar, TypeVar
+
+import msgspec
+from dishka.integrations.fastapi import DishkaRoute
+from fastapi import APIRouter, Request, Response
+
+T = TypeVar("T")
+
+JSON_MEDIA_TYPE = "application/json"
 
 
 class BaseController:
+    """
+    Controllers decode bodies and encode responses with msgspec directly, so
+    no pydantic model or jsonable_encoder pass sits on the request path.
+    Routes are registered with DishkaRoute, which resolves ``FromDishka``
+    parameters from the request container.
+    """
+
+    prefix: ClassVar[str] = ""
+    tags: ClassVar[list[str]] = []
+
+    _encoder: ClassVar[msgspec.json.Encoder] = msgspec.json.Encoder()
+
     def __init__(self):
-        ...
\ No newline at end of file
+        self.router = APIRouter(prefix=self.prefix, tags=self.tags, route_class=DishkaRoute)
+        self.register_routes()
+
+    def register_routes(self) -> None:
+        raise NotImplementedError
+
+    @staticmethod
+    async def decode(request: Request, type_: type[T]) -> T:
+        return msgspec.json.decode(await request.body(), type=type_)
+
+    @classmethod
+    def encode(
+        cls,
+        payload: Any,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        return Response(
+            content=cls._encoder.encode(payload),
+            status_code=status_code,
+            headers=headers,
+            media_type=JSON_MEDIA_TYPE,
+        )
@@ -0,0 +1,75 @@
+import hmac
+
+from dishka.integrations.fastapi import FromDishka
+from fastapi import Request, Response
+
+from app.domain.core.config.settings import DiagnosticsConfig
+from app.domain.errors.diagnostics import (
+    DiagnosticsDisabledError,
+    DiagnosticsForbiddenError,
+    InvalidProfileDurationError,
+)
+from app.infrastructure.adapters.diagnostics.startup import STARTUP
+from app.infrastructure.ports.diagnostics import LoopMonitorPort, LoopProfilerPort, QueryStatsPort
+
+from .base import BaseController
+
+# Collapsed stacks, one "frame;frame;frame count" line each: flamegraph.pl, speedscope, inferno
+FOLDED_MEDIA_TYPE = "text/plain; charset=utf-8"
+# Shortest sampling interval accepted, below it sampling competes with the loop for the GIL
+MIN_INTERVAL_MS = 1.0
+
+
+class DiagnosticsController(BaseController):
+    prefix = "/debug"
+    tags = ["diagnostics"]
+
+    def register_routes(self) -> None:
+        self.router.add_api_route("/loop/stalls", self.loop_stalls, methods=["GET"], response_class=Response)
+        self.router.add_api_route("/loop/profile", self.loop_profile, methods=["GET"], response_class=Response)
+        self.router.add_api_route("/queries", self.queries, methods=["GET"], response_class=Response)
+        self.router.add_api_route("/startup", self.startup, methods=["GET"], response_class=Response)
+
+    async def loop_stalls(
+        self,
+        request: Request,
+        config: FromDishka[DiagnosticsConfig],
+        monitor: FromDishka[LoopMonitorPort],
+    ) -> Response:
+        self._authorize(request, config)
+        return self.encode(monitor.stalls())
+
+    async def loop_profile(
+        self,
+        request: Request,
+        config: FromDishka[DiagnosticsConfig],
+        profiler: FromDishka[LoopProfilerPort],
+        seconds: float = 10.0,
+        interval_ms: float = 5.0,
+    ) -> Response:
+        self._authorize(request, config)
+        if not 0 < seconds <= config.profile_max_seconds:
+            raise InvalidProfileDurationError(config.profile_max_seconds)
+        stacks = await profiler.profile(seconds, max(interval_ms, MIN_INTERVAL_MS) / 1000)
+        return Response(content=stacks, media_type=FOLDED_MEDIA_TYPE)
+
+    async def queries(
+        self,
+        request: Request,
+        config: FromDishka[DiagnosticsConfig],
+        query_stats: FromDishka[QueryStatsPort],
+    ) -> Response:
+        self._authorize(request, config)
+        return self.encode(query_stats.snapshot())
+
+    async def startup(self, request: Request, config: FromDishka[DiagnosticsConfig]) -> Response:
+        self._authorize(request, config)
+        return self.encode(STARTUP.phases())
+
+    @staticmethod
+    def _authorize(request: Request, config: DiagnosticsConfig) -> None:
+        if not config.admin_token:
+            raise DiagnosticsDisabledError()
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), config.admin_token.encode()):
+            raise DiagnosticsForbiddenError()
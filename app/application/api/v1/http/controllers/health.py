@@ -0,0 +1,23 @@
+from dishka.integrations.fastapi import FromDishka
+from fastapi import Response
+
+from app.domain.common.enums import ReadinessStatus
+from app.infrastructure.adapters.cache.warmup import ProductCacheWarmer
+
+from .base import BaseController
+
+
+class HealthController(BaseController):
+    prefix = "/health"
+    tags = ["health"]
+
+    def register_routes(self) -> None:
+        self.router.add_api_route("/live", self.live, methods=["GET"], response_class=Response)
+        self.router.add_api_route("/ready", self.ready, methods=["GET"], response_class=Response)
+
+    async def live(self) -> Response:
+        return self.encode({"status": "ok"})
+
+    async def ready(self, warmer: FromDishka[ProductCacheWarmer]) -> Response:
+        status = warmer.status
+        return self.encode({"status": status}, status_code=200 if status == ReadinessStatus.READY else 503)
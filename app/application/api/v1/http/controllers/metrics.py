@@ -0,0 +1,20 @@
+from dishka.integrations.fastapi import FromDishka
+from fastapi import Response
+
+from app.infrastructure.adapters.monitoring.exporter import MetricsExporter
+from app.infrastructure.adapters.monitoring.metrics import render
+
+from .base import BaseController
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsController(BaseController):
+    prefix = "/metrics"
+    tags = ["monitoring"]
+
+    def register_routes(self) -> None:
+        self.router.add_api_route("", self.metrics, methods=["GET"], response_class=Response)
+
+    async def metrics(self, exporter: FromDishka[MetricsExporter]) -> Response:
+        return Response(content=render(exporter.collect()), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -0,0 +1,110 @@
+import uuid
+
+from dishka.integrations.fastapi import FromDishka
+from fastapi import Request, Response
+
+from app.domain.dto import ProductValidator
+from app.services.use_cases.products.add import AddProductRequest
+from app.services.use_cases.products.add.handler import AddProductHandler
+from app.services.use_cases.products.batch_get import BatchGetProductsRequest
+from app.services.use_cases.products.batch_get.handler import BatchGetProductsHandler
+from app.services.use_cases.products.export import ExportProductsRequest
+from app.services.use_cases.products.export.handler import ExportProductsHandler
+from app.services.use_cases.products.get.handler import GetProductHandler
+from app.services.use_cases.products.get.request import GetProductRequest
+from app.services.use_cases.products.get.response import GetProductResponse
+from app.services.use_cases.products.get_by_slug import GetProductBySlugRequest
+from app.services.use_cases.products.get_by_slug.handler import GetProductBySlugHandler
+from app.services.use_cases.products.get_validator import GetProductValidatorRequest
+from app.services.use_cases.products.get_validator.handler import GetProductValidatorHandler
+
+from .. import conditional, streaming
+from .base import BaseController
+
+IDEMPOTENCY_KEY_HEADER = "idempotency-key"
+
+
+class ProductController(BaseController):
+    prefix = "/products"
+    tags = ["products"]
+
+    def register_routes(self) -> None:
+        self.router.add_api_route(
+            "", self.add_product, methods=["POST"], status_code=201, response_class=Response
+        )
+        self.router.add_api_route(
+            "/batch", self.batch_get_products, methods=["POST"], response_class=Response
+        )
+        # Static paths go before /{guid}, which would otherwise match them first
+        self.router.add_api_route(
+            "/export", self.export_products, methods=["GET"],
+            response_class=streaming.DisconnectAwareStreamingResponse,
+        )
+        self.router.add_api_route(
+            "/{guid}", self.get_product, methods=["GET"], response_class=Response
+        )
+        self.router.add_api_route(
+            "/by-slug/{slug}", self.get_product_by_slug, methods=["GET"], response_class=Response
+        )
+
+    async def add_product(
+        self,
+        request: Request,
+        handler: FromDishka[AddProductHandler],
+    ) -> Response:
+        payload = await self.decode(request, AddProductRequest)
+        # A replay gets the stored body with the same 201
+        idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        return self.encode(await handler.handle(payload, idempotency_key=idempotency_key), status_code=201)
+
+    async def batch_get_products(
+        self,
+        request: Request,
+        handler: FromDishka[BatchGetProductsHandler],
+    ) -> Response:
+        payload = await self.decode(request, BatchGetProductsRequest)
+        return self.encode(await handler.handle(payload))
+
+    async def export_products(
+        self,
+        request: Request,
+        handler: FromDishka[ExportProductsHandler],
+    ) -> streaming.DisconnectAwareStreamingResponse:
+        chunks = await handler.handle(ExportProductsRequest())
+        headers = {"Vary": "Accept-Encoding"}
+        if streaming.accepts_gzip(request):
+            chunks = streaming.gzip_stream(chunks)
+            headers["Content-Encoding"] = "gzip"
+        # A client disconnect cancels the stream and with it the running page query
+        return streaming.DisconnectAwareStreamingResponse(
+            chunks, media_type=streaming.NDJSON_MEDIA_TYPE, headers=headers
+        )
+
+    async def get_product(
+        self,
+        guid: uuid.UUID,
+        request: Request,
+        handler: FromDishka[GetProductHandler],
+        validator_handler: FromDishka[GetProductValidatorHandler],
+    ) -> Response:
+        if conditional.is_conditional(request):
+            validator = await validator_handler.handle(GetProductValidatorRequest(guid=guid))
+            if validator is not None and conditional.is_not_modified(request, validator):
+                return conditional.not_modified(validator)
+
+        return self._encode_product(request, await handler.handle(GetProductRequest(guid=guid)))
+
+    async def get_product_by_slug(
+        self,
+        slug: str,
+        request: Request,
+        handler: FromDishka[GetProductBySlugHandler],
+    ) -> Response:
+        return self._encode_product(request, await handler.handle(GetProductBySlugRequest(slug=slug)))
+
+    @classmethod
+    def _encode_product(cls, request: Request, product: GetProductResponse) -> Response:
+        validator = ProductValidator.from_timestamp(product.guid, product.updated_at or product.created_at)
+        if conditional.is_not_modified(request, validator):
+            return conditional.not_modified(validator)
+        return cls.encode(product, headers=conditional.validator_headers(validator))
@@ -1,41 +1,262 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from opentelemetry import trace
-from opentelemetry.propagate import inject
+import asyncio
+import hashlib
+import math
+import time
 from uuid import uuid4
 
-from app.infrastructure.adapters._logging.context import request_id
+import asyncpg
+import msgspec
+from dishka import AsyncContainer
+from opentelemetry import trace
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.domain.common.enums import RequestClass
+from app.domain.core.config.settings import AdmissionConfig, RateLimitConfig, RateLimitRule
+from app.domain.errors.admission import ServiceOverloadedError
+from app.domain.errors.base import DomainError
+from app.domain.errors.rate_limit import RateLimitExceededError
+from app.infrastructure.adapters._logging.context import set_request_id
+from app.infrastructure.adapters.tracing.propagation import extract_context
+from app.infrastructure.ports.admission import ConcurrencyLimiterPort
+from app.infrastructure.ports.rate_limit import RateLimiterPort
+
+REQUEST_ID_HEADER = b"x-request-id"
+TRACE_CONTEXT_HEADERS = frozenset({b"traceparent", b"tracestate"})
+# Client's remaining budget in milliseconds; queueing longer than that is wasted work
+REQUEST_TIMEOUT_HEADER = b"x-request-timeout-ms"
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# A profile holds its request for seconds, which would skew the admission limiter's latency
+EXEMPT_PREFIXES = ("/health", "/metrics", "/debug")
+OVERLOAD_STATUSES = frozenset({503, 504})
+# Errors that mean a dependency is saturated: pool checkout or other deadlines
+# running out, Postgres out of connection slots. Other failures are bugs or
+# bad input and say nothing about load.
+SATURATION_ERRORS = (TimeoutError, asyncpg.TooManyConnectionsError)
+
+
+async def send_retry_later(send: Send, exc: DomainError, retry_after: float) -> None:
+    body = msgspec.json.encode(exc.to_dict())
+    await send({
+        "type": "http.response.start",
+        "status": exc.code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+tracer = trace.get_tracer(__name__)
+
 
+class TracingMiddleware:
+    """
+    Pure ASGI middleware: no per-request task or memory stream, and response
+    bodies (including streaming ones) are passed through untouched. Only the
+    ``http.response.start`` message is rewritten to carry ``x-request-id``.
+    Spans are named after the matched route template, so every GUID shares
+    one name, and only 5xx responses mark them as failed.
+    """
 
-class TracingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        req_id = request.headers.get("x-request-id") or str(uuid4())
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        request_id.set(req_id)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        tracer = trace.get_tracer(__name__)
+        req_id = None
+        trace_headers = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                req_id = value.decode("latin-1")
+            elif name in TRACE_CONTEXT_HEADERS:
+                trace_headers = trace_headers or {}
+                trace_headers[name.decode("latin-1")] = value.decode("latin-1")
+        if not req_id:
+            req_id = str(uuid4())
 
+        set_request_id(req_id)
+        req_id_header = (REQUEST_ID_HEADER, req_id.encode("latin-1"))
+
+        method = scope["method"]
+        path = scope["path"]
+
+        # Named by method until routing has matched a template. A caller's
+        # traceparent makes this span its child and decides sampling
         with tracer.start_as_current_span(
-            name=f"{request.method} {request.url.path}",
-            attributes={
-                "http.method": request.method,
-                "http.route": request.url.path,
-                "http.url": str(request.url),
-                "request.id": req_id,
-            }
+            method,
+            context=extract_context(trace_headers),
+            kind=SpanKind.SERVER,
         ) as span:
-            # 3. trace context Propagation
-            headers = {}
-            inject(headers)  # traceparent, tracestate e.t.c
+            recording = span.is_recording()
+            if recording:
+                # Attributes are only built when a real SDK span will export them
+                span.set_attributes({
+                    "http.method": method,
+                    "http.target": scope.get("raw_path", b"").decode("latin-1") or path,
+                    "request.id": req_id,
+                })
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = [*message.get("headers", ()), req_id_header]
+                    if recording:
+                        self._record_response(span, scope, method, message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _record_response(span: Span, scope: Scope, method: str, status_code: int) -> None:
+        # The router stores the matched route in the shared scope before the endpoint runs
+        route = getattr(scope.get("route"), "path", None)
+        if route is not None:
+            span.update_name(f"{method} {route}")
+            span.set_attribute("http.route", route)
+        span.set_attribute("http.status_code", status_code)
+        if status_code >= 500:
+            span.set_status(Status(StatusCode.ERROR, f"HTTP {status_code}"))
+
+
+class AdmissionControlMiddleware:
+    """
+    Puts every HTTP request through the concurrency limiter before any
+    handler, DI scope or pool checkout runs. Shed requests get a 503 with
+    Retry-After straight away. Latency is sampled at response start, so a
+    long streaming body counts against the limit but not as slowness.
+
+    Only 503/504 responses and SATURATION_ERRORS count as overload. Other
+    errors are plain latency samples, and a request cancelled before its
+    response started (the client went away) gives no sample at all.
+    """
+
+    def __init__(self, app: ASGIApp, container: AsyncContainer) -> None:
+        self.app = app
+        self._container = container
+        self._limiter: ConcurrencyLimiterPort | None = None
+        self._queue_timeout = 0.0
+
+    async def _resolve(self) -> ConcurrencyLimiterPort:
+        if self._limiter is None:
+            config = await self._container.get(AdmissionConfig)
+            self._queue_timeout = config.queue_timeout_seconds
+            self._limiter = await self._container.get(ConcurrencyLimiterPort)
+        return self._limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self._limiter or await self._resolve()
+        request_class = RequestClass.READ if scope["method"] in READ_METHODS else RequestClass.WRITE
+        try:
+            await limiter.acquire(request_class, self._budget(scope))
+        except ServiceOverloadedError as exc:
+            await send_retry_later(send, exc, exc.retry_after)
+            return
+
+        started = time.perf_counter()
+        latency: float | None = None
+        overloaded = False
+        cancelled = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal latency, overloaded
+            if message["type"] == "http.response.start":
+                latency = time.perf_counter() - started
+                overloaded = message["status"] in OVERLOAD_STATUSES
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except SATURATION_ERRORS:
+            overloaded = True
+            raise
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if latency is None and not cancelled:
+                latency = time.perf_counter() - started
+            limiter.release(request_class, latency, overloaded=overloaded)
+
+    def _budget(self, scope: Scope) -> float:
+        for name, value in scope["headers"]:
+            if name == REQUEST_TIMEOUT_HEADER:
+                try:
+                    return min(self._queue_timeout, max(0.0, float(value) / 1000))
+                except ValueError:
+                    break
+        return self._queue_timeout
+
+
+class RateLimitMiddleware:
+    """
+    Per-client token buckets, keyed by the first matching route rule and the
+    client identity: the API key in the configured header when its SHA-256 is
+    one of ``api_key_hashes``, else the peer address, so an arbitrary header
+    value cannot buy a fresh bucket. Every peer address also has its own
+    bucket across all routes; both buckets are taken in one limiter call.
+    Runs ahead of admission control, so a throttled client never holds a
+    slot.
+    """
+
+    def __init__(self, app: ASGIApp, container: AsyncContainer) -> None:
+        self.app = app
+        self._container = container
+        self._limiter: RateLimiterPort | None = None
+        self._rules: list[RateLimitRule] = []
+        self._peer_rule: RateLimitRule | None = None
+        self._client_header = b""
+        self._api_key_hashes: frozenset[str] = frozenset()
+
+    async def _resolve(self) -> RateLimiterPort:
+        if self._limiter is None:
+            config = await self._container.get(RateLimitConfig)
+            self._rules = [*config.rules, RateLimitRule(name="default", rate=config.rate, burst=config.burst)]
+            if config.peer_rate > 0:
+                self._peer_rule = RateLimitRule(name="peer", rate=config.peer_rate, burst=config.peer_burst)
+            self._client_header = config.client_header.encode("latin-1")
+            self._api_key_hashes = frozenset(config.api_key_hashes)
+            self._limiter = await self._container.get(RateLimiterPort)
+        return self._limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
 
-            headers["x-request-id"] = req_id
+        limiter = self._limiter or await self._resolve()
+        client = scope.get("client")
+        peer = f"ip:{client[0] if client else 'unknown'}"
+        buckets = [(self._match(scope["method"], scope["path"]), self._client(scope, peer))]
+        if self._peer_rule is not None:
+            buckets.insert(0, (self._peer_rule, peer))
 
-            response = await call_next(request)
+        denied = await limiter.hit(buckets)
+        if denied is not None:
+            rule, retry_after = denied
+            await send_retry_later(send, RateLimitExceededError(rule.name, retry_after), retry_after)
+            return
 
-            response.headers["x-request-id"] = req_id
+        await self.app(scope, receive, send)
 
-            if response.status_code >= 400:
-                span.record_exception(Exception(f"HTTP {response.status_code}"))
-                span.set_attribute("http.status_code", response.status_code)
+    def _match(self, method: str, path: str) -> RateLimitRule:
+        for rule in self._rules:
+            if (rule.method is None or rule.method == method) and path.startswith(rule.path_prefix):
+                return rule
+        return self._rules[-1]
 
-            return response
+    def _client(self, scope: Scope, peer: str) -> str:
+        for name, value in scope["headers"]:
+            if name == self._client_header and value:
+                digest = hashlib.sha256(value).hexdigest()
+                if digest in self._api_key_hashes:
+                    return f"key:{digest}"
+                break
+        return peer
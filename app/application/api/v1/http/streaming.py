@@ -0,0 +1,73 @@
+import asyncio
+import zlib
+from typing import AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# wbits 16 + 15: zlib writes a gzip header and trailer around the deflate stream
+GZIP_WBITS = 31
+
+
+def accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() not in ("gzip", "x-gzip"):
+            continue
+        quality = params.strip().removeprefix("q=")
+        try:
+            return not params or float(quality) > 0
+        except ValueError:
+            return False
+    return False
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """
+    Compresses on the fly. Each chunk ends with a sync flush, so the client can
+    decode everything sent so far and nothing piles up in the compressor.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class DisconnectAwareStreamingResponse(StreamingResponse):
+    """
+    Cancels the body iterator as soon as the client disconnects. Starlette only
+    listens for ``http.disconnect`` on servers older than ASGI spec 2.4; on
+    newer ones it relies on the next ``send`` failing, which does not happen
+    while the iterator is waiting on a database query. This always reads
+    ``receive()`` in a task next to the stream's and cancels whichever is still
+    running when the other ends, so a disconnect cancels the in-flight query.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await super().__call__(scope, receive, send)
+            return
+
+        stream = asyncio.create_task(self.stream_response(send))
+        disconnect = asyncio.create_task(self.listen_for_disconnect(receive))
+        try:
+            await asyncio.wait((stream, disconnect), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stream.cancel()
+            disconnect.cancel()
+            await asyncio.gather(stream, disconnect, return_exceptions=True)
+
+        if not stream.cancelled():
+            try:
+                stream.result()
+            except OSError:
+                raise ClientDisconnect()
+
+        if self.background is not None:
+            await self.background()
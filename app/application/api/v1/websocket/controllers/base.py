@@ -0,0 +1,20 @@
+from typing import ClassVar
+
+from fastapi import APIRouter
+
+
+class BaseWebSocketController:
+    """
+    WebSocket routes run in a dishka SESSION scope that lives as long as the
+    socket; endpoints take ``FromDishka`` parameters through ``inject``.
+    """
+
+    prefix: ClassVar[str] = ""
+    tags: ClassVar[list[str]] = []
+
+    def __init__(self):
+        self.router = APIRouter(prefix=self.prefix, tags=self.tags)
+        self.register_routes()
+
+    def register_routes(self) -> None:
+        raise NotImplementedError
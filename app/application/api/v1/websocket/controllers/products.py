@@ -0,0 +1,57 @@
+import asyncio
+import logging
+
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+from app.infrastructure.ports.product_changes import ProductChangeFeedPort, ProductChangeSubscriptionPort
+
+from .base import BaseWebSocketController
+
+logger = logging.getLogger(__name__)
+
+
+class ProductChangesController(BaseWebSocketController):
+    prefix = "/products"
+    tags = ["products"]
+
+    def register_routes(self) -> None:
+        self.router.add_api_websocket_route("/changes", inject(self.changes))
+
+    async def changes(self, websocket: WebSocket, feed: FromDishka[ProductChangeFeedPort]) -> None:
+        await websocket.accept()
+        async with feed.subscribe() as subscription:
+            # The socket is read only to notice the client leaving; that wakes the send loop
+            closed = asyncio.create_task(self._wait_closed(websocket))
+            closed.add_done_callback(lambda _: subscription.close())
+            try:
+                await self._forward(websocket, subscription)
+            finally:
+                closed.cancel()
+
+        if subscription.evicted:
+            await self._close(websocket, status.WS_1013_TRY_AGAIN_LATER, "Too slow, reconnect")
+
+    @staticmethod
+    async def _forward(websocket: WebSocket, subscription: ProductChangeSubscriptionPort) -> None:
+        while (message := await subscription.get()) is not None:
+            try:
+                await websocket.send_text(message)
+            except (WebSocketDisconnect, RuntimeError, OSError):
+                return
+
+    @staticmethod
+    async def _wait_closed(websocket: WebSocket) -> None:
+        # receive() rather than receive_text(): a binary frame must not end the wait with a KeyError
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        except RuntimeError:
+            pass
+
+    @staticmethod
+    async def _close(websocket: WebSocket, code: int, reason: str) -> None:
+        try:
+            await websocket.close(code=code, reason=reason)
+        except (RuntimeError, OSError):
+            logger.debug("Change feed socket already closed", exc_info=True)
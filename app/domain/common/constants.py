@@ -1,10 +1,24 @@
+from datetime import timedelta
 from pathlib import Path
 
 MAX_RETRIES = 3
 MIN_POOL_SIZE = 10
 MAX_POOL_SIZE = 45
 
+MAX_BATCH_SIZE = 100  # products per batch lookup
+EXPORT_BATCH_SIZE = 1000  # products per page of a catalog export
+
 SERVICE_NAME = "highload++"
 
+GRPC_ADDRESS = "[::]:50051"
+
+CHANGE_FEED_CHANNEL = "product_changes"  # NOTIFY channel, see migrations/000003
+CHANGE_FEED_QUEUE_SIZE = 256  # pending messages per subscriber before it is evicted
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)  # an expired key is claimed again by the next request
+IDEMPOTENCY_PURGE_INTERVAL_SECONDS = 600.0  # expired keys are deleted this often by every process
+IDEMPOTENCY_PURGE_BATCH_SIZE = 5000  # rows per DELETE, keeps each statement short
+
 
 MIGRATIONS_DIR = str(Path(__file__).parent.parent.parent.parent / "migrations")
@@ -7,8 +7,28 @@ class UpperStrEnum(StrEnum):
         return name.upper()
 
 
+class ReadinessStatus(StrEnum):
+    WARMING = "warming"
+    READY = "ready"
+
+
+class RequestClass(StrEnum):
+    READ = "read"
+    WRITE = "write"
+
+
+class ProductChangeKind(StrEnum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
 class CacheKey(StrEnum):
     PRODUCT = "product:"
+    PRODUCT_SLUG = "product:slug:"
+    PRODUCT_VERSION = "product:ver:"
+    PRODUCT_FILTER = "product:filter"
+    RATE_LIMIT = "ratelimit:"
 
 
 # env names, example: os.getenv(SecretsEnum.DATABASE_CONNECTION_STRING)
@@ -21,11 +41,68 @@ class SecretsEnum(UpperStrEnum):
     CACHE_PASSWORD = auto()
     CACHE_SSL = auto()
     CACHE_DECODE_RESPONSES = auto()
+    CACHE_NODES = auto()
+    CACHE_MAX_CONNECTIONS = auto()
+    CACHE_SECOND_INVALIDATION_DELAY = auto()
+    CACHE_TTL_SECONDS = auto()
+    CACHE_TTL_JITTER = auto()
+    CACHE_STALE_GRACE_SECONDS = auto()
+    CACHE_EARLY_REFRESH_BETA = auto()
+    CACHE_NEGATIVE_TTL_SECONDS = auto()
+    CACHE_EXISTENCE_FILTER_ENABLED = auto()
+    CACHE_EXISTENCE_FILTER_BITS = auto()
+    CACHE_EXISTENCE_FILTER_HASHES = auto()
+    CACHE_EXISTENCE_FILTER_SYNC_SECONDS = auto()
+    CACHE_WARMUP_ENABLED = auto()
+    CACHE_WARMUP_LIMIT = auto()
+    CACHE_WARMUP_BATCH_SIZE = auto()
+    CACHE_WARMUP_ROWS_PER_SECOND = auto()
+    CACHE_WARMUP_BUDGET_SECONDS = auto()
+    ADMISSION_ENABLED = auto()
+    ADMISSION_INITIAL_LIMIT = auto()
+    ADMISSION_MIN_LIMIT = auto()
+    ADMISSION_MAX_LIMIT = auto()
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = auto()
+    ADMISSION_LATENCY_TOLERANCE = auto()
+    ADMISSION_BACKOFF_RATIO = auto()
+    ADMISSION_SHED_FIRST = auto()
+    ADMISSION_SHED_SHARE = auto()
+    RATE_LIMIT_ENABLED = auto()
+    RATE_LIMIT_RATE = auto()
+    RATE_LIMIT_BURST = auto()
+    RATE_LIMIT_RULES = auto()
+    RATE_LIMIT_CLIENT_HEADER = auto()
+    RATE_LIMIT_API_KEY_HASHES = auto()
+    RATE_LIMIT_PEER_RATE = auto()
+    RATE_LIMIT_PEER_BURST = auto()
+    RATE_LIMIT_LEASE_SHARE = auto()
     KAFKA_BOOTSTRAP_SERVERS = auto()
     KAFKA_GROUP_ID = auto()
+    METRICS_MULTIPROCESS_DIR = auto()
+    METRICS_FLUSH_INTERVAL_SECONDS = auto()
+    TRACING_ENABLED = auto()
+    TRACING_SERVICE_NAME = auto()
+    TRACING_ENDPOINT = auto()
+    TRACING_SAMPLE_RATIO = auto()
+    TRACING_MAX_QUEUE_SIZE = auto()
+    TRACING_BATCH_SIZE = auto()
+    TRACING_SCHEDULE_DELAY_SECONDS = auto()
+    TRACING_EXPORT_TIMEOUT_SECONDS = auto()
+    DIAGNOSTICS_LOOP_STALL_THRESHOLD_SECONDS = auto()
+    DIAGNOSTICS_ADMIN_TOKEN = auto()
+    DIAGNOSTICS_PROFILE_MAX_SECONDS = auto()
+    QUERY_STATS_ENABLED = auto()
+    QUERY_STATS_SLOW_THRESHOLD_SECONDS = auto()
+    QUERY_STATS_MAX_FINGERPRINTS = auto()
 
     # Logging
     LOG_LEVEL = auto()
+    LOG_FAST_MODE = auto()
+    LOG_SAMPLING_ENABLED = auto()
+    LOG_SAMPLING_RATES = auto()
+    LOG_DEDUPE_ENABLED = auto()
+    LOG_DEDUPE_WINDOW_SECONDS = auto()
+    LOG_DEDUPE_KEEP_FIRST = auto()
     LOG_CONSOLE_ENABLED = auto()
     LOG_CONSOLE_LEVEL = auto()
     LOG_CONSOLE_COLOR = auto()
@@ -36,6 +113,9 @@ class SecretsEnum(UpperStrEnum):
     LOG_LOKI_ENABLED = auto()
     LOG_LOKI_LEVEL = auto()
     LOG_LOKI_URL = auto()
+    LOG_LOKI_BATCH_SIZE = auto()
+    LOG_LOKI_FLUSH_INTERVAL_SECONDS = auto()
+    LOG_LOKI_MAX_BUFFERED = auto()
     LOG_SENTRY_ENABLED = auto()
     LOG_SENTRY_LEVEL = auto()
     LOG_SENTRY_DSN = auto()
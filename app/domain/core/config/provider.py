@@ -1,13 +1,24 @@
 import os
+from functools import cache
 from typing import Protocol, Type, TypeVar, Any
 
-from dotenv import load_dotenv, find_dotenv
-
 from app.domain.errors.adapters import SourceProviderError
 
 T = TypeVar("T")
 
-load_dotenv(dotenv_path=find_dotenv())
+_FALSY = frozenset({"0", "false", "no", "off", ""})
+
+
+@cache
+def load_env_file() -> None:
+    """
+    Loads the nearest .env into the environment, once per process and on
+    first use rather than on import, so importing the config costs no
+    filesystem walk. Variables already set win over the file.
+    """
+    from dotenv import find_dotenv, load_dotenv
+
+    load_dotenv(dotenv_path=find_dotenv())
 
 
 class SourceProviderPort(Protocol):
@@ -28,6 +39,7 @@ class EnvSourceProvider:
         self._load_source()
 
     def _load_source(self) -> None:
+        load_env_file()
         self._source = os.environ.copy()
 
     def get_variable(self, name: str, type_: Type[T] = str, default: Any = ...) -> T | Any:
@@ -38,9 +50,12 @@ class EnvSourceProvider:
                 return default
             raise SourceProviderError(f"Required environment variable not found: {name}")
 
+        if type_ is bool:
+            return raw.strip().lower() not in _FALSY
+
         try:
             return type_(raw)
-        except TypeError as exc:
+        except (TypeError, ValueError) as exc:
             raise SourceProviderError(
                 f"Invalid value for {name}: {raw!r} cannot be converted to {type_.__name__}"
             ) from exc
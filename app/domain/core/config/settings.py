@@ -3,7 +3,8 @@ from typing import Self
 import msgspec
 
 
-from app.domain.common.enums import SecretsEnum
+from app.domain.common.constants import MAX_POOL_SIZE
+from app.domain.common.enums import RequestClass, SecretsEnum
 from app.domain.core.config.provider import SourceProviderPort
 
 
@@ -22,6 +23,23 @@ class CacheConfig(msgspec.Struct):
     password: str | None = msgspec.field(default=None)
     ssl: bool | None = msgspec.field(default=None)
     decode_responses: bool = msgspec.field(default=True)  # return str instead bytes
+    nodes: list[str] = msgspec.field(default_factory=list)  # redis:// URLs, shards the cache when set
+    max_connections: int = msgspec.field(default=50)  # per node
+    second_invalidation_delay: float = msgspec.field(default=0.5)  # seconds, for opt-in double delete
+    ttl_seconds: int = msgspec.field(default=1800)
+    ttl_jitter: float = msgspec.field(default=0.1)  # +/- share of ttl_seconds
+    stale_grace_seconds: int = msgspec.field(default=300)  # stale entries kept while a refresh runs
+    early_refresh_beta: float = msgspec.field(default=1.0)  # XFetch beta, 0 disables early refresh
+    negative_ttl_seconds: int = msgspec.field(default=30)
+    existence_filter_enabled: bool = msgspec.field(default=False)
+    existence_filter_bits: int = msgspec.field(default=1 << 24)  # 2 MiB, ~1.7M products at 1% FPR
+    existence_filter_hashes: int = msgspec.field(default=7)
+    existence_filter_sync_seconds: float = msgspec.field(default=5.0)
+    warmup_enabled: bool = msgspec.field(default=True)
+    warmup_limit: int = msgspec.field(default=10_000)  # most recent products loaded on start
+    warmup_batch_size: int = msgspec.field(default=500)
+    warmup_rows_per_second: int = msgspec.field(default=5_000)  # keeps Postgres load bounded
+    warmup_budget_seconds: float = msgspec.field(default=30.0)
 
     @classmethod
     def load(cls, source_provider: SourceProviderPort) -> Self:
@@ -32,6 +50,223 @@ class CacheConfig(msgspec.Struct):
             password=source_provider.get_variable(SecretsEnum.CACHE_PASSWORD, str, default=None),
             ssl=source_provider.get_variable(SecretsEnum.CACHE_SSL, bool, default=None),
             decode_responses=source_provider.get_variable(SecretsEnum.CACHE_DECODE_RESPONSES, bool, default=True),
+            nodes=[
+                node.strip()
+                for node in source_provider.get_variable(SecretsEnum.CACHE_NODES, str, default="").split(",")
+                if node.strip()
+            ],
+            max_connections=source_provider.get_variable(SecretsEnum.CACHE_MAX_CONNECTIONS, int, default=50),
+            second_invalidation_delay=source_provider.get_variable(
+                SecretsEnum.CACHE_SECOND_INVALIDATION_DELAY, float, default=0.5
+            ),
+            ttl_seconds=source_provider.get_variable(SecretsEnum.CACHE_TTL_SECONDS, int, default=1800),
+            ttl_jitter=source_provider.get_variable(SecretsEnum.CACHE_TTL_JITTER, float, default=0.1),
+            stale_grace_seconds=source_provider.get_variable(
+                SecretsEnum.CACHE_STALE_GRACE_SECONDS, int, default=300
+            ),
+            early_refresh_beta=source_provider.get_variable(
+                SecretsEnum.CACHE_EARLY_REFRESH_BETA, float, default=1.0
+            ),
+            negative_ttl_seconds=source_provider.get_variable(
+                SecretsEnum.CACHE_NEGATIVE_TTL_SECONDS, int, default=30
+            ),
+            existence_filter_enabled=source_provider.get_variable(
+                SecretsEnum.CACHE_EXISTENCE_FILTER_ENABLED, bool, default=False
+            ),
+            existence_filter_bits=source_provider.get_variable(
+                SecretsEnum.CACHE_EXISTENCE_FILTER_BITS, int, default=1 << 24
+            ),
+            existence_filter_hashes=source_provider.get_variable(
+                SecretsEnum.CACHE_EXISTENCE_FILTER_HASHES, int, default=7
+            ),
+            existence_filter_sync_seconds=source_provider.get_variable(
+                SecretsEnum.CACHE_EXISTENCE_FILTER_SYNC_SECONDS, float, default=5.0
+            ),
+            warmup_enabled=source_provider.get_variable(SecretsEnum.CACHE_WARMUP_ENABLED, bool, default=True),
+            warmup_limit=source_provider.get_variable(SecretsEnum.CACHE_WARMUP_LIMIT, int, default=10_000),
+            warmup_batch_size=source_provider.get_variable(SecretsEnum.CACHE_WARMUP_BATCH_SIZE, int, default=500),
+            warmup_rows_per_second=source_provider.get_variable(
+                SecretsEnum.CACHE_WARMUP_ROWS_PER_SECOND, int, default=5_000
+            ),
+            warmup_budget_seconds=source_provider.get_variable(
+                SecretsEnum.CACHE_WARMUP_BUDGET_SECONDS, float, default=30.0
+            ),
+        )
+
+
+class AdmissionConfig(msgspec.Struct):
+    enabled: bool = msgspec.field(default=True)
+    initial_limit: int = msgspec.field(default=MAX_POOL_SIZE)  # concurrent requests
+    min_limit: int = msgspec.field(default=4)
+    max_limit: int = msgspec.field(default=MAX_POOL_SIZE * 4)
+    queue_timeout_seconds: float = msgspec.field(default=1.0)  # longest wait for a slot, caps client budgets
+    latency_tolerance: float = msgspec.field(default=2.0)  # latency over tolerance * baseline shrinks the limit
+    backoff_ratio: float = msgspec.field(default=0.9)  # multiplicative decrease
+    shed_first: RequestClass = msgspec.field(default=RequestClass.READ)
+    shed_share: float = msgspec.field(default=0.8)  # share of the limit the shed-first class may use
+
+    @classmethod
+    def load(cls, source_provider: SourceProviderPort) -> Self:
+        return cls(
+            enabled=source_provider.get_variable(SecretsEnum.ADMISSION_ENABLED, bool, default=True),
+            initial_limit=source_provider.get_variable(
+                SecretsEnum.ADMISSION_INITIAL_LIMIT, int, default=MAX_POOL_SIZE
+            ),
+            min_limit=source_provider.get_variable(SecretsEnum.ADMISSION_MIN_LIMIT, int, default=4),
+            max_limit=source_provider.get_variable(
+                SecretsEnum.ADMISSION_MAX_LIMIT, int, default=MAX_POOL_SIZE * 4
+            ),
+            queue_timeout_seconds=source_provider.get_variable(
+                SecretsEnum.ADMISSION_QUEUE_TIMEOUT_SECONDS, float, default=1.0
+            ),
+            latency_tolerance=source_provider.get_variable(
+                SecretsEnum.ADMISSION_LATENCY_TOLERANCE, float, default=2.0
+            ),
+            backoff_ratio=source_provider.get_variable(SecretsEnum.ADMISSION_BACKOFF_RATIO, float, default=0.9),
+            shed_first=RequestClass(
+                source_provider.get_variable(SecretsEnum.ADMISSION_SHED_FIRST, str, default=RequestClass.READ)
+            ),
+            shed_share=source_provider.get_variable(SecretsEnum.ADMISSION_SHED_SHARE, float, default=0.8),
+        )
+
+
+class RateLimitRule(msgspec.Struct, frozen=True):
+    name: str  # part of the Redis key, rules never share buckets
+    rate: float  # tokens per second
+    burst: int  # bucket size
+    method: str | None = None  # any method when unset
+    path_prefix: str = "/"
+
+    @classmethod
+    def parse(cls, spec: str) -> Self:
+        """``name:METHOD:/path/prefix:rate:burst``, ``*`` for any method."""
+        name, method, path_prefix, rate, burst = spec.strip().split(":")
+        return cls(
+            name=name,
+            rate=float(rate),
+            burst=int(burst),
+            method=None if method == "*" else method.upper(),
+            path_prefix=path_prefix,
+        )
+
+
+class RateLimitConfig(msgspec.Struct):
+    enabled: bool = msgspec.field(default=True)
+    rate: float = msgspec.field(default=50.0)  # default rule, tokens per second per client
+    burst: int = msgspec.field(default=100)
+    rules: list[RateLimitRule] = msgspec.field(default_factory=list)  # checked in order before the default
+    client_header: str = msgspec.field(default="x-api-key")  # client identity when the key is known
+    api_key_hashes: list[str] = msgspec.field(default_factory=list)  # SHA-256 hex of valid keys
+    peer_rate: float = msgspec.field(default=200.0)  # per peer address on top of the rules, 0 disables
+    peer_burst: int = msgspec.field(default=400)
+    lease_share: float = msgspec.field(default=0.05)  # share of the burst taken from Redis at once
+
+    @classmethod
+    def load(cls, source_provider: SourceProviderPort) -> Self:
+        return cls(
+            enabled=source_provider.get_variable(SecretsEnum.RATE_LIMIT_ENABLED, bool, default=True),
+            rate=source_provider.get_variable(SecretsEnum.RATE_LIMIT_RATE, float, default=50.0),
+            burst=source_provider.get_variable(SecretsEnum.RATE_LIMIT_BURST, int, default=100),
+            rules=[
+                RateLimitRule.parse(spec)
+                for spec in source_provider.get_variable(SecretsEnum.RATE_LIMIT_RULES, str, default="").split(",")
+                if spec.strip()
+            ],
+            client_header=source_provider.get_variable(
+                SecretsEnum.RATE_LIMIT_CLIENT_HEADER, str, default="x-api-key"
+            ).lower(),
+            api_key_hashes=[
+                digest.strip().lower()
+                for digest in source_provider.get_variable(
+                    SecretsEnum.RATE_LIMIT_API_KEY_HASHES, str, default=""
+                ).split(",")
+                if digest.strip()
+            ],
+            peer_rate=source_provider.get_variable(SecretsEnum.RATE_LIMIT_PEER_RATE, float, default=200.0),
+            peer_burst=source_provider.get_variable(SecretsEnum.RATE_LIMIT_PEER_BURST, int, default=400),
+            lease_share=source_provider.get_variable(SecretsEnum.RATE_LIMIT_LEASE_SHARE, float, default=0.05),
+        )
+
+
+class MetricsConfig(msgspec.Struct):
+    multiprocess_dir: str = msgspec.field(default="")  # shared by forked workers, one process when unset
+    flush_interval_seconds: float = msgspec.field(default=1.0)  # worker snapshot period, multiprocess only
+
+    @classmethod
+    def load(cls, source_provider: SourceProviderPort) -> Self:
+        return cls(
+            multiprocess_dir=source_provider.get_variable(SecretsEnum.METRICS_MULTIPROCESS_DIR, str, default=""),
+            flush_interval_seconds=source_provider.get_variable(
+                SecretsEnum.METRICS_FLUSH_INTERVAL_SECONDS, float, default=1.0
+            ),
+        )
+
+
+class TracingConfig(msgspec.Struct):
+    enabled: bool = msgspec.field(default=False)
+    service_name: str = msgspec.field(default="asyncpytemplate")
+    endpoint: str = msgspec.field(default="http://localhost:4318/v1/traces")  # OTLP/HTTP traces endpoint
+    sample_ratio: float = msgspec.field(default=0.1)  # share of root traces kept, children follow the parent
+    max_queue_size: int = msgspec.field(default=2048)  # spans waiting for export, newer ones are dropped
+    batch_size: int = msgspec.field(default=512)
+    schedule_delay_seconds: float = msgspec.field(default=5.0)
+    export_timeout_seconds: float = msgspec.field(default=10.0)
+
+    @classmethod
+    def load(cls, source_provider: SourceProviderPort) -> Self:
+        return cls(
+            enabled=source_provider.get_variable(SecretsEnum.TRACING_ENABLED, bool, default=False),
+            service_name=source_provider.get_variable(
+                SecretsEnum.TRACING_SERVICE_NAME, str, default="asyncpytemplate"
+            ),
+            endpoint=source_provider.get_variable(
+                SecretsEnum.TRACING_ENDPOINT, str, default="http://localhost:4318/v1/traces"
+            ),
+            sample_ratio=source_provider.get_variable(SecretsEnum.TRACING_SAMPLE_RATIO, float, default=0.1),
+            max_queue_size=source_provider.get_variable(SecretsEnum.TRACING_MAX_QUEUE_SIZE, int, default=2048),
+            batch_size=source_provider.get_variable(SecretsEnum.TRACING_BATCH_SIZE, int, default=512),
+            schedule_delay_seconds=source_provider.get_variable(
+                SecretsEnum.TRACING_SCHEDULE_DELAY_SECONDS, float, default=5.0
+            ),
+            export_timeout_seconds=source_provider.get_variable(
+                SecretsEnum.TRACING_EXPORT_TIMEOUT_SECONDS, float, default=10.0
+            ),
+        )
+
+
+class QueryStatsConfig(msgspec.Struct):
+    enabled: bool = msgspec.field(default=True)
+    slow_threshold_seconds: float = msgspec.field(default=0.5)  # slower queries are logged, parameters redacted
+    max_fingerprints: int = msgspec.field(default=500)  # distinct queries tracked, the rest count as "other"
+
+    @classmethod
+    def load(cls, source_provider: SourceProviderPort) -> Self:
+        return cls(
+            enabled=source_provider.get_variable(SecretsEnum.QUERY_STATS_ENABLED, bool, default=True),
+            slow_threshold_seconds=source_provider.get_variable(
+                SecretsEnum.QUERY_STATS_SLOW_THRESHOLD_SECONDS, float, default=0.5
+            ),
+            max_fingerprints=source_provider.get_variable(
+                SecretsEnum.QUERY_STATS_MAX_FINGERPRINTS, int, default=500
+            ),
+        )
+
+
+class DiagnosticsConfig(msgspec.Struct):
+    loop_stall_threshold_seconds: float = msgspec.field(default=0.1)  # 0 turns the loop monitor off
+    admin_token: str = msgspec.field(default="")  # bearer token for /debug, the endpoints are off when unset
+    profile_max_seconds: float = msgspec.field(default=60.0)
+
+    @classmethod
+    def load(cls, source_provider: SourceProviderPort) -> Self:
+        return cls(
+            loop_stall_threshold_seconds=source_provider.get_variable(
+                SecretsEnum.DIAGNOSTICS_LOOP_STALL_THRESHOLD_SECONDS, float, default=0.1
+            ),
+            admin_token=source_provider.get_variable(SecretsEnum.DIAGNOSTICS_ADMIN_TOKEN, str, default=""),
+            profile_max_seconds=source_provider.get_variable(
+                SecretsEnum.DIAGNOSTICS_PROFILE_MAX_SECONDS, float, default=60.0
+            ),
         )
 
 
@@ -1,8 +1,12 @@
 from .broker import BrokerMessage
-from .product import Product
+from .idempotency import IdempotencyRecord
+from .product import Product, ProductChange, ProductValidator
 
 
 __all__ = [
     "BrokerMessage",
+    "IdempotencyRecord",
     "Product",
+    "ProductChange",
+    "ProductValidator",
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from typing import Any
-from msgspec import Struct
+from msgspec import Struct, field
 
 
 class BrokerMessage(Struct):
@@ -7,3 +7,15 @@ class BrokerMessage(Struct):
     routing_key: str
     delivery_tag: Any
     raw: Any = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class PartitionStats(Struct):
+    topic: str
+    partition: int
+    committed: int | None  # next offset the group resumes from
+    position: int | None  # next offset handed to the application
+    high_watermark: int | None
+    lag: int | None  # messages behind the high watermark not yet committed
+    messages_per_second: float
+    handler_latency_seconds: float  # delivery to ack, exponentially weighted mean
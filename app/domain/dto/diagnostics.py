@@ -0,0 +1,27 @@
+from msgspec import Struct
+
+
+class LoopStall(Struct):
+    started_at: float  # unix time the watchdog noticed the stall
+    duration_seconds: float | None  # None while the loop is still blocked
+    task: str | None  # task running when the stall was noticed, None for a plain callback
+    stack: list[str]  # loop thread stack at that moment, outermost frame first
+
+
+class QueryStats(Struct):
+    fingerprint: str
+    query: str  # normalized text, literals replaced by ?
+    calls: int
+    errors: int
+    total_seconds: float
+    mean_seconds: float
+    p99_seconds: float  # over the most recent executions
+    max_seconds: float
+    rows: int  # returned, or affected for statements without a result
+
+
+class StartupPhase(Struct):
+    kind: str  # import | provider | connection
+    name: str
+    seconds: float  # including the phases nested in it
+    depth: int  # nesting level, 0 for top-level steps
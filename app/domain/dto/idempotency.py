@@ -0,0 +1,6 @@
+from msgspec import Struct
+
+
+class IdempotencyRecord(Struct, frozen=True):
+    fingerprint: bytes
+    response: bytes
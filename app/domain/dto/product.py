@@ -1,8 +1,9 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 from msgspec import Struct, field
 
+from app.domain.common.enums import ProductChangeKind
 from app.domain.common.timezone import get_current_datetime
 
 
@@ -13,4 +14,32 @@ class Product(Struct, frozen=True, gc=False, kw_only=True):
     price_cents: int
     description: str | None = None
     created_at: datetime = field(default_factory=get_current_datetime)
-    updated_at: datetime = field(default=get_current_datetime)
+    updated_at: datetime = field(default_factory=get_current_datetime)
+
+
+class ProductChange(Struct, frozen=True, gc=False, kw_only=True):
+    kind: ProductChangeKind
+    guid: uuid.UUID
+    name: str
+    slug: str
+    price_cents: int
+    changed_at: datetime
+
+
+class ProductValidator(Struct, frozen=True, gc=False):
+    """Identity and last change of a product, enough to answer conditional reads."""
+
+    guid: uuid.UUID
+    version: int  # last change, microseconds since the epoch (UTC)
+
+    @classmethod
+    def from_timestamp(cls, guid: uuid.UUID, value: datetime) -> "ProductValidator":
+        # Timestamps read back from the database are naive UTC
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+        return cls(guid=guid, version=(delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds)
+
+    @property
+    def last_modified(self) -> datetime:
+        return datetime.fromtimestamp(self.version // 1_000_000, tz=timezone.utc)
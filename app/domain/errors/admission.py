@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from .base import DomainError
+
+
+class ServiceOverloadedError(DomainError):
+    """
+    Request shed by admission control — domain error
+    code=503
+    """
+    def __init__(self, retry_after: float):
+        super().__init__(
+            message="Service is overloaded, retry later",
+            code=503,
+            details={"retry_after": round(retry_after, 3)},
+        )
+        self.retry_after = retry_after
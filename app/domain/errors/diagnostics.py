@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from .base import DomainError
+
+
+class DiagnosticsDisabledError(DomainError):
+    """
+    Diagnostics endpoints are off, no admin token configured — domain error
+    code=404
+    """
+    def __init__(self):
+        super().__init__(message="Diagnostics are disabled", code=404)
+
+
+class DiagnosticsForbiddenError(DomainError):
+    """
+    Missing or wrong admin token — domain error
+    code=403
+    """
+    def __init__(self):
+        super().__init__(message="Invalid diagnostics token", code=403)
+
+
+class InvalidProfileDurationError(DomainError):
+    """
+    Profile duration out of the allowed range — domain error
+    code=400
+    """
+    def __init__(self, max_seconds: float):
+        super().__init__(
+            message=f"Profile duration must be above 0 and at most {max_seconds:g} seconds",
+            code=400,
+            details={"max_seconds": max_seconds},
+        )
+
+
+class ProfilerBusyError(DomainError):
+    """
+    Another profile is being recorded — domain error
+    code=409
+    """
+    def __init__(self):
+        super().__init__(message="A profile is already being recorded", code=409)
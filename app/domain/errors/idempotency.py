@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from app.domain.common.constants import IDEMPOTENCY_KEY_MAX_LENGTH
+
+from .base import DomainError
+
+
+class InvalidIdempotencyKeyError(DomainError):
+    """
+    Idempotency key is empty or too long — domain error
+    code=400
+    """
+    def __init__(self):
+        super().__init__(
+            message=f"Idempotency key must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters long",
+            code=400,
+        )
+
+
+class IdempotencyKeyUnavailableError(DomainError):
+    """
+    Idempotency key is held by a request that stored no response — domain error
+    code=409
+    """
+    def __init__(self, key: str):
+        super().__init__(
+            message=f"Idempotency key {key!r} is held by a request without a stored response, retry later",
+            code=409,
+            details={"idempotency_key": key},
+        )
+
+
+class IdempotencyKeyReusedError(DomainError):
+    """
+    Idempotency key was already used for a different request — domain error
+    code=422
+    """
+    def __init__(self, key: str):
+        super().__init__(
+            message=f"Idempotency key {key!r} was already used with a different request",
+            code=422,
+            details={"idempotency_key": key},
+        )
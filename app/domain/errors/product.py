@@ -10,9 +10,13 @@ class ProductNotFoundError(DomainError):
     Product not found — domain error
     code=404
     """
-    def __init__(self, guid: uuid.UUID | None = None):
+    def __init__(self, guid: uuid.UUID | None = None, slug: str | None = None):
+        if slug is not None:
+            message, details = f"Product with slug={slug} not found", {"slug": slug}
+        else:
+            message, details = f"Product with guid={guid} not found", {"guid": str(guid)}
         super().__init__(
-            message=f"Product with guid={guid} not found",
+            message=message,
             code=404,
-            details={"guid": str(guid)},
+            details=details,
         )
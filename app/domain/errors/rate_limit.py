@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from .base import DomainError
+
+
+class RateLimitExceededError(DomainError):
+    """
+    Client went over its rate limit — domain error
+    code=429
+    """
+    def __init__(self, rule: str, retry_after: float):
+        super().__init__(
+            message=f"Rate limit {rule!r} exceeded",
+            code=429,
+            details={"retry_after": round(retry_after, 3)},
+        )
+        self.retry_after = retry_after
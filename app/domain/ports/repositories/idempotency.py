@@ -0,0 +1,18 @@
+from datetime import timedelta
+from typing import Protocol
+
+from app.domain.dto.idempotency import IdempotencyRecord
+
+
+class IdempotencyRepositoryPort(Protocol):
+    async def claim(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: bytes,
+        ttl: timedelta,
+    ) -> IdempotencyRecord | None: ...  # None when the caller owns the key, waits out an in-flight duplicate
+
+    async def complete(self, scope: str, key: str, response: bytes) -> None: ...
+
+    async def purge_expired(self, ttl: timedelta, limit: int) -> int: ...  # Rows deleted, at most limit
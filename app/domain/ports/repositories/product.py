@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import Protocol, AsyncIterator
+from typing import Protocol, AsyncIterator, Sequence
 
 from app.domain.dto.product import Product
 
@@ -12,18 +12,27 @@ class ProductRepositoryPort(Protocol):
 
     async def find_by_slug(self, slug: str) -> Product | None: ...
 
-    async def list_newer_than(
+    async def get_many_by_guids(self, guids: Sequence[uuid.UUID]) -> list[Product]: ...
+
+    async def list_newest_first(
         self,
-        cursor: datetime | None = None,
+        cursor: tuple[datetime, uuid.UUID] | None = None,
         limit: int = 100,
-    ) -> AsyncIterator[Product]: ...  # Keyset pagination, no offset
+    ) -> AsyncIterator[Product]: ...  # Keyset pagination, no offset. Cursor = (created_at, guid) of the last row
 
-    async def list_older_than(
+    async def list_oldest_first(
         self,
-        cursor: datetime | None = None,
+        cursor: tuple[datetime, uuid.UUID] | None = None,
         limit: int = 100,
-    ) -> AsyncIterator[Product]: ...
+    ) -> AsyncIterator[Product]: ...  # Same cursor, ascending
 
     async def update(self, product: Product) -> None: ...
 
     async def delete(self, guid: uuid.UUID) -> None: ...
+
+
+class ProductCatalogReaderPort(Protocol):
+    def iter_catalog(
+        self,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[Product]]: ...  # Every product oldest first, a connection is held per page only
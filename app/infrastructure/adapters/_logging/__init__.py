@@ -9,13 +9,13 @@ from .config import LoggerConfig
 _INITIALIZED: bool = False
 
 
-def get_logger(provider: SourceProviderPort = EnvSourceProvider()) -> Logger:
+def get_logger(provider: SourceProviderPort | None = None) -> Logger:
     global _INITIALIZED
 
     if _INITIALIZED:
         return logger
 
-    config = LoggerConfig.load(provider)
+    config = LoggerConfig.load(provider or EnvSourceProvider())
 
     config.setup()
 
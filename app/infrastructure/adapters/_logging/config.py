@@ -1,5 +1,6 @@
 import logging
-from typing import Self, ClassVar
+import sys
+from typing import Any, Self, ClassVar
 import msgspec
 from loguru import logger
 
@@ -9,22 +10,36 @@ from app.domain.core.config.provider import SourceProviderPort
 
 from .types import LogLevel
 from .context import enrich
+from .sampling import LogSampler
+from .serializer import json_format
+from .sinks import QueuedStreamSink
 
 
 class BaseHandlerConfig(msgspec.Struct):
     enabled: bool = True
     level: LogLevel = LogLevel.INFO
 
-    def apply(self) -> None:
+    def apply(self, fast: bool, **options: Any) -> None:
+        """``options`` go to ``logger.add`` as they are (the sampling filter)."""
         raise NotImplementedError
 
+    @staticmethod
+    def json_options(fast: bool) -> dict[str, Any]:
+        # msgspec encodes a flat record once for all handlers; loguru's
+        # serialize=True builds and json.dumps the full record per handler
+        return {"format": json_format} if fast else {"serialize": True}
+
 
 class ConsoleHandlerConfig(BaseHandlerConfig):
     colorful: bool = True
     output: str = "stderr"  # "stdout" | "stderr"
 
-    def apply(self) -> None:
-        sink = logging.sys.stderr if self.output == "stderr" else logging.sys.stdout
+    def apply(self, fast: bool, **options: Any) -> None:
+        sink = sys.stderr if self.output == "stderr" else sys.stdout
+        # A thread writer instead of loguru's pickling multiprocessing queue
+        options["enqueue"] = not fast
+        if fast:
+            sink = QueuedStreamSink(sink)
         fmt = (
             "<green>{time:HH:mm:ss.SSS}</green> | "
             "<level>{level: <8}</level> | "
@@ -32,14 +47,10 @@ class ConsoleHandlerConfig(BaseHandlerConfig):
             "<blue>req:{extra[request_id]}</blue> | "
             "<level>{message}</level>"
         )
-        logger.add(
-            sink,
-            format=fmt if self.colorful else None,
-            level=self.level,
-            colorize=self.colorful,
-            enqueue=True,
-            serialize=not self.colorful,
-        )
+        if self.colorful:
+            logger.add(sink, format=fmt, level=self.level, colorize=True, **options)
+        else:
+            logger.add(sink, level=self.level, colorize=False, **options, **self.json_options(fast))
 
 
 class FileHandlerConfig(BaseHandlerConfig):
@@ -48,47 +59,77 @@ class FileHandlerConfig(BaseHandlerConfig):
     retention: str = "7 days"
     compression: str | None = "zip"
 
-    def apply(self) -> None:
+    def apply(self, fast: bool, **options: Any) -> None:
         logger.add(
             self.path,
             rotation=self.rotation,
             retention=self.retention,
             compression=self.compression,
             level=self.level,
-            serialize=True,
+            # Rotation and zip compression run inside a write, so the file
+            # is always written from loguru's queue, never the caller's thread
             enqueue=True,
+            **self.json_options(fast),
+            **options,
         )
 
 class LokiHandlerConfig(BaseHandlerConfig):
     url: str = ""
     tags: dict[str, str] = msgspec.field(default_factory=dict)
+    batch_size: int = 1000  # records per push
+    flush_interval: float = 1.0  # seconds between pushes of a partial batch
+    max_buffered: int = 10_000  # records held while Loki is slow, oldest dropped past that
 
-    def apply(self) -> None:
+    def apply(self, fast: bool, **options: Any) -> None:
         if not self.url:
             return
 
-        try:
-            from loguru_loki_handler import loki_handler  # ← правильный импорт!
+        # urllib.request pulls in http.client, email and ssl, left unloaded unless Loki is on
+        from app.infrastructure.adapters.monitoring.instruments import loki_collector
+        from app.infrastructure.adapters.monitoring.metrics import REGISTRY
 
-            # Добавляем как sink (простой способ)
-            logger.add(
-                loki_handler(
-                    url=self.url,
-                    labels={"service_name": SERVICE_NAME, **self.tags}
-                ),
-                level=self.level,
-                serialize=True,
-                enqueue=True,
-            )
-            logger.info("Loki handler attached (loguru-loki-handler)", url=self.url)
-        except ImportError:
-            logger.warning("loguru-loki-handler not installed")
-        except Exception as e:
-            logger.warning(f"Loki handler failed: {e}")
+        from .loki import LokiSink, LokiSinkStats
+
+        # Exported until logger.remove() stops the sink, so a repeated setup
+        # leaves only the current sink's collector registered
+        stats = LokiSinkStats()
+        collector = REGISTRY.add_collector(loki_collector(stats))
+        sink = LokiSink(
+            url=self.url,
+            labels={"service_name": SERVICE_NAME, **self.tags},
+            batch_size=self.batch_size,
+            flush_interval=self.flush_interval,
+            max_buffered=self.max_buffered,
+            stats=stats,
+            on_stop=lambda: REGISTRY.remove_collector(collector),
+        )
+        # LokiSink buffers on its own, enqueue would only add a pickling hop
+        logger.add(sink, level=self.level, format=json_format, enqueue=False, **options)
+        logger.info("Loki handler attached", url=self.url)
+
+
+class SamplingConfig(msgspec.Struct):
+    enabled: bool = True
+    dedupe: bool = True  # collapse repeats into a summary record instead of sampling them
+    window_seconds: float = 10.0
+    keep_first: int = 5  # occurrences of a message per window that always pass
+    rates: dict[str, float] = msgspec.field(default_factory=dict)  # level -> share of records kept
+
+    @staticmethod
+    def parse_rates(spec: str) -> dict[str, float]:
+        """``DEBUG:0.01,INFO:0.5``"""
+        rates = {}
+        for item in spec.split(","):
+            if item.strip():
+                level, rate = item.split(":")
+                rates[LogLevel(level.strip().upper()).value] = float(rate)
+        return rates
 
 
 class LoggerConfig(msgspec.Struct):
     level: LogLevel = LogLevel.INFO
+    fast: bool = True  # msgspec JSON records, stdlib records below every handler's level dropped early
+    sampling: SamplingConfig = msgspec.field(default_factory=SamplingConfig)
 
     console: ConsoleHandlerConfig = msgspec.field(default_factory=ConsoleHandlerConfig)
     file: FileHandlerConfig = msgspec.field(default_factory=FileHandlerConfig)
@@ -104,6 +145,16 @@ class LoggerConfig(msgspec.Struct):
     def load(cls, provider: SourceProviderPort) -> Self:
         return cls(
             level=provider.get_variable(SecretsEnum.LOG_LEVEL, LogLevel, default=LogLevel.INFO),
+            fast=provider.get_variable(SecretsEnum.LOG_FAST_MODE, bool, default=True),
+            sampling=SamplingConfig(
+                enabled=provider.get_variable(SecretsEnum.LOG_SAMPLING_ENABLED, bool, default=True),
+                dedupe=provider.get_variable(SecretsEnum.LOG_DEDUPE_ENABLED, bool, default=True),
+                window_seconds=provider.get_variable(SecretsEnum.LOG_DEDUPE_WINDOW_SECONDS, float, default=10.0),
+                keep_first=provider.get_variable(SecretsEnum.LOG_DEDUPE_KEEP_FIRST, int, default=5),
+                rates=SamplingConfig.parse_rates(
+                    provider.get_variable(SecretsEnum.LOG_SAMPLING_RATES, str, default="")
+                ),
+            ),
             console=ConsoleHandlerConfig(
                 enabled=provider.get_variable(SecretsEnum.LOG_CONSOLE_ENABLED, bool, default=True),
                 level=provider.get_variable(SecretsEnum.LOG_CONSOLE_LEVEL, LogLevel, default=LogLevel.INFO),
@@ -119,33 +170,94 @@ class LoggerConfig(msgspec.Struct):
                 enabled=provider.get_variable(SecretsEnum.LOG_LOKI_ENABLED, bool, default=False),
                 level=provider.get_variable(SecretsEnum.LOG_LOKI_LEVEL, LogLevel, default=LogLevel.INFO),
                 url=provider.get_variable(SecretsEnum.LOG_LOKI_URL, str, default=""),
+                batch_size=provider.get_variable(SecretsEnum.LOG_LOKI_BATCH_SIZE, int, default=1000),
+                flush_interval=provider.get_variable(SecretsEnum.LOG_LOKI_FLUSH_INTERVAL_SECONDS, float, default=1.0),
+                max_buffered=provider.get_variable(SecretsEnum.LOG_LOKI_MAX_BUFFERED, int, default=10_000),
             ),
         )
 
     def setup(self) -> None:
         logger.remove()
 
-        logger.configure(patcher=enrich)
+        options: dict[str, Any] = {}
+        if self.sampling.enabled:
+            sampler = LogSampler(
+                rates=self.sampling.rates,
+                dedupe=self.sampling.dedupe,
+                window=self.sampling.window_seconds,
+                keep_first=self.sampling.keep_first,
+            )
+            options["filter"] = sampler.keep
+
+            def patcher(record) -> None:
+                enrich(record)
+                sampler(record)
+
+            logger.configure(patcher=patcher)
+        else:
+            logger.configure(patcher=enrich)
 
         # Применяем все включённые хендлеры
+        levels = []
         for attr_name in dir(self):
             config_obj = getattr(self, attr_name)
             if isinstance(config_obj, BaseHandlerConfig) and config_obj.enabled:
-                config_obj.apply()
+                config_obj.apply(self.fast, **options)
+                levels.append(logger.level(config_obj.level).no)
 
         # Перехват stdlib
         logging.getLogger().handlers = [InterceptHandler()]
-        logging.getLogger().setLevel(logging.NOTSET)
+        # loguru and stdlib share level numbers, so a library's DEBUG record
+        # no handler would keep is dropped before it is even created
+        root_level = min(levels) if self.fast and levels else logging.NOTSET
+        logging.getLogger().setLevel(root_level)
 
         logger.info("Logging configured", level=self.level)
 
 
 class InterceptHandler(logging.Handler):
+    """
+    Forwards stdlib records to loguru. A call site always reaches emit through
+    the same frames, so its depth is walked once per (file, line) and reused.
+    """
+
+    MAX_CACHED_SITES: ClassVar[int] = 4096
+
+    _depths: ClassVar[dict[tuple[str, int], int]] = {}
+    _levels: ClassVar[dict[str, str | int]] = {}
+
+    def handle(self, record) -> bool:
+        # No handler lock: loguru serializes its own handlers, and a caller
+        # blocked on a full enqueue pipe must not stall every other thread
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
     def emit(self, record):
-        level = logger.level(record.levelname).name
-        depth = 6
-        frame = logging.currentframe()
-        while frame and any(x in frame.f_code.co_filename for x in ("logging", "loguru")):
+        level = self._levels.get(record.levelname)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno  # custom stdlib level loguru doesn't know
+            self._levels[record.levelname] = level
+
+        site = (record.pathname, record.lineno)
+        depth = self._depths.get(site)
+        if depth is None:
+            depth = self._caller_depth()
+            if len(self._depths) < self.MAX_CACHED_SITES:
+                self._depths[site] = depth
+
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+    @staticmethod
+    def _caller_depth() -> int:
+        # Depth relative to emit: skip it, handle and the logging module's own frames
+        frame = sys._getframe(2)
+        depth = 1
+        while frame and frame.f_code.co_filename in (logging.__file__, __file__):
             frame = frame.f_back
             depth += 1
-        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
\ No newline at end of file
+        return depth
\ No newline at end of file
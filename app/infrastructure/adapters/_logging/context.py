@@ -18,16 +18,37 @@ def set_request_id(value: str) -> None:
     request_id_var.set(value)
 
 
+class HexId:
+    """Formats a trace or span id only when a sink actually renders it."""
+
+    __slots__ = ("value", "width")
+
+    def __init__(self, value: int, width: int):
+        self.value = value
+        self.width = width
+
+    def __str__(self) -> str:
+        return f"{self.value:0{self.width}x}"
+
+    def __format__(self, spec: str) -> str:
+        return format(str(self), spec)
+
+    __repr__ = __str__
+
+
 def enrich(record):
-    record["extra"]["request_id"] = get_request_id()
-
-    span = trace.get_current_span()
-    if span and span.get_span_context().is_valid:
-        ctx = span.get_span_context()
-        record["extra"]["trace_id"] = f"{ctx.trace_id:032x}"
-        record["extra"]["span_id"] = f"{ctx.span_id:016x}"
-        record["extra"]["trace_flags"] = f"{ctx.trace_flags:02x}"
+    # Runs for every record: no id is generated outside a request and the
+    # trace ids stay integers until a sink formats them
+    extra = record["extra"]
+    request_id = request_id_var.get()
+    extra["request_id"] = request_id
+
+    ctx = trace.get_current_span().get_span_context()
+    if ctx.is_valid:
+        extra["trace_id"] = HexId(ctx.trace_id, 32)
+        extra["span_id"] = HexId(ctx.span_id, 16)
+        extra["trace_flags"] = HexId(ctx.trace_flags, 2)
     else:
-        record["extra"]["trace_id"] = get_request_id()
+        extra["trace_id"] = request_id
 
     return record
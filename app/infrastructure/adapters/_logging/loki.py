@@ -0,0 +1,148 @@
+import gzip
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from typing import Any, Callable
+
+import msgspec
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class LokiSinkStats(msgspec.Struct):
+    sent: int = 0  # records accepted by Loki
+    dropped: int = 0  # oldest records pushed out of a full buffer
+    failed: int = 0  # records of batches given up on
+    retries: int = 0
+    pushes: int = 0
+
+
+class _Stream(msgspec.Struct):
+    stream: dict[str, str]
+    values: list[tuple[str, str]]
+
+
+class _Push(msgspec.Struct):
+    streams: list[_Stream]
+
+
+class LokiSink:
+    """
+    Buffers formatted records and pushes them to Loki from a background
+    thread, grouped into one stream per label set and gzipped. A push goes
+    out once ``batch_size`` records are waiting or every ``flush_interval``
+    seconds. The buffer keeps at most ``max_buffered`` records and drops the
+    oldest when a slow or unreachable Loki lets it fill up; failed pushes are
+    retried with exponential backoff while new records keep buffering.
+
+    ``write`` only appends under a lock, so the sink is added without
+    ``enqueue`` and never blocks the caller on the network. ``on_stop`` runs
+    once the last push is done, to unregister whatever exports ``stats``.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        labels: dict[str, str],
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        max_buffered: int = 10_000,
+        max_retries: int = 5,
+        timeout: float = 5.0,
+        stats: LokiSinkStats | None = None,
+        on_stop: Callable[[], None] | None = None,
+    ):
+        self._url = url
+        self._labels = labels
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_retries = max_retries
+        self._timeout = timeout
+
+        self._buffer: deque[tuple[str, str, str]] = deque(maxlen=max_buffered)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._encoder = msgspec.json.Encoder()
+        self._on_stop = on_stop
+        self.stats = stats or LokiSinkStats()
+
+        self._thread = threading.Thread(target=self._run, name="loki-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, message: Any) -> None:
+        record = message.record
+        entry = (
+            record["level"].name,
+            str(int(record["time"].timestamp() * 1_000_000) * 1000),  # ns, as Loki expects
+            message.rstrip("\n"),
+        )
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.stats.dropped += 1
+            self._buffer.append(entry)
+            full = len(self._buffer) >= self._batch_size
+        if full:
+            self._wakeup.set()
+
+    def stop(self) -> None:
+        # Called by logger.remove(): push what is buffered, then let the thread exit
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join()
+        if self._on_stop is not None:
+            self._on_stop()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            while batch := self._take():
+                self._push(batch)
+            if self._stopping:
+                return
+
+    def _take(self) -> list[tuple[str, str, str]]:
+        with self._lock:
+            count = min(len(self._buffer), self._batch_size)
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _push(self, batch: list[tuple[str, str, str]]) -> None:
+        streams: dict[str, _Stream] = {}
+        for level, timestamp, line in batch:
+            stream = streams.get(level)
+            if stream is None:
+                stream = streams[level] = _Stream(stream={**self._labels, "level": level}, values=[])
+            stream.values.append((timestamp, line))
+
+        body = gzip.compress(self._encoder.encode(_Push(streams=list(streams.values()))), compresslevel=5)
+        request = urllib.request.Request(
+            self._url,
+            data=body,
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            method="POST",
+        )
+
+        delay = 0.5
+        for attempt in range(self._max_retries + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=self._timeout):
+                    pass
+                self.stats.pushes += 1
+                self.stats.sent += len(batch)
+                return
+            except urllib.error.HTTPError as exc:
+                if exc.code not in RETRY_STATUSES:
+                    break  # rejected payload, sending it again won't help
+            except (urllib.error.URLError, OSError):
+                pass
+
+            if attempt == self._max_retries or self._stopping:
+                break
+            self.stats.retries += 1
+            time.sleep(delay)
+            delay = min(delay * 2, 10.0)
+
+        self.stats.failed += len(batch)
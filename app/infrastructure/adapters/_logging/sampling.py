@@ -0,0 +1,106 @@
+import random
+import threading
+import time
+from typing import Any
+
+from loguru import logger
+
+from .types import LogLevel
+
+SUPPRESSED_KEY = "suppressed"  # set on the record itself, never serialized
+REPEATED_KEY = "repeated"  # extra field of a burst summary record
+
+MAX_TRACKED_MESSAGES = 10_000
+
+
+class _Burst:
+    __slots__ = ("started", "count", "suppressed", "level", "name", "function", "line", "message")
+
+    def __init__(self, started: float, record: dict[str, Any]):
+        self.started = started
+        self.count = 0
+        self.suppressed = 0
+        self.level = record["level"].name
+        self.name = record["name"]
+        self.function = record["function"]
+        self.line = record["line"]
+        self.message = record["message"]
+
+
+class LogSampler:
+    """
+    Drops records before any handler formats or ships them. Runs as a patcher,
+    once per record, and marks the record; handlers skip it through ``keep``.
+
+    The first ``keep_first`` occurrences of a message within ``window`` seconds
+    always pass. Past that, repeats are either collapsed (``dedupe``) and
+    reported by one summary record with a repeat count, logged by the first
+    record after the window ends, or sampled at their level's rate. CRITICAL
+    records always pass.
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, float],
+        dedupe: bool = True,
+        window: float = 10.0,
+        keep_first: int = 5,
+    ):
+        self._rates = rates
+        self._dedupe = dedupe
+        self._window = window
+        self._keep_first = keep_first
+        self._bursts: dict[tuple, _Burst] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + window
+
+    @staticmethod
+    def keep(record: dict[str, Any]) -> bool:
+        """Handler filter."""
+        return SUPPRESSED_KEY not in record
+
+    def __call__(self, record: dict[str, Any]) -> None:
+        level = record["level"]
+        if level.name == LogLevel.CRITICAL or REPEATED_KEY in record["extra"]:
+            return
+
+        now = time.monotonic()
+        key = (level.no, record["name"], record["line"], record["message"])
+        with self._lock:
+            ended = self._sweep(now) if now >= self._next_sweep else []
+            burst = self._bursts.get(key)
+            if burst is None or now - burst.started >= self._window:
+                if burst is not None and burst.suppressed:
+                    ended.append(burst)
+                if len(self._bursts) < MAX_TRACKED_MESSAGES:
+                    burst = self._bursts[key] = _Burst(now, record)
+                else:
+                    burst = None
+            if burst is None:  # too many distinct messages, sampling only
+                first = False
+            else:
+                burst.count += 1
+                first = burst.count <= self._keep_first
+                if not first and self._dedupe:
+                    burst.suppressed += 1
+                    record[SUPPRESSED_KEY] = True
+
+        if not first and SUPPRESSED_KEY not in record and random.random() >= self._rates.get(level.name, 1.0):
+            record[SUPPRESSED_KEY] = True
+
+        # Emitted outside the lock, summaries pass through this patcher again
+        for burst in ended:
+            self._summarize(burst, now)
+
+    def _sweep(self, now: float) -> list[_Burst]:
+        self._next_sweep = now + self._window
+        expired = [key for key, burst in self._bursts.items() if now - burst.started >= self._window]
+        return [burst for key in expired if (burst := self._bursts.pop(key)).suppressed]
+
+    def _summarize(self, burst: _Burst, now: float) -> None:
+        elapsed = now - burst.started
+        logger.patch(
+            lambda r: r.update(name=burst.name, function=burst.function, line=burst.line)
+        ).bind(**{REPEATED_KEY: burst.suppressed}).log(
+            burst.level, f"{burst.message} (repeated {burst.suppressed} more times in {elapsed:.1f}s)"
+        )
@@ -0,0 +1,39 @@
+import traceback
+from typing import Any
+
+import msgspec
+
+JSON_KEY = "_json"
+
+# Anything msgspec can't encode natively (HexId, exceptions, custom objects) goes through str()
+_encoder = msgspec.json.Encoder(enc_hook=str)
+
+
+def serialize(record: dict[str, Any]) -> str:
+    """One flat JSON object per record, extra fields at the top level."""
+    payload = {
+        **record["extra"],
+        "time": record["time"].isoformat(),  # loguru's datetime subclass is not encoded natively
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+    }
+    exception = record["exception"]
+    if exception is not None:
+        payload["exception"] = "".join(
+            traceback.format_exception(exception.type, exception.value, exception.traceback)
+        )
+    return _encoder.encode(payload).decode()
+
+
+def json_format(record: dict[str, Any]) -> str:
+    """
+    loguru format callable replacing ``serialize=True``. The JSON is stored in
+    the record's extra, so every handler of the same record reuses one encoding.
+    """
+    extra = record["extra"]
+    if JSON_KEY not in extra:
+        extra[JSON_KEY] = serialize(record)
+    return "{extra[" + JSON_KEY + "]}\n"
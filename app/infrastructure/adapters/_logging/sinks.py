@@ -0,0 +1,33 @@
+import queue
+import threading
+from typing import TextIO
+
+
+class QueuedStreamSink:
+    """
+    Writes formatted records to a stream from a background thread. Records
+    cross a thread queue as they are, while loguru's enqueue=True pickles
+    every record, exception and extra included, through a multiprocessing
+    pipe. A full queue blocks the caller, the same back-pressure as the pipe.
+    """
+
+    def __init__(self, stream: TextIO, max_pending: int = 10_000):
+        self._stream = stream
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        self._queue.put(message)
+
+    def stop(self) -> None:
+        # Called by logger.remove(), everything queued before is written first
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while (message := self._queue.get()) is not None:
+            self._stream.write(message)
+            if self._queue.empty():
+                self._stream.flush()
+        self._stream.flush()
@@ -0,0 +1,152 @@
+import asyncio
+import math
+import time
+from collections import deque
+
+from app.domain.common.enums import RequestClass
+from app.domain.core.config.settings import AdmissionConfig
+from app.domain.errors.admission import ServiceOverloadedError
+from app.infrastructure.ports.admission import ConcurrencyLimiterPort
+
+# Weight of the newest sample in the recent and the long-term latency average
+SHORT_SMOOTHING = 0.1
+LONG_SMOOTHING = 0.002  # about the last 500 requests
+
+
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiterPort):
+    """
+    AIMD concurrency limit. Every completion is a latency sample, averaged per
+    class over a short and a long horizon. Recent latency above
+    ``latency_tolerance`` times the long-term one, or an overload response,
+    cuts the limit by ``backoff_ratio`` at most once per average service time;
+    otherwise a saturated limit grows by about one per limit's worth of
+    completions. Averages rather than a minimum keep a mix of cache hits and
+    database reads from looking like congestion.
+
+    The shed-first class may only use ``shed_share`` of the limit and queues
+    behind the protected one. Waiting is bounded by the caller's budget, and
+    a request whose expected wait already exceeds it is rejected up front.
+    """
+
+    def __init__(self, config: AdmissionConfig):
+        self._limit = float(config.initial_limit)
+        self._min_limit = config.min_limit
+        self._max_limit = config.max_limit
+        self._tolerance = config.latency_tolerance
+        self._backoff = config.backoff_ratio
+        self._shed_share = config.shed_share
+        self._shed_first = config.shed_first
+        # Wake-up order: protected class first
+        self._classes = sorted(RequestClass, key=lambda request_class: request_class == self._shed_first)
+
+        self._inflight = 0
+        self._waiters: dict[RequestClass, deque[asyncio.Future[None]]] = {
+            request_class: deque() for request_class in RequestClass
+        }
+        self._latency = 0.01  # seconds, recent service time over all classes
+        self._short: dict[RequestClass, float] = {}
+        self._long: dict[RequestClass, float] = {}
+        self._last_decrease = 0.0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def _capacity(self, request_class: RequestClass) -> float:
+        if request_class == self._shed_first:
+            return max(1.0, self._limit * self._shed_share)
+        return self._limit
+
+    def _queued_ahead(self, request_class: RequestClass) -> int:
+        ahead = 0
+        for queued_class in self._classes:
+            ahead += len(self._waiters[queued_class])
+            if queued_class == request_class:
+                return ahead
+        return ahead
+
+    async def acquire(self, request_class: RequestClass, budget: float) -> None:
+        ahead = self._queued_ahead(request_class)
+        if not ahead and self._inflight < self._capacity(request_class):
+            self._inflight += 1
+            return
+
+        expected_wait = (ahead + 1) * self._latency / self._limit
+        if expected_wait > budget:
+            raise ServiceOverloadedError(retry_after=expected_wait)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[request_class].append(waiter)
+        try:
+            async with asyncio.timeout(budget):
+                await waiter
+        except BaseException as exc:
+            # The slot may have been handed over just as the wait ended
+            if waiter.done() and not waiter.cancelled():
+                self._inflight -= 1
+                self._wake()
+            else:
+                waiter.cancel()
+                try:
+                    self._waiters[request_class].remove(waiter)
+                except ValueError:  # already skipped by _wake
+                    pass
+            if isinstance(exc, TimeoutError):
+                raise ServiceOverloadedError(retry_after=budget) from None
+            raise
+
+    def release(self, request_class: RequestClass, latency: float | None, *, overloaded: bool = False) -> None:
+        self._inflight -= 1
+        if latency is not None:
+            self._observe(request_class, latency, overloaded)
+        self._wake()
+
+    def _wake(self) -> None:
+        for request_class in self._classes:
+            waiters = self._waiters[request_class]
+            while waiters and self._inflight < self._capacity(request_class):
+                waiter = waiters.popleft()
+                if waiter.done():  # timed out or cancelled
+                    continue
+                self._inflight += 1
+                waiter.set_result(None)
+
+    def _observe(self, request_class: RequestClass, latency: float, overloaded: bool) -> None:
+        self._latency += SHORT_SMOOTHING * (latency - self._latency)
+        short = self._short.get(request_class, latency)
+        long = self._long.get(request_class, latency)
+        self._short[request_class] = short = short + SHORT_SMOOTHING * (latency - short)
+        # The long-term average drops with the recent one at once but rises slowly,
+        # so sustained queueing does not become the new normal
+        self._long[request_class] = long = short if short < long else long + LONG_SMOOTHING * (short - long)
+
+        if overloaded:
+            self._decrease()
+            return
+        if self._inflight + 1 < self._limit / 2:
+            # Far below the limit latency says nothing about it
+            return
+        gradient = short / long
+        if gradient > self._tolerance:
+            self._decrease()
+        elif gradient <= math.sqrt(self._tolerance):
+            # Between the two the limit holds, so noise neither grows nor shrinks it
+            self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease >= self._latency:
+            self._limit = max(self._min_limit, self._limit * self._backoff)
+            self._last_decrease = now
+
+
+class NullConcurrencyLimiter(ConcurrencyLimiterPort):
+    async def acquire(self, request_class: RequestClass, budget: float) -> None:
+        return None
+
+    def release(self, request_class: RequestClass, latency: float | None, *, overloaded: bool = False) -> None:
+        return None
@@ -2,10 +2,16 @@ import asyncio
 import logging
 from typing import Optional, Callable, Awaitable
 
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind
+
 from app.domain.dto.broker import BrokerMessage
+from app.infrastructure.adapters.monitoring.instruments import KAFKA_CONSUMED
+from app.infrastructure.adapters.tracing.propagation import extract_context
 from app.infrastructure.ports.amqp import MessageBrokerPort
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 
 class MessageWorker:
@@ -50,13 +56,14 @@ class MessageWorker:
 
     async def _consume_loop(self) -> None:
         try:
-            async for topic, message in await self.broker.consume_many(
+            async for topic, message in self.broker.consume_many(
                 self.topics,
                 prefetch_count=self.prefetch_count,
             ):
                 try:
                     await self._handle_message(topic, message)
                 except Exception as e:
+                    KAFKA_CONSUMED.labels(topic, "error").inc()
                     logger.error(
                         f"Error processing message from {topic}: {e}",
                         exc_info=True,
@@ -74,9 +81,23 @@ class MessageWorker:
     ) -> None:
         if topic not in self._handlers:
             logger.warning(f"No handler registered for topic: {topic}, nacking")
+            KAFKA_CONSUMED.labels(topic, "unhandled").inc()
             await self.broker.nack(message)
             return
 
         handler = self._handlers[topic]
-        await handler(message)
-        await self.broker.ack(message)
+        # Continues the producer's trace, or starts one when the message carries none
+        with tracer.start_as_current_span(
+            f"process {topic}",
+            context=extract_context(message.headers),
+            kind=SpanKind.CONSUMER,
+        ) as span:
+            if span.is_recording():
+                span.set_attributes({
+                    "messaging.system": "kafka",
+                    "messaging.operation.type": "process",
+                    "messaging.destination.name": topic,
+                })
+            await handler(message)
+            await self.broker.ack(message)
+        KAFKA_CONSUMED.labels(topic, "ok").inc()
@@ -2,14 +2,44 @@ from contextlib import asynccontextmanager
 from typing import AsyncIterator, Sequence, Any
 import asyncio
 import logging
+import time
 
-from aiokafka import AIOKafkaProducer, AIOKafkaConsumer
+from aiokafka import AIOKafkaProducer, AIOKafkaConsumer, ConsumerRebalanceListener, TopicPartition
 from aiokafka.structs import ConsumerRecord
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind
 
-from app.domain.dto.broker import BrokerMessage
+from app.domain.dto.broker import BrokerMessage, PartitionStats
 from app.infrastructure.adapters.amqp.base import BaseMessageBroker
+from app.infrastructure.adapters.amqp.stats import PartitionStatsTracker
+from app.infrastructure.adapters.monitoring.instruments import KAFKA_PUBLISH_DURATION, KAFKA_PUBLISHED
+from app.infrastructure.adapters.tracing.propagation import inject_headers
+from app.infrastructure.adapters.tracing.spans import NOT_TRACED, in_unsampled_trace
 
 logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+
+class _StatsRebalanceListener(ConsumerRebalanceListener):
+    """Keeps the partition stats in step with the group's assignment."""
+
+    def __init__(self, consumer: AIOKafkaConsumer, stats: PartitionStatsTracker):
+        self._consumer = consumer
+        self._stats = stats
+
+    async def on_partitions_revoked(self, revoked: set[TopicPartition]) -> None:
+        self._stats.revoke(revoked)
+
+    async def on_partitions_assigned(self, assigned: set[TopicPartition]) -> None:
+        committed: dict[TopicPartition, int | None] = {}
+        for tp in assigned:
+            try:
+                committed[tp] = await self._consumer.committed(tp)
+            except Exception as e:
+                logger.warning(f"Could not read the committed offset of {tp.topic}[{tp.partition}]: {e}")
+                committed[tp] = None
+        self._stats.assign(committed)
+        logger.info(f"Assigned partitions: {sorted(f'{tp.topic}[{tp.partition}]' for tp in assigned)}")
 
 
 class KafkaMessageBroker(BaseMessageBroker):
@@ -41,6 +71,7 @@ class KafkaMessageBroker(BaseMessageBroker):
         self._running = False
         self._shutdown_event = asyncio.Event()
         self._active_tasks: set[asyncio.Task] = set()
+        self._stats = PartitionStatsTracker()
 
     async def start(self) -> None:
         if self._running:
@@ -141,16 +172,35 @@ class KafkaMessageBroker(BaseMessageBroker):
 
         data = body if isinstance(body, (bytes, bytearray)) else str(body).encode("utf-8")
 
-        await self._producer.send_and_wait(
-            topic=routing_key,
-            value=data,
-            headers=[(k, v.encode() if isinstance(v, str) else v) for k, v in (headers or {}).items()],
+        started = time.perf_counter()
+        # In a sampled-out trace the parent's context is propagated as is, a span would not be exported
+        span = NOT_TRACED if in_unsampled_trace() else tracer.start_as_current_span(
+            f"send {routing_key}",
+            kind=SpanKind.PRODUCER,
+            attributes={
+                "messaging.system": "kafka",
+                "messaging.operation.type": "send",
+                "messaging.destination.name": routing_key,
+            },
         )
+        with span:
+            # The consumer continues the trace from the traceparent header
+            headers = inject_headers(headers)
+            try:
+                await self._producer.send_and_wait(
+                    topic=routing_key,
+                    value=data,
+                    headers=[(k, v.encode() if isinstance(v, str) else v) for k, v in headers.items()],
+                )
+            except Exception:
+                KAFKA_PUBLISHED.labels(routing_key, "error").inc()
+                raise
+        KAFKA_PUBLISHED.labels(routing_key, "ok").inc()
+        KAFKA_PUBLISH_DURATION.labels(routing_key).observe(time.perf_counter() - started)
 
     @asynccontextmanager
     async def _single_consumer(self, topic: str, prefetch_count: int) -> AsyncIterator[AIOKafkaConsumer]:
         consumer = AIOKafkaConsumer(
-            topic,
             bootstrap_servers=self.bootstrap_servers,
             group_id=self.consumer_group_id,
             enable_auto_commit=False,
@@ -161,16 +211,17 @@ class KafkaMessageBroker(BaseMessageBroker):
             rebalance_timeout_ms=self.rebalance_timeout_ms,
             **self.security_config,
         )
+        consumer.subscribe([topic], listener=_StatsRebalanceListener(consumer, self._stats))
         await consumer.start()
         try:
             yield consumer
         finally:
+            self._stats.revoke(consumer.assignment())
             await consumer.stop()
 
     @asynccontextmanager
     async def _multi_consumer(self, topics: Sequence[str], prefetch_count: int) -> AsyncIterator[AIOKafkaConsumer]:
         consumer = AIOKafkaConsumer(
-            *topics,
             bootstrap_servers=self.bootstrap_servers,
             group_id=self.consumer_group_id,
             enable_auto_commit=False,
@@ -181,10 +232,12 @@ class KafkaMessageBroker(BaseMessageBroker):
             rebalance_timeout_ms=self.rebalance_timeout_ms,
             **self.security_config,
         )
+        consumer.subscribe(list(topics), listener=_StatsRebalanceListener(consumer, self._stats))
         await consumer.start()
         try:
             yield consumer
         finally:
+            self._stats.revoke(consumer.assignment())
             await consumer.stop()
 
     async def consume(
@@ -198,6 +251,7 @@ class KafkaMessageBroker(BaseMessageBroker):
                 if self._shutdown_event.is_set():
                     logger.info("Shutdown signal received, stopping consume")
                     break
+                self._stats.delivered(TopicPartition(raw_msg.topic, raw_msg.partition), raw_msg.offset)
                 yield self._to_broker_message(raw_msg)
 
     async def consume_many(
@@ -211,17 +265,26 @@ class KafkaMessageBroker(BaseMessageBroker):
                 if self._shutdown_event.is_set():
                     logger.info("Shutdown signal received, stopping consume_many")
                     break
+                self._stats.delivered(TopicPartition(raw_msg.topic, raw_msg.partition), raw_msg.offset)
                 yield raw_msg.topic, self._to_broker_message(raw_msg)
 
     async def ack(self, message: BrokerMessage) -> None:
         if self._consumer is None:
             return
+        offset, partition = message.delivery_tag
+        tp = TopicPartition(message.routing_key, partition)
+        # Commits this message's offset, not the consumer position, which may run ahead of it
         try:
-            await self._consumer.commit()
+            await self._consumer.commit({tp: offset + 1})
         except Exception as e:
             logger.error(f"Error committing message: {e}")
+            self._stats.processed(tp, offset, committed=False)
+        else:
+            self._stats.processed(tp, offset, committed=True)
 
     async def nack(self, message: BrokerMessage, *, requeue: bool = True) -> None:
+        offset, partition = message.delivery_tag
+        self._stats.processed(TopicPartition(message.routing_key, partition), offset, committed=False)
         logger.debug(f"Message nacked (offset will not be committed)")
 
     async def reject(self, message: BrokerMessage, *, requeue: bool = False) -> None:
@@ -235,7 +298,18 @@ class KafkaMessageBroker(BaseMessageBroker):
             routing_key=raw.topic,
             delivery_tag=delivery_tag,
             raw=raw,
+            headers={key: value.decode("utf-8", "replace") for key, value in raw.headers if value is not None},
         )
 
+    def partition_stats(self) -> list[PartitionStats]:
+        """
+        Committed offset, position, high watermark, lag, processing rate and
+        handler latency of every partition assigned to this consumer. Reads
+        only local state, the high watermark as of the last fetch response.
+        """
+        if self._consumer is None:
+            return []
+        return self._stats.snapshot(self._consumer.highwater)
+
     def is_running(self) -> bool:
         return self._running and not self._shutdown_event.is_set()
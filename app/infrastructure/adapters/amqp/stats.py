@@ -0,0 +1,87 @@
+import math
+import time
+from typing import Callable, Iterable
+
+from aiokafka import TopicPartition
+
+from app.domain.dto.broker import PartitionStats
+from app.infrastructure.adapters.monitoring.instruments import KAFKA_HANDLER_DURATION
+
+# Weight of the newest sample in the handler latency mean
+LATENCY_WEIGHT = 0.1
+
+
+class _PartitionState:
+    __slots__ = ("committed", "position", "rate", "rate_at", "latency", "duration")
+
+    def __init__(self, topic: str, partition: int, committed: int | None):
+        self.committed = committed
+        self.position: int | None = None
+        self.rate = 0.0
+        self.rate_at = time.monotonic()
+        self.latency = 0.0
+        self.duration = KAFKA_HANDLER_DURATION.labels(topic, str(partition))
+
+
+class PartitionStatsTracker:
+    """
+    Consumer progress for the partitions currently assigned, kept up to date
+    by the broker on delivery, ack/nack and rebalances. The processing rate
+    is an exponentially decaying count over ``window`` seconds, so it is O(1)
+    per message and falls towards zero when a partition goes quiet instead
+    of keeping its last value.
+    """
+
+    def __init__(self, window: float = 10.0):
+        self._window = window
+        self._partitions: dict[TopicPartition, _PartitionState] = {}
+        self._in_flight: dict[tuple[TopicPartition, int], float] = {}
+
+    def assign(self, committed: dict[TopicPartition, int | None]) -> None:
+        for tp, offset in committed.items():
+            self._partitions[tp] = _PartitionState(tp.topic, tp.partition, offset)
+
+    def revoke(self, partitions: Iterable[TopicPartition]) -> None:
+        revoked = set(partitions)
+        for tp in revoked:
+            self._partitions.pop(tp, None)
+        self._in_flight = {key: at for key, at in self._in_flight.items() if key[0] not in revoked}
+
+    def delivered(self, tp: TopicPartition, offset: int) -> None:
+        state = self._partitions.get(tp)
+        if state is not None:
+            state.position = offset + 1
+            self._in_flight[(tp, offset)] = time.monotonic()
+
+    def processed(self, tp: TopicPartition, offset: int, committed: bool) -> None:
+        delivered_at = self._in_flight.pop((tp, offset), None)
+        state = self._partitions.get(tp)
+        if state is None or delivered_at is None:
+            return
+
+        now = time.monotonic()
+        if committed:
+            state.committed = offset + 1
+        state.rate = state.rate * math.exp((state.rate_at - now) / self._window) + 1 / self._window
+        state.rate_at = now
+        elapsed = now - delivered_at
+        state.latency += LATENCY_WEIGHT * (elapsed - state.latency)
+        state.duration.observe(elapsed)
+
+    def snapshot(self, highwater: Callable[[TopicPartition], int | None]) -> list[PartitionStats]:
+        now = time.monotonic()
+        stats = []
+        for tp, state in list(self._partitions.items()):
+            high = highwater(tp)
+            done = state.committed if state.committed is not None else state.position
+            stats.append(PartitionStats(
+                topic=tp.topic,
+                partition=tp.partition,
+                committed=state.committed,
+                position=state.position,
+                high_watermark=high,
+                lag=max(high - done, 0) if high is not None and done is not None else None,
+                messages_per_second=state.rate * math.exp((state.rate_at - now) / self._window),
+                handler_latency_seconds=state.latency,
+            ))
+        return stats
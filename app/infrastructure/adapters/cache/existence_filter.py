@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import logging
+import uuid
+from typing import Collection
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.domain.common.enums import CacheKey
+from app.domain.core.config.settings import CacheConfig
+from app.infrastructure.adapters.persistence.rdb.repositories.product import PooledProductReader
+from app.infrastructure.ports.product_cache import ProductExistenceFilterPort
+
+logger = logging.getLogger(__name__)
+
+
+# Sets the bits on the live filter and, while a rebuild is running, on the
+# filter being rebuilt, so products created mid-rebuild are not lost.
+_ADD_SCRIPT = """
+local rebuilding = redis.call('EXISTS', KEYS[2]) == 1
+for i = 1, #ARGV do
+    redis.call('SETBIT', KEYS[1], ARGV[i], 1)
+    if rebuilding then
+        redis.call('SETBIT', KEYS[2], ARGV[i], 1)
+    end
+end
+return #ARGV
+"""
+
+
+class RedisBloomExistenceFilter(ProductExistenceFilterPort):
+    """
+    Bloom filter over product GUIDs. The bitmap lives in Redis so every replica
+    sees every insert; each process answers ``might_exist`` from a local copy
+    refreshed every ``existence_filter_sync_seconds``.
+
+    A GUID created on another replica is missing from the local copy until the
+    next sync, so callers check local misses against the shared bitmap with
+    ``confirm_missing`` before reporting a product as absent. Deleted products
+    keep their bits until the next ``rebuild`` (false positives only fall
+    through to the regular lookup path). When an insert fails to reach Redis
+    the shared bitmap lacks that GUID, so this process stops answering from
+    it and drops it, making every replica answer "might exist", until its
+    own rebuild has landed.
+    """
+
+    def __init__(self, redis: Redis, config: CacheConfig, reader: PooledProductReader) -> None:
+        self._redis = redis
+        self._reader = reader
+        self._bits = config.existence_filter_bits
+        self._hashes = config.existence_filter_hashes
+        self._sync_interval = config.existence_filter_sync_seconds
+
+        self._key = CacheKey.PRODUCT_FILTER.value
+        self._rebuild_key = f"{self._key}:rebuild"
+        self._staging_key = f"{self._key}:staging"
+
+        self._add_script = redis.register_script(_ADD_SCRIPT)
+        self._local: bytearray | None = None  # None until a built filter was loaded
+        self._stale = False  # an insert was lost, the bitmap is unusable until rebuilt
+        self._sync_task: asyncio.Task | None = None
+        self._rebuild_task: asyncio.Task | None = None
+
+    def _positions(self, product_guid: uuid.UUID) -> list[int]:
+        digest = hashlib.blake2b(product_guid.bytes, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self._bits for i in range(self._hashes)]
+
+    def might_exist(self, product_guid: uuid.UUID) -> bool:
+        local = self._local
+        if local is None:
+            return True
+        for pos in self._positions(product_guid):
+            # Redis bitmaps are MSB-first within each byte
+            if not local[pos >> 3] & (0x80 >> (pos & 7)):
+                return False
+        return True
+
+    async def confirm_missing(self, product_guids: Collection[uuid.UUID]) -> set[uuid.UUID]:
+        """
+        The GUIDs that are missing from the Redis bitmap too, read with one
+        pipeline of GETBITs. Bits found set are copied into the local copy so
+        the next lookup does not go to Redis. Nothing is confirmed when Redis
+        fails, the caller then falls back to the regular lookup path.
+        """
+        if not product_guids or self._stale:
+            return set()
+        positions = {guid: self._positions(guid) for guid in product_guids}
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for guid_positions in positions.values():
+                    for pos in guid_positions:
+                        pipe.getbit(self._key, pos)
+                bits = iter(await pipe.execute())
+        except RedisError:
+            logger.warning(f"Existence filter check failed for {len(product_guids)} products", exc_info=True)
+            return set()
+
+        missing = set()
+        local = self._local
+        for guid, guid_positions in positions.items():
+            # Consume every bit of the GUID, all() would stop at the first zero
+            if not all([next(bits) for _ in guid_positions]):
+                missing.add(guid)
+            elif local is not None:
+                for pos in guid_positions:
+                    local[pos >> 3] |= 0x80 >> (pos & 7)
+        return missing
+
+    async def add(self, product_guids: Collection[uuid.UUID]) -> None:
+        positions = [pos for guid in product_guids for pos in self._positions(guid)]
+        if not positions:
+            return
+
+        local = self._local
+        if local is not None:
+            for pos in positions:
+                local[pos >> 3] |= 0x80 >> (pos & 7)
+
+        try:
+            await self._add_script(keys=[self._key, self._rebuild_key], args=positions)
+        except RedisError:
+            logger.error(
+                f"Existence filter update failed for {len(product_guids)} products, discarding the filter",
+                exc_info=True,
+            )
+            self._stale = True
+            self._local = None
+            await self._discard()
+
+    async def rebuild(self) -> None:
+        size = self._bits // 8
+        # The empty rebuild key doubles as a lock and switches inserts to dual-write
+        if not await self._redis.set(self._rebuild_key, bytes(size), nx=True, ex=3600):
+            logger.info("Existence filter rebuild already running elsewhere, skipping")
+            return
+
+        logger.info("Rebuilding product existence filter")
+        try:
+            bitmap = bytearray(size)
+            count = 0
+            async for guids in self._reader.iter_guids():
+                for guid in guids:
+                    for pos in self._positions(guid):
+                        bitmap[pos >> 3] |= 0x80 >> (pos & 7)
+                count += len(guids)
+
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.set(self._staging_key, bytes(bitmap))
+                pipe.bitop("OR", self._rebuild_key, self._rebuild_key, self._staging_key)
+                pipe.persist(self._rebuild_key)
+                pipe.rename(self._rebuild_key, self._key)
+                pipe.delete(self._staging_key)
+                await pipe.execute()
+        except BaseException:
+            await self._redis.delete(self._rebuild_key, self._staging_key)
+            raise
+
+        self._stale = False
+        await self._sync()
+        logger.info(f"Product existence filter rebuilt with {count} products")
+
+    async def start(self) -> None:
+        await self._sync()
+        if self._local is None:
+            self._schedule_rebuild()
+        self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def close(self) -> None:
+        for task in (self._sync_task, self._rebuild_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    async def _sync(self) -> None:
+        if self._stale:
+            return
+        value = await self._redis.get(self._key)
+        if value is None:
+            self._local = None
+            return
+        size = self._bits // 8
+        if len(value) > size:
+            # Built with a larger existence_filter_bits: every position differs,
+            # so answer "might exist" until a rebuild at the configured size lands
+            logger.warning(
+                f"Existence filter in Redis has {len(value)} bytes, {size} configured; rebuilding"
+            )
+            self._local = None
+            self._schedule_rebuild()
+            return
+        local = bytearray(value)
+        # SETBIT only grows the string up to the highest bit ever set
+        local.extend(bytes(size - len(local)))
+        self._local = local
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sync_interval)
+            try:
+                if self._stale:
+                    await self._discard()
+                else:
+                    await self._sync()
+            except RedisError:
+                logger.warning("Existence filter sync failed, keeping previous copy", exc_info=True)
+
+    async def _discard(self) -> None:
+        """Deletes the shared bitmap, so other replicas stop trusting it, and rebuilds it."""
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            return  # deleting now could drop the bitmap the rebuild is renaming into place
+        try:
+            await self._redis.delete(self._key)
+        except RedisError:
+            logger.warning("Existence filter delete failed, retrying on the next sync", exc_info=True)
+            return
+        self._schedule_rebuild()
+
+    def _schedule_rebuild(self) -> None:
+        if self._rebuild_task is None or self._rebuild_task.done():
+            self._rebuild_task = asyncio.create_task(self._safe_rebuild())
+
+    async def _safe_rebuild(self) -> None:
+        try:
+            await self.rebuild()
+        except Exception:
+            logger.error("Existence filter rebuild failed", exc_info=True)
+
+
+class NullExistenceFilter(ProductExistenceFilterPort):
+    """Used when the existence filter is disabled: every product might exist."""
+
+    def might_exist(self, product_guid: uuid.UUID) -> bool:
+        return True
+
+    async def confirm_missing(self, product_guids: Collection[uuid.UUID]) -> set[uuid.UUID]:
+        return set()
+
+    async def add(self, product_guids: Collection[uuid.UUID]) -> None:
+        return None
+
+    async def rebuild(self) -> None:
+        return None
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import uuid
+from typing import ClassVar
+
+from app.infrastructure.ports.product_cache import (
+    ProductCacheInvalidatorPort,
+    ProductCachePort,
+    ProductExistenceFilterPort,
+)
+from app.infrastructure.ports.uow import TransactionHookPort
+
+logger = logging.getLogger(__name__)
+
+
+class ProductCacheInvalidator(ProductCacheInvalidatorPort, TransactionHookPort):
+    """
+    Collects product keys touched inside a transaction and drops them from
+    the cache in one batch after commit. Nothing is invalidated on rollback.
+    Created products also clear their negative entries and join the existence
+    filter once committed.
+    """
+
+    # Second passes outlive the request scope, keep strong refs until they finish
+    _background: ClassVar[set[asyncio.Task]] = set()
+
+    def __init__(
+        self,
+        cache: ProductCachePort,
+        existence_filter: ProductExistenceFilterPort,
+        second_pass_delay: float = 0.5,
+    ) -> None:
+        self._cache = cache
+        self._existence_filter = existence_filter
+        self._default_delay = second_pass_delay
+
+        self._guids: set[uuid.UUID] = set()
+        self._created: set[uuid.UUID] = set()
+        self._slugs: set[str] = set()
+        self._second_pass_delay: float | None = None
+
+    def track(self, guid: uuid.UUID, *slugs: str) -> None:
+        self._guids.add(guid)
+        self._slugs.update(slug for slug in slugs if slug)
+
+    def track_created(self, guid: uuid.UUID, slug: str) -> None:
+        self._created.add(guid)
+        self.track(guid, slug)
+
+    def schedule_second_pass(self, delay: float | None = None) -> None:
+        """
+        Repeat the invalidation ``delay`` seconds after commit, closing the
+        window where a concurrent reader repopulates the cache with a row it
+        read before the commit became visible.
+        """
+        self._second_pass_delay = self._default_delay if delay is None else delay
+
+    async def after_commit(self) -> None:
+        guids, slugs, created, delay = self._guids, self._slugs, self._created, self._second_pass_delay
+        self._reset()
+
+        if not guids and not slugs:
+            return
+
+        if created:
+            await self._existence_filter.add(created)
+
+        try:
+            await self._cache.invalidate(guids=guids, slugs=slugs)
+        except Exception:
+            logger.error(f"Cache invalidation failed for {len(guids)} products", exc_info=True)
+
+        if delay:
+            task = asyncio.create_task(self._second_pass(guids, slugs, delay))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    def after_rollback(self) -> None:
+        self._reset()
+
+    async def _second_pass(self, guids: set[uuid.UUID], slugs: set[str], delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            await self._cache.invalidate(guids=guids, slugs=slugs)
+        except Exception:
+            logger.error("Delayed cache invalidation failed", exc_info=True)
+
+    def _reset(self) -> None:
+        self._guids = set()
+        self._slugs = set()
+        self._created = set()
+        self._second_pass_delay = None
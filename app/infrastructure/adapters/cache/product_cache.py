@@ -1,31 +1,357 @@
+import asyncio
 import logging
-import pickle
+import math
+import random
+import time
 import uuid
-from typing import Optional
+from typing import ClassVar, Collection, Literal, Optional
+
+import msgspec
 from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from app.domain.common.enums import CacheKey
-from app.domain.dto.product import Product
-from app.infrastructure.ports.product_cache import ProductCachePort
+from app.domain.core.config.settings import CacheConfig
+from app.domain.dto.product import Product, ProductValidator
+from app.infrastructure.adapters.cache.sharding import RedisShardRouter
+from app.infrastructure.adapters.monitoring.instruments import CacheOperationMetrics
+from app.infrastructure.ports.product_cache import CacheMarker, ProductCachePort, ProductLoader
 
 logger = logging.getLogger(__name__)
 
+# Recompute cost assumed for entries written without a measured one
+DEFAULT_RECOMPUTE_TIME = 0.05
+
+# Negative entries share the product key, so invalidating a GUID clears both.
+# msgpack nil never collides with an encoded CachedProduct (a fixarray).
+NEGATIVE_ENTRY = b"\xc0"
+
+_GET_METRICS = CacheOperationMetrics("get")
+_GET_MANY_METRICS = CacheOperationMetrics("get_many")
+_GET_BY_SLUG_METRICS = CacheOperationMetrics("get_by_slug")
+_GET_VALIDATOR_METRICS = CacheOperationMetrics("get_validator")
+
+# Resolves slug -> guid -> product in one round trip. The product key is
+# derived from the index value, so this only runs when there is one node.
+_SLUG_LOOKUP_SCRIPT = """
+local guid = redis.call('GET', KEYS[1])
+if not guid then
+    return nil
+end
+local value = redis.call('GET', ARGV[1] .. guid)
+if not value then
+    return {guid}
+end
+return {guid, value}
+"""
+
+
+class CachedProduct(msgspec.Struct, array_like=True, frozen=True, gc=False):
+    product: Product
+    recompute_time: float  # XFetch delta, seconds
+    expires_at: float  # logical expiry, unix time
+
 
 class RedisProductCache(ProductCachePort):
-    def __init__(self, redis_client: Redis = None) -> None:
-        self._redis = redis_client
+    """
+    Entries carry a logical expiry that is jittered per key, while Redis keeps
+    them ``stale_grace_seconds`` longer. Reads approaching the logical expiry
+    refresh the entry in the background with XFetch probability, and reads
+    past it always do, so hot keys are rewritten before Redis ever drops them.
+
+    Keys are spread over the router's nodes: everything about a product is
+    sharded by its GUID, slug index entries by the slug. With several nodes a
+    slug lookup costs two round trips and the index write is no longer in the
+    same MULTI as the entry; lookups verify the slug, so a dangling index
+    entry only costs a miss.
+
+    Next to each entry sits a small version key holding ``updated_at`` in
+    microseconds, written and deleted together with it, so conditional reads
+    are answered without fetching and decoding the product.
+    """
+
+    _encoder: ClassVar[msgspec.msgpack.Encoder] = msgspec.msgpack.Encoder()
+    _decoder: ClassVar[msgspec.msgpack.Decoder] = msgspec.msgpack.Decoder(CachedProduct)
+
+    def __init__(
+        self,
+        router: RedisShardRouter,
+        config: CacheConfig,
+        loader: ProductLoader | None = None,
+    ) -> None:
+        self._router = router
         self._base_key = CacheKey.PRODUCT.value
+        self._slug_key = CacheKey.PRODUCT_SLUG.value
+        self._version_key = CacheKey.PRODUCT_VERSION.value
+
+        self._ttl = config.ttl_seconds
+        self._jitter = config.ttl_jitter
+        self._grace = config.stale_grace_seconds
+        self._beta = config.early_refresh_beta
+        self._negative_ttl = config.negative_ttl_seconds
+        self._loader = loader
+        self._slug_lookup = router.clients[0].register_script(_SLUG_LOOKUP_SCRIPT) if router.is_single else None
+
+        self._refreshing: set[uuid.UUID] = set()
+        self._background: set[asyncio.Task] = set()
 
     def _make_key(self, product_guid: uuid.UUID) -> str:
         return f"{self._base_key}{product_guid.hex}"
 
-    async def put(self, *, product_guid: uuid.UUID, product: Product) -> None:
-        value = pickle.dumps(product)
-        await self._redis.set(self._make_key(product_guid), value, ex=1800)
+    def _make_slug_key(self, slug: str) -> str:
+        return f"{self._slug_key}{slug}"
+
+    def _make_version_key(self, product_guid: uuid.UUID) -> str:
+        return f"{self._version_key}{product_guid.hex}"
+
+    def _node_for_guid(self, product_guid: uuid.UUID) -> Redis:
+        return self._router.for_shard(product_guid.hex)
+
+    async def _set_many(self, entries: list[tuple[str, str, bytes | str, int]]) -> None:
+        """
+        Writes (shard, key, value, ttl) entries with one MULTI per node, nodes
+        in parallel. A failed write is logged and dropped, like every other
+        cache call the product is simply loaded again on the next read.
+        """
+
+        async def write(node: Redis, node_entries: list[tuple[str, str, bytes | str, int]]) -> None:
+            async with node.pipeline(transaction=True) as pipe:
+                for _, key, value, ex in node_entries:
+                    pipe.set(key, value, ex=ex)
+                await pipe.execute()
+
+        grouped = self._router.group(entries, lambda entry: entry[0])
+        try:
+            await asyncio.gather(*(write(node, node_entries) for node, node_entries in grouped.items()))
+        except RedisError:
+            logger.warning(f"Cache write failed for {len(entries)} keys", exc_info=True)
+
+    def _entries_for(self, product: Product, recompute_time: float | None) -> list[tuple[str, str, bytes | str, int]]:
+        value, ex = self._encode(product, recompute_time)
+        version = ProductValidator.from_timestamp(product.guid, product.updated_at).version
+        return [
+            (product.guid.hex, self._make_key(product.guid), value, ex),
+            (product.guid.hex, self._make_version_key(product.guid), str(version), ex),
+            (product.slug, self._make_slug_key(product.slug), product.guid.hex, ex),
+        ]
+
+    def _jittered_ttl(self) -> float:
+        return self._ttl * (1.0 + random.uniform(-self._jitter, self._jitter))
+
+    def _encode(self, product: Product, recompute_time: float | None) -> tuple[bytes, int]:
+        ttl = self._jittered_ttl()
+        entry = CachedProduct(
+            product=product,
+            recompute_time=recompute_time if recompute_time is not None else DEFAULT_RECOMPUTE_TIME,
+            expires_at=time.time() + ttl,
+        )
+        return self._encoder.encode(entry), math.ceil(ttl) + self._grace
+
+    def _should_refresh(self, entry: CachedProduct) -> bool:
+        if self._beta <= 0:
+            return time.time() >= entry.expires_at
+        # XFetch: now - delta * beta * ln(rand()) >= expiry, rand() in (0, 1]
+        gap = -entry.recompute_time * self._beta * math.log(1.0 - random.random())
+        return time.time() + gap >= entry.expires_at
+
+    async def put(
+        self,
+        *,
+        product_guid: uuid.UUID,
+        product: Product,
+        recompute_time: float | None = None,
+    ) -> None:
+        # On a single node MULTI keeps the slug index from pointing at a missing entry
+        await self._set_many(self._entries_for(product, recompute_time))
+
+    async def put_many(self, products: Collection[Product]) -> None:
+        entries = [entry for product in products for entry in self._entries_for(product, None)]
+        if entries:
+            await self._set_many(entries)
 
-    async def get(self, product_guid: uuid.UUID) -> Optional[Product]:
-        value = await self._redis.get(self._make_key(product_guid))
-        return pickle.loads(value) if value else None
+    async def put_missing(self, product_guid: uuid.UUID) -> None:
+        try:
+            await self._node_for_guid(product_guid).set(
+                self._make_key(product_guid), NEGATIVE_ENTRY, ex=self._negative_ttl, nx=True
+            )
+        except RedisError:
+            logger.warning(f"Negative cache write failed for product {product_guid}", exc_info=True)
+
+    async def put_missing_many(self, product_guids: Collection[uuid.UUID]) -> None:
+        async def write(node: Redis, guids: list[uuid.UUID]) -> None:
+            async with node.pipeline(transaction=False) as pipe:
+                for guid in guids:
+                    pipe.set(self._make_key(guid), NEGATIVE_ENTRY, ex=self._negative_ttl, nx=True)
+                await pipe.execute()
+
+        grouped = self._router.group(product_guids, lambda guid: guid.hex)
+        try:
+            await asyncio.gather(*(write(node, guids) for node, guids in grouped.items()))
+        except RedisError:
+            logger.warning(f"Negative cache write failed for {len(product_guids)} products", exc_info=True)
+
+    async def get(self, product_guid: uuid.UUID) -> Optional[Product | Literal[CacheMarker.NOT_FOUND]]:
+        try:
+            value = await self._node_for_guid(product_guid).get(self._make_key(product_guid))
+        except RedisError:
+            _GET_METRICS.error.inc()
+            logger.warning(f"Cache read failed for product {product_guid}", exc_info=True)
+            return None
+
+        if not value:
+            _GET_METRICS.miss.inc()
+            return None
+        if value == NEGATIVE_ENTRY:
+            _GET_METRICS.negative.inc()
+            return CacheMarker.NOT_FOUND
+
+        product = self._unwrap(product_guid, value)
+        (_GET_METRICS.miss if product is None else _GET_METRICS.hit).inc()
+        return product
+
+    async def get_many(
+        self, product_guids: Collection[uuid.UUID]
+    ) -> dict[uuid.UUID, Product | Literal[CacheMarker.NOT_FOUND]]:
+        """One MGET per node; GUIDs absent from the result are plain misses."""
+
+        async def read(node: Redis, guids: list[uuid.UUID]) -> list[tuple[uuid.UUID, bytes | None]]:
+            return list(zip(guids, await node.mget([self._make_key(guid) for guid in guids])))
+
+        grouped = self._router.group(product_guids, lambda guid: guid.hex)
+        try:
+            per_node = await asyncio.gather(*(read(node, guids) for node, guids in grouped.items()))
+        except RedisError:
+            _GET_MANY_METRICS.error.inc(len(product_guids))
+            logger.warning(f"Cache read failed for {len(product_guids)} products", exc_info=True)
+            return {}
+
+        found: dict[uuid.UUID, Product | Literal[CacheMarker.NOT_FOUND]] = {}
+        negative = 0
+        for pairs in per_node:
+            for guid, value in pairs:
+                if not value:
+                    continue
+                if value == NEGATIVE_ENTRY:
+                    found[guid] = CacheMarker.NOT_FOUND
+                    negative += 1
+                elif (product := self._unwrap(guid, value)) is not None:
+                    found[guid] = product
+        # Counted per product, a batch of 100 is 100 lookups
+        _GET_MANY_METRICS.hit.inc(len(found) - negative)
+        _GET_MANY_METRICS.negative.inc(negative)
+        _GET_MANY_METRICS.miss.inc(len(product_guids) - len(found))
+        return found
+
+    async def get_validator(self, product_guid: uuid.UUID) -> Optional[ProductValidator]:
+        try:
+            version = await self._node_for_guid(product_guid).get(self._make_version_key(product_guid))
+        except RedisError:
+            _GET_VALIDATOR_METRICS.error.inc()
+            logger.warning(f"Cache read failed for product {product_guid} version", exc_info=True)
+            return None
+
+        if version is None:
+            _GET_VALIDATOR_METRICS.miss.inc()
+            return None
+        _GET_VALIDATOR_METRICS.hit.inc()
+        return ProductValidator(guid=product_guid, version=int(version))
+
+    async def get_by_slug(self, slug: str) -> Optional[Product]:
+        try:
+            if self._slug_lookup is not None:
+                found = await self._slug_lookup(keys=[self._make_slug_key(slug)], args=[self._base_key])
+            else:
+                found = await self._get_by_slug_sharded(slug)
+        except RedisError:
+            _GET_BY_SLUG_METRICS.error.inc()
+            logger.warning(f"Cache read failed for product slug {slug!r}", exc_info=True)
+            return None
+
+        if not found or len(found) < 2 or found[1] == NEGATIVE_ENTRY:
+            _GET_BY_SLUG_METRICS.miss.inc()
+            return None
+
+        guid, value = found
+        product = self._unwrap(uuid.UUID(hex=guid.decode()), value)
+        # A stale index entry may outlive a rename until its invalidation lands
+        if product is None or product.slug != slug:
+            _GET_BY_SLUG_METRICS.miss.inc()
+            return None
+        _GET_BY_SLUG_METRICS.hit.inc()
+        return product
+
+    async def _get_by_slug_sharded(self, slug: str) -> list[bytes] | None:
+        guid = await self._router.for_shard(slug).get(self._make_slug_key(slug))
+        if guid is None:
+            return None
+        product_guid = uuid.UUID(hex=guid.decode())
+        value = await self._node_for_guid(product_guid).get(self._make_key(product_guid))
+        return [guid] if value is None else [guid, value]
+
+    def _unwrap(self, product_guid: uuid.UUID, value: bytes) -> Optional[Product]:
+        """The cached product, or None for an entry that does not decode, which is dropped."""
+        try:
+            entry = self._decoder.decode(value)
+        except msgspec.DecodeError:
+            # Written by an incompatible version or corrupted; a miss reloads and rewrites it
+            logger.warning(f"Dropping undecodable cache entry for product {product_guid}", exc_info=True)
+            self._spawn(self._drop(product_guid))
+            return None
+        if self._loader is not None and self._should_refresh(entry):
+            self._schedule_refresh(product_guid)
+        return entry.product
 
     async def delete(self, product_guid: uuid.UUID) -> None:
-        await self._redis.delete(self._make_key(product_guid))
+        await self._node_for_guid(product_guid).delete(
+            self._make_key(product_guid), self._make_version_key(product_guid)
+        )
+
+    async def invalidate(
+        self,
+        *,
+        guids: Collection[uuid.UUID] = (),
+        slugs: Collection[str] = (),
+    ) -> None:
+        keys = [(guid.hex, key) for guid in guids for key in (self._make_key(guid), self._make_version_key(guid))]
+        keys.extend((slug, self._make_slug_key(slug)) for slug in slugs)
+        if not keys:
+            return
+
+        grouped = self._router.group(keys, lambda item: item[0])
+        await asyncio.gather(*(
+            node.delete(*(key for _, key in node_keys))
+            for node, node_keys in grouped.items()
+        ))
+
+    def _schedule_refresh(self, product_guid: uuid.UUID) -> None:
+        # One refresh per key and process, concurrent readers keep the stale value
+        if product_guid in self._refreshing:
+            return
+        self._refreshing.add(product_guid)
+        self._spawn(self._refresh(product_guid))
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _drop(self, product_guid: uuid.UUID) -> None:
+        try:
+            await self.delete(product_guid)
+        except RedisError:
+            logger.warning(f"Cache delete failed for product {product_guid}", exc_info=True)
+
+    async def _refresh(self, product_guid: uuid.UUID) -> None:
+        try:
+            started = time.perf_counter()
+            product = await self._loader(product_guid)
+            recompute_time = time.perf_counter() - started
+
+            if product is None:
+                await self.delete(product_guid)
+            else:
+                await self.put(product_guid=product_guid, product=product, recompute_time=recompute_time)
+        except Exception:
+            logger.warning(f"Background refresh failed for product {product_guid}", exc_info=True)
+        finally:
+            self._refreshing.discard(product_guid)
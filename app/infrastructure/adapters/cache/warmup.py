@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+
+from app.domain.common.enums import ReadinessStatus
+from app.domain.core.config.settings import CacheConfig
+from app.infrastructure.adapters.persistence.rdb.repositories.product import PooledProductReader
+from app.infrastructure.ports.product_cache import ProductCachePort
+
+logger = logging.getLogger(__name__)
+
+
+class ProductCacheWarmer:
+    """
+    Loads the most recent products into the cache after start, newest first,
+    one keyset page per pooled connection checkout. Pages are paced to
+    ``warmup_rows_per_second`` and the whole run is cut at
+    ``warmup_budget_seconds``; readiness reports WARMING until either happens.
+    """
+
+    def __init__(self, reader: PooledProductReader, cache: ProductCachePort, config: CacheConfig) -> None:
+        self._reader = reader
+        self._cache = cache
+        self._enabled = config.warmup_enabled
+        self._limit = config.warmup_limit
+        self._batch_size = max(1, min(config.warmup_batch_size, config.warmup_limit))
+        self._rows_per_second = config.warmup_rows_per_second
+        self._budget = config.warmup_budget_seconds
+
+        self._status = ReadinessStatus.WARMING
+        self._task: asyncio.Task | None = None
+
+    @property
+    def status(self) -> ReadinessStatus:
+        return self._status
+
+    def start(self) -> None:
+        if not self._enabled:
+            self._status = ReadinessStatus.READY
+        elif self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def warm(self) -> int:
+        loaded = 0
+        cursor = None
+        # Minimum wall time per page that keeps the run under the row rate
+        page_interval = self._batch_size / self._rows_per_second if self._rows_per_second > 0 else 0.0
+
+        while loaded < self._limit:
+            started = time.monotonic()
+            products = await self._reader.list_newest_first(cursor, min(self._batch_size, self._limit - loaded))
+            if not products:
+                break
+
+            await self._cache.put_many(products)
+            loaded += len(products)
+            cursor = products[-1].created_at, products[-1].guid
+
+            if len(products) < self._batch_size:
+                break
+
+            pause = page_interval - (time.monotonic() - started)
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+        return loaded
+
+    async def _run(self) -> None:
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(self._budget):
+                loaded = await self.warm()
+            logger.info(f"Product cache warmed with {loaded} products in {time.monotonic() - started:.1f}s")
+        except TimeoutError:
+            logger.warning(f"Product cache warmup stopped at the {self._budget:.0f}s budget")
+        except Exception:
+            logger.error("Product cache warmup failed, serving with a cold cache", exc_info=True)
+        finally:
+            self._status = ReadinessStatus.READY
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, ClassVar, Optional
+
+import msgspec
+
+from app.domain.common.constants import CHANGE_FEED_QUEUE_SIZE
+from app.domain.dto import ProductChange
+from app.infrastructure.ports.product_changes import ProductChangeFeedPort, ProductChangeSubscriptionPort
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeSubscription(ProductChangeSubscriptionPort):
+    __slots__ = ("_queue", "_closed", "evicted")
+
+    def __init__(self, queue_size: int):
+        # One slot is kept for the closing sentinel
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue(queue_size + 1)
+        self._closed = False
+        self.evicted = False
+
+    def offer(self, message: str) -> bool:
+        if self._closed:
+            return True
+        if self._queue.qsize() >= self._queue.maxsize - 1:
+            return False
+        self._queue.put_nowait(message)
+        return True
+
+    async def get(self) -> Optional[str]:
+        return await self._queue.get()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        # Pending messages are dropped, the reader wakes up on the sentinel at once
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    def evict(self) -> None:
+        self.evicted = True
+        self.close()
+
+
+class ProductChangeHub(ProductChangeFeedPort):
+    """
+    In-process fan-out: one upstream feed per process, one bounded queue per
+    subscriber. A change is encoded once and the same string is queued for
+    every subscriber. Publishing never waits; a subscriber whose queue is full
+    is evicted instead of slowing down the others or growing without bound.
+    """
+
+    _encoder: ClassVar[msgspec.json.Encoder] = msgspec.json.Encoder()
+
+    def __init__(self, queue_size: int = CHANGE_FEED_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._subscribers: set[ChangeSubscription] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[ChangeSubscription]:
+        subscription = ChangeSubscription(self._queue_size)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+            subscription.close()
+
+    def publish(self, change: ProductChange) -> None:
+        message = self._encoder.encode(change).decode()
+        evicted = 0
+        for subscription in tuple(self._subscribers):
+            if not subscription.offer(message):
+                self._subscribers.discard(subscription)
+                subscription.evict()
+                evicted += 1
+        if evicted:
+            logger.warning(f"Evicted {evicted} slow change feed subscribers")
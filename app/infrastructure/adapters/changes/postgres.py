@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from typing import ClassVar
+
+import asyncpg
+import msgspec
+
+from app.domain.common.constants import CHANGE_FEED_CHANNEL
+from app.domain.dto import ProductChange
+from app.infrastructure.adapters.changes.hub import ProductChangeHub
+
+logger = logging.getLogger(__name__)
+
+# Seconds between reconnect attempts, doubled up to the maximum
+RECONNECT_DELAY = 0.5
+MAX_RECONNECT_DELAY = 30.0
+
+
+class PostgresProductChangeListener:
+    """
+    Feeds the hub from LISTEN on a dedicated connection, kept outside the pool
+    since a pooled connection would drop its listeners on release. Changes
+    committed while the connection is down are not replayed.
+    """
+
+    _decoder: ClassVar[msgspec.json.Decoder] = msgspec.json.Decoder(ProductChange)
+
+    def __init__(self, dsn: str, hub: ProductChangeHub, channel: str = CHANGE_FEED_CHANNEL):
+        self._dsn = dsn
+        self._hub = hub
+        self._channel = channel
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                await self._listen()
+                delay = RECONNECT_DELAY
+            except Exception:
+                # Anything but cancellation: a listener that stops for good
+                # silently ends every subscriber's feed
+                logger.warning(f"Change feed connection failed, retrying in {delay}s", exc_info=True)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _listen(self) -> None:
+        conn = await asyncpg.connect(self._dsn)
+        lost = asyncio.Event()
+        conn.add_termination_listener(lambda _: lost.set())
+        try:
+            await conn.add_listener(self._channel, self._on_notify)
+            logger.info(f"Listening for product changes on {self._channel!r}")
+            await lost.wait()
+            logger.warning("Change feed connection lost")
+        finally:
+            if not conn.is_closed():
+                await conn.close(timeout=5)
+
+    def _on_notify(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            change = self._decoder.decode(payload)
+        except msgspec.DecodeError:
+            logger.warning(f"Malformed product change notification: {payload!r}")
+            return
+        self._hub.publish(change)
@@ -5,6 +5,7 @@ import os
 from app.domain.core.config.provider import (
         EnvSourceProvider,
         LockboxSourceProvider,
+        load_env_file,
     )
 from app.domain.errors.adapters import SourceProviderError
 
@@ -13,6 +14,7 @@ logger = logging.getLogger(__name__)
 
 async def provide_source_provider() -> SourceProviderPort:
 
+    load_env_file()
     source_provider_name = os.getenv("SOURCE_PROVIDER", "env")
 
     if source_provider_name == "env":
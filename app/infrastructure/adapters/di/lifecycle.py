@@ -0,0 +1,42 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from dishka import AsyncContainer
+from opentelemetry.trace import TracerProvider
+
+from app.infrastructure.adapters.cache.warmup import ProductCacheWarmer
+from app.infrastructure.adapters.diagnostics.startup import STARTUP
+from app.infrastructure.adapters.monitoring.exporter import MetricsExporter
+from app.infrastructure.adapters.persistence.rdb.repositories.idempotency import IdempotencyKeyPurger
+from app.infrastructure.ports.diagnostics import LoopMonitorPort
+
+logger = logging.getLogger(__name__)
+
+
+async def _resolve(container: AsyncContainer, dependency: type) -> None:
+    with STARTUP.measure("provider", dependency.__name__):
+        await container.get(dependency)
+
+
+@asynccontextmanager
+async def started(container: AsyncContainer) -> AsyncIterator[None]:
+    """
+    Starts the components that work in the background for the life of the
+    process, then closes the container, which stops them, on exit. Every
+    server (the HTTP lifespan, the gRPC server) runs inside it, so they all
+    start the same components.
+    """
+    # Tracing first, so startup queries are already traced
+    await _resolve(container, TracerProvider)
+    # Before startup work, so a blocking warmup or migration shows up as a stall
+    await _resolve(container, LoopMonitorPort)
+    # Resolving the warmer opens the pool and Redis and starts the warmup
+    await _resolve(container, ProductCacheWarmer)
+    await _resolve(container, IdempotencyKeyPurger)
+    await _resolve(container, MetricsExporter)
+    logger.info(STARTUP.report())
+    try:
+        yield
+    finally:
+        await container.close()
@@ -1,24 +1,83 @@
 import logging
-from typing import AsyncGenerator, Self
+import time
+from typing import Any, AsyncGenerator, Callable, Iterator, Self
 
 import asyncpg
 import msgspec
-from dishka import AsyncContainer, make_async_container, provide, Scope, Provider
+from dishka import AsyncContainer, alias, make_async_container, provide, Scope, Provider
+from opentelemetry.trace import TracerProvider
 
 from app.domain.common import constants
-from app.domain.common.enums import SecretsEnum
+from app.domain.common.enums import CacheKey, SecretsEnum
 from app.domain.core.config.provider import SourceProviderPort
-from app.domain.ports.repositories.product import ProductRepositoryPort
-from app.infrastructure.adapters.amqp.kafka import KafkaMessageBroker
+from app.domain.core.config.settings import (
+    AdmissionConfig,
+    CacheConfig,
+    DiagnosticsConfig,
+    MetricsConfig,
+    QueryStatsConfig,
+    RateLimitConfig,
+    TracingConfig,
+)
+from app.domain.ports.repositories.product import ProductCatalogReaderPort, ProductRepositoryPort
+from app.infrastructure.adapters.admission.limiter import AdaptiveConcurrencyLimiter, NullConcurrencyLimiter
+from app.infrastructure.adapters.cache.invalidation import ProductCacheInvalidator
+from app.infrastructure.adapters.cache.sharding import RedisShardRouter
+from app.infrastructure.adapters.cache.warmup import ProductCacheWarmer
+from app.infrastructure.adapters.changes.hub import ProductChangeHub
+from app.infrastructure.adapters.changes.postgres import PostgresProductChangeListener
 from app.infrastructure.adapters.di.factory import provide_source_provider
-from app.infrastructure.adapters.persistence.rdb.repositories.product import RDBProductRepository
+from app.infrastructure.adapters.diagnostics.loop_monitor import LoopLagMonitor, NullLoopMonitor
+from app.infrastructure.adapters.diagnostics.profiler import LoopProfiler
+from app.infrastructure.adapters.diagnostics.startup import STARTUP
+from app.infrastructure.adapters.monitoring.exporter import MetricsExporter
+from app.infrastructure.adapters.monitoring.instruments import (
+    DB_POOL_ACQUIRE_DURATION,
+    InstrumentedHandler,
+    partition_collector,
+    pool_collector,
+)
+from app.infrastructure.adapters.monitoring.metrics import REGISTRY
+from app.infrastructure.adapters.persistence.rdb.query_stats import (
+    NullQueryStats,
+    QueryStatsRecorder,
+    stats_connection_class,
+)
+from app.infrastructure.adapters.persistence.rdb.repositories.idempotency import (
+    IdempotencyKeyPurger,
+    RDBIdempotencyRepository,
+)
+from app.infrastructure.adapters.persistence.rdb.repositories.product import (
+    PooledProductReader,
+    RDBProductRepository,
+)
 from app.infrastructure.adapters.persistence.rdb.uow import RDBUnitOfWork
+from app.infrastructure.adapters.tracing.setup import setup_tracing, shutdown_tracing
+from app.infrastructure.ports.admission import ConcurrencyLimiterPort
 from app.infrastructure.ports.amqp import MessageBrokerPort
+from app.infrastructure.ports.diagnostics import LoopMonitorPort, LoopProfilerPort, QueryStatsPort
+from app.infrastructure.ports.product_cache import (
+    ProductCacheInvalidatorPort,
+    ProductCachePort,
+    ProductExistenceFilterPort,
+)
+from app.infrastructure.ports.product_changes import ProductChangeFeedPort
+from app.infrastructure.ports.rate_limit import RateLimiterPort
 from app.infrastructure.ports.uow import UnitOfWorkPort
+from app.services.use_cases.products.add.handler import AddProductHandler
+from app.services.use_cases.products.batch_get.handler import BatchGetProductsHandler
+from app.services.use_cases.products.export.handler import ExportProductsHandler
+from app.services.use_cases.products.get.handler import GetProductHandler
+from app.services.use_cases.products.get_by_slug.handler import GetProductBySlugHandler
+from app.services.use_cases.products.get_validator.handler import GetProductValidatorHandler
+from app.services.use_cases.products.list_products.handler import ListProductsHandler
 
 
 logger = logging.getLogger(__name__)
 
+# Adapters built on Redis, Kafka and the OpenTelemetry SDK are imported by the
+# providers that build them, under STARTUP, so importing this module costs none
+# of them and a worker that never resolves one never loads it.
 
 # ============================================================================
 # CONFIGURATION
@@ -62,7 +121,8 @@ class ConfigProvider(Provider):
 
     @provide(scope=Scope.APP)
     async def get_source_provider(self) -> SourceProviderPort:
-        return await provide_source_provider()
+        with STARTUP.measure("provider", "source provider"):
+            return await provide_source_provider()
 
     @provide(scope=Scope.APP)
     def get_database_config(
@@ -76,25 +136,109 @@ class ConfigProvider(Provider):
     ) -> KafkaConfig:
         return KafkaConfig.load(source_provider)
 
+    @provide(scope=Scope.APP)
+    def get_cache_config(
+        self, source_provider: SourceProviderPort
+    ) -> CacheConfig:
+        return CacheConfig.load(source_provider)
+
+    @provide(scope=Scope.APP)
+    def get_admission_config(
+        self, source_provider: SourceProviderPort
+    ) -> AdmissionConfig:
+        return AdmissionConfig.load(source_provider)
+
+    @provide(scope=Scope.APP)
+    def get_rate_limit_config(
+        self, source_provider: SourceProviderPort
+    ) -> RateLimitConfig:
+        return RateLimitConfig.load(source_provider)
+
+    @provide(scope=Scope.APP)
+    def get_metrics_config(
+        self, source_provider: SourceProviderPort
+    ) -> MetricsConfig:
+        return MetricsConfig.load(source_provider)
+
+    @provide(scope=Scope.APP)
+    def get_tracing_config(
+        self, source_provider: SourceProviderPort
+    ) -> TracingConfig:
+        return TracingConfig.load(source_provider)
+
+    @provide(scope=Scope.APP)
+    def get_diagnostics_config(
+        self, source_provider: SourceProviderPort
+    ) -> DiagnosticsConfig:
+        return DiagnosticsConfig.load(source_provider)
+
+    @provide(scope=Scope.APP)
+    def get_query_stats_config(
+        self, source_provider: SourceProviderPort
+    ) -> QueryStatsConfig:
+        return QueryStatsConfig.load(source_provider)
+
 
 class PoolProvider(Provider):
 
     scope = Scope.APP
 
     @provide(scope=Scope.APP)
-    async def get_pool(self, config: DatabaseConfig) -> AsyncGenerator[asyncpg.Pool, None]:
-        pool = await asyncpg.create_pool(
-            config.connection_string,
-            min_size=constants.MIN_POOL_SIZE,
-            max_size=constants.MAX_POOL_SIZE,
-        )
+    def get_query_stats(self, config: QueryStatsConfig) -> QueryStatsPort:
+        if not config.enabled:
+            return NullQueryStats()
+        return QueryStatsRecorder(config.slow_threshold_seconds, config.max_fingerprints)
+
+    @provide(scope=Scope.APP)
+    async def get_pool(
+        self, config: DatabaseConfig, tracing: TracingConfig, query_stats: QueryStatsPort
+    ) -> AsyncGenerator[asyncpg.Pool, None]:
+        connection_class = asyncpg.Connection
+        if tracing.enabled:
+            from app.infrastructure.adapters.tracing.instrumentation import TracedConnection
+
+            connection_class = TracedConnection
+        if isinstance(query_stats, QueryStatsRecorder):
+            connection_class = stats_connection_class(query_stats, connection_class)
+        with STARTUP.measure("connection", "postgres pool"):
+            pool = await asyncpg.create_pool(
+                config.connection_string,
+                min_size=constants.MIN_POOL_SIZE,
+                max_size=constants.MAX_POOL_SIZE,
+                connection_class=connection_class,
+            )
         logger.info("Database pool ready")
+        collector = REGISTRY.add_collector(pool_collector(pool))
         try:
             yield pool
         finally:
+            REGISTRY.remove_collector(collector)
             await pool.close()
             logger.info("Database pool closed")
 
+    @provide(scope=Scope.APP)
+    def get_product_reader(self, pool: asyncpg.Pool) -> PooledProductReader:
+        return PooledProductReader(pool)
+
+    @provide(scope=Scope.APP)
+    async def get_idempotency_purger(self, pool: asyncpg.Pool) -> AsyncGenerator[IdempotencyKeyPurger, None]:
+        purger = IdempotencyKeyPurger(
+            pool,
+            ttl=constants.IDEMPOTENCY_KEY_TTL,
+            interval=constants.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+            batch_size=constants.IDEMPOTENCY_PURGE_BATCH_SIZE,
+        )
+        purger.start()
+        try:
+            yield purger
+        finally:
+            await purger.close()
+
+    catalog_reader = alias(
+        source=PooledProductReader,
+        provides=ProductCatalogReaderPort,
+    )
+
 
 class KafkaProvider(Provider):
     scope = Scope.APP
@@ -103,19 +247,184 @@ class KafkaProvider(Provider):
     async def get_broker(
         self, config: KafkaConfig
     ) -> AsyncGenerator[MessageBrokerPort, None]:
+        with STARTUP.measure("import", "aiokafka"):
+            from app.infrastructure.adapters.amqp.kafka import KafkaMessageBroker
+
         broker = KafkaMessageBroker(
             bootstrap_servers=config.bootstrap_servers,
             consumer_group_id=config.consumer_group_id,
         )
         # await broker.start()
         logger.info("Kafka broker started")
+        collector = REGISTRY.add_collector(partition_collector(broker))
         try:
             yield broker
         finally:
+            REGISTRY.remove_collector(collector)
             await broker.close()
             logger.info("Kafka broker stopped")
 
 
+class CacheProvider(Provider):
+    scope = Scope.APP
+
+    @provide(scope=Scope.APP)
+    async def get_redis_router(
+        self, config: CacheConfig, tracing: TracingConfig
+    ) -> AsyncGenerator[RedisShardRouter, None]:
+        with STARTUP.measure("import", "redis"):
+            from redis.asyncio import Redis
+
+            client_class = Redis
+            if tracing.enabled:
+                from app.infrastructure.adapters.tracing.instrumentation import TracedRedis
+
+                client_class = TracedRedis
+        # Cached products are binary payloads, so responses are never decoded
+        if config.nodes:
+            clients = {
+                node: client_class.from_url(
+                    node,
+                    password=config.password,
+                    max_connections=config.max_connections,
+                    decode_responses=False,
+                )
+                for node in config.nodes
+            }
+        else:
+            clients = {
+                f"{config.host}:{config.port}/{config.db}": client_class(
+                    host=config.host,
+                    port=config.port,
+                    db=config.db,
+                    password=config.password,
+                    ssl=bool(config.ssl),
+                    max_connections=config.max_connections,
+                    decode_responses=False,
+                )
+            }
+        router = RedisShardRouter(clients)
+        logger.info(f"Redis clients ready for {len(clients)} node(s)")
+        try:
+            yield router
+        finally:
+            await router.aclose()
+            logger.info("Redis clients closed")
+
+    @provide(scope=Scope.APP)
+    def get_product_cache(
+        self,
+        router: RedisShardRouter,
+        config: CacheConfig,
+        reader: PooledProductReader,
+    ) -> ProductCachePort:
+        from app.infrastructure.adapters.cache.product_cache import RedisProductCache
+
+        return RedisProductCache(router, config, loader=reader.get_by_guid)
+
+    @provide(scope=Scope.APP)
+    async def get_existence_filter(
+        self,
+        router: RedisShardRouter,
+        config: CacheConfig,
+        reader: PooledProductReader,
+    ) -> AsyncGenerator[ProductExistenceFilterPort, None]:
+        from app.infrastructure.adapters.cache.existence_filter import (
+            NullExistenceFilter,
+            RedisBloomExistenceFilter,
+        )
+
+        if not config.existence_filter_enabled:
+            yield NullExistenceFilter()
+            return
+
+        # The bitmap and its rebuild keys must share a node for the add script
+        redis = router.for_shard(CacheKey.PRODUCT_FILTER)
+        existence_filter = RedisBloomExistenceFilter(redis, config, reader)
+        with STARTUP.measure("connection", "redis existence filter load"):
+            await existence_filter.start()
+        logger.info("Product existence filter ready")
+        try:
+            yield existence_filter
+        finally:
+            await existence_filter.close()
+
+    @provide(scope=Scope.APP)
+    async def get_cache_warmer(
+        self,
+        reader: PooledProductReader,
+        cache: ProductCachePort,
+        config: CacheConfig,
+    ) -> AsyncGenerator[ProductCacheWarmer, None]:
+        # Resolving the warmer during application start kicks off the warmup
+        warmer = ProductCacheWarmer(reader, cache, config)
+        warmer.start()
+        try:
+            yield warmer
+        finally:
+            await warmer.close()
+
+    @provide(scope=Scope.REQUEST)
+    def get_cache_invalidator(
+        self,
+        cache: ProductCachePort,
+        existence_filter: ProductExistenceFilterPort,
+        config: CacheConfig,
+    ) -> ProductCacheInvalidator:
+        return ProductCacheInvalidator(
+            cache,
+            existence_filter,
+            second_pass_delay=config.second_invalidation_delay,
+        )
+
+    invalidator_port = alias(
+        source=ProductCacheInvalidator,
+        provides=ProductCacheInvalidatorPort,
+    )
+
+
+class AdmissionProvider(Provider):
+
+    scope = Scope.APP
+
+    @provide(scope=Scope.APP)
+    def get_concurrency_limiter(self, config: AdmissionConfig) -> ConcurrencyLimiterPort:
+        if not config.enabled:
+            return NullConcurrencyLimiter()
+        return AdaptiveConcurrencyLimiter(config)
+
+    @provide(scope=Scope.APP)
+    def get_rate_limiter(self, router: RedisShardRouter, config: RateLimitConfig) -> RateLimiterPort:
+        from app.infrastructure.adapters.rate_limit.limiter import NullRateLimiter, RedisTokenBucketLimiter
+
+        if not config.enabled:
+            return NullRateLimiter()
+        return RedisTokenBucketLimiter(router, config)
+
+
+class ChangeFeedProvider(Provider):
+
+    scope = Scope.APP
+
+    @provide(scope=Scope.APP)
+    def get_change_hub(self) -> ProductChangeHub:
+        return ProductChangeHub()
+
+    @provide(scope=Scope.APP)
+    async def get_change_feed(
+        self,
+        hub: ProductChangeHub,
+        config: DatabaseConfig,
+    ) -> AsyncGenerator[ProductChangeFeedPort, None]:
+        # Resolved with the first subscriber, so idle processes hold no LISTEN connection
+        listener = PostgresProductChangeListener(config.connection_string, hub)
+        await listener.start()
+        try:
+            yield hub
+        finally:
+            await listener.close()
+
+
 class PersistenceProvider(Provider):
 
     scope = Scope.REQUEST
@@ -124,28 +433,123 @@ class PersistenceProvider(Provider):
     async def get_connection(
         self, pool: asyncpg.Pool
     ) -> AsyncGenerator[asyncpg.Connection, None]:
+        started = time.perf_counter()
         async with pool.acquire() as conn:
+            DB_POOL_ACQUIRE_DURATION.labels().observe(time.perf_counter() - started)
             yield conn
 
     @provide(scope=Scope.REQUEST)
     def get_product_repo(
-        self, conn: asyncpg.Connection
+        self,
+        conn: asyncpg.Connection,
+        invalidator: ProductCacheInvalidator,
     ) -> ProductRepositoryPort:
-        return RDBProductRepository(conn)
+        return RDBProductRepository(conn, invalidator=invalidator)
 
     @provide(scope=Scope.REQUEST, provides=UnitOfWorkPort)
     async def get_uow(
         self,
         conn: asyncpg.Connection,
         product_repo: ProductRepositoryPort,
+        invalidator: ProductCacheInvalidator,
     ) -> UnitOfWorkPort:
         uow = RDBUnitOfWork(
             conn=conn,
             products=product_repo,
+            idempotency=RDBIdempotencyRepository(conn),
+            hooks=[invalidator],
         )
         return uow
 
 
+class HandlersProvider(Provider):
+    scope = Scope.REQUEST
+
+    add_product = provide(AddProductHandler)
+    get_product = provide(GetProductHandler)
+    get_product_by_slug = provide(GetProductBySlugHandler)
+    batch_get_products = provide(BatchGetProductsHandler)
+    get_product_validator = provide(GetProductValidatorHandler)
+    export_products = provide(ExportProductsHandler)
+    list_products = provide(ListProductsHandler)
+
+
+class MetricsProvider(Provider):
+
+    scope = Scope.APP
+
+    INSTRUMENTED_HANDLERS = (
+        AddProductHandler,
+        GetProductHandler,
+        GetProductBySlugHandler,
+        BatchGetProductsHandler,
+        GetProductValidatorHandler,
+        ExportProductsHandler,
+        ListProductsHandler,
+    )
+
+    def __init__(self):
+        super().__init__()
+        for handler_type in self.INSTRUMENTED_HANDLERS:
+            self.decorate(_instrumented(handler_type), provides=handler_type, scope=Scope.REQUEST)
+
+    @provide(scope=Scope.APP)
+    async def get_metrics_exporter(self, config: MetricsConfig) -> AsyncGenerator[MetricsExporter, None]:
+        exporter = MetricsExporter(
+            directory=config.multiprocess_dir or None,
+            flush_interval=config.flush_interval_seconds,
+        )
+        exporter.start()
+        try:
+            yield exporter
+        finally:
+            await exporter.close()
+
+
+class TracingProvider(Provider):
+
+    scope = Scope.APP
+
+    @provide(scope=Scope.APP)
+    def get_tracer_provider(self, config: TracingConfig) -> Iterator[TracerProvider]:
+        provider = setup_tracing(config)
+        try:
+            yield provider
+        finally:
+            shutdown_tracing(provider)
+
+
+class DiagnosticsProvider(Provider):
+
+    scope = Scope.APP
+
+    @provide(scope=Scope.APP)
+    async def get_loop_monitor(self, config: DiagnosticsConfig) -> AsyncGenerator[LoopMonitorPort, None]:
+        if config.loop_stall_threshold_seconds <= 0:
+            yield NullLoopMonitor()
+            return
+        # Resolved in lifecycle.started(), so it watches the loop serving requests
+        monitor = LoopLagMonitor(config.loop_stall_threshold_seconds)
+        monitor.start()
+        try:
+            yield monitor
+        finally:
+            monitor.stop()
+
+    @provide(scope=Scope.APP)
+    def get_loop_profiler(self) -> LoopProfilerPort:
+        return LoopProfiler()
+
+
+def _instrumented(handler_type: type) -> Callable[..., Any]:
+    # dishka finds the decorated dependency by its annotation
+    def decorate(handler):
+        return InstrumentedHandler(handler)
+
+    decorate.__annotations__ = {"handler": handler_type, "return": handler_type}
+    return decorate
+
+
 # ============================================================================
 # CONTAINER
 # ============================================================================
@@ -155,7 +559,14 @@ def build_container() -> AsyncContainer:
         ConfigProvider(),
         PoolProvider(),
         KafkaProvider(),
+        CacheProvider(),
+        AdmissionProvider(),
+        ChangeFeedProvider(),
         PersistenceProvider(),
+        HandlersProvider(),
+        MetricsProvider(),
+        TracingProvider(),
+        DiagnosticsProvider(),
     )
     logger.info("DI container created")
     return container
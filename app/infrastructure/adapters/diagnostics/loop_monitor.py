@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from types import FrameType
+
+from app.domain.dto.diagnostics import LoopStall
+from app.infrastructure.adapters.monitoring.instruments import EVENT_LOOP_LAG, EVENT_LOOP_STALLS
+from app.infrastructure.ports.diagnostics import LoopMonitorPort
+
+logger = logging.getLogger(__name__)
+
+# Stalls kept for the diagnostics endpoint
+MAX_STALLS = 20
+# Innermost frames of a stall stack that are kept
+MAX_STACK_DEPTH = 40
+ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+def task_label(task: asyncio.Task | None) -> str | None:
+    """A task's explicit name, or its coroutine's for the default ``Task-N`` names."""
+    if task is None:
+        return None
+    name = task.get_name()
+    if name.startswith("Task-"):
+        return getattr(task.get_coro(), "__qualname__", name)
+    return name
+
+
+def callback_stack(frame: FrameType) -> list[str]:
+    """The stack above the loop's ``Handle._run``, i.e. of the callback or task step running."""
+    summary = traceback.extract_stack(frame)
+    for index in range(len(summary) - 1, -1, -1):
+        if summary[index].name == "_run" and summary[index].filename.startswith(ASYNCIO_DIR):
+            summary = summary[index + 1:]
+            break
+    return [line.rstrip() for line in traceback.format_list(summary[-MAX_STACK_DEPTH:])]
+
+
+class LoopLagMonitor(LoopMonitorPort):
+    """
+    Detects callbacks that block the event loop. A heartbeat is scheduled on
+    the loop every ``interval`` seconds and records how late it ran; a
+    watchdog thread checks the last heartbeat, and when the loop has been
+    silent longer than ``threshold`` it captures the loop thread's stack and
+    current task while the offending code is still running. The stall is
+    logged from the watchdog, so a loop that never recovers is reported too,
+    and again with its full duration when the heartbeat comes back.
+    """
+
+    def __init__(self, threshold: float, interval: float | None = None):
+        self._threshold = threshold
+        self._interval = interval or min(max(threshold / 4, 0.005), 0.25)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._last_beat = 0.0
+        self._reported_beat = 0.0
+        self._stalls: deque[LoopStall] = deque(maxlen=MAX_STALLS)
+        self._current: LoopStall | None = None
+
+    def start(self) -> None:
+        """Starts monitoring the running loop, call from a coroutine on it."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._handle = self._loop.call_later(self._interval, self._beat)
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started: stall threshold {self._threshold * 1000:.0f}ms")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._handle is not None:
+            self._handle.cancel()
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+    def stalls(self) -> list[LoopStall]:
+        return list(self._stalls)
+
+    def _beat(self) -> None:
+        now = time.monotonic()
+        lag = max(now - self._last_beat - self._interval, 0.0)
+        EVENT_LOOP_LAG.labels().observe(lag)
+        if lag > self._threshold:
+            EVENT_LOOP_STALLS.labels().inc()
+            stall, self._current = self._current, None
+            if stall is not None:
+                stall.duration_seconds = lag
+            where = f" in {stall.task}" if stall is not None and stall.task else ""
+            logger.warning(f"Event loop was blocked for {lag * 1000:.0f}ms{where}")
+        self._last_beat = now
+        if not self._stopped.is_set():
+            self._handle = self._loop.call_later(self._interval, self._beat)
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self._interval):
+            beat = self._last_beat
+            blocked = time.monotonic() - beat - self._interval
+            if blocked > self._threshold and beat != self._reported_beat:
+                self._reported_beat = beat
+                self._report(beat, blocked)
+
+    def _report(self, beat: float, blocked: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        stack = callback_stack(frame)
+        task = task_label(asyncio.current_task(self._loop))
+        del frame
+        if self._last_beat != beat:
+            return  # the loop came back while the stack was taken, it shows whatever runs now
+        stall = LoopStall(started_at=time.time() - blocked, duration_seconds=None, task=task, stack=stack)
+        self._current = stall
+        self._stalls.append(stall)
+        where = f" in {stall.task}" if stall.task else ""
+        logger.warning(
+            f"Event loop blocked for over {self._threshold * 1000:.0f}ms{where}, loop thread stack:\n"
+            + "\n".join(stack)
+        )
+
+
+class NullLoopMonitor(LoopMonitorPort):
+    def stalls(self) -> list[LoopStall]:
+        return []
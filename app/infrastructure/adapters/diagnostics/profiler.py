@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import selectors
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+
+from app.domain.errors.diagnostics import ProfilerBusyError
+from app.infrastructure.adapters.diagnostics.loop_monitor import ASYNCIO_DIR, task_label
+from app.infrastructure.ports.diagnostics import LoopProfilerPort
+
+logger = logging.getLogger(__name__)
+
+SELECTORS_FILE = selectors.__file__
+
+
+def _frame_name(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def collapse(frame: FrameType, task: asyncio.Task | None) -> str:
+    """
+    One sample in the collapsed (folded) flamegraph format, rooted at the
+    task that was running. Frames below the loop's ``Handle._run`` are the
+    same for every sample (server, ``asyncio.run``, ``run_forever``) and are
+    dropped, as are asyncio internals in between. A loop waiting in the
+    selector with no task is ``idle``, other callbacks are under ``loop``.
+    """
+    if task is None and frame.f_code.co_filename == SELECTORS_FILE:
+        return "idle"
+
+    frames: list[str] = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(ASYNCIO_DIR):
+            if code.co_name == "_run" and code.co_qualname == "Handle._run":
+                break
+        else:
+            frames.append(_frame_name(frame))
+        frame = frame.f_back
+    frames.append(f"task:{task_label(task)}" if task is not None else "loop")
+    return ";".join(reversed(frames))
+
+
+class LoopProfiler(LoopProfilerPort):
+    """
+    Sampling profiler for the event loop thread, started on demand. A thread
+    takes the loop thread's stack every ``interval`` seconds with
+    ``sys._current_frames`` and tags it with the task current on the loop,
+    so time spent in a coroutine is attributed to the task that awaited it
+    rather than to the loop machinery. Nothing is installed in the loop
+    itself and the cost is zero between profiles; while one runs it is one
+    stack walk per sample. One profile at a time.
+    """
+
+    def __init__(self):
+        self._running = False
+
+    async def profile(self, seconds: float, interval: float) -> str:
+        if self._running:
+            raise ProfilerBusyError()
+        self._running = True
+        stop = threading.Event()
+        try:
+            loop = asyncio.get_running_loop()
+            done = loop.create_future()
+            sampler = threading.Thread(
+                target=self._sample,
+                args=(loop, threading.get_ident(), seconds, interval, stop, done),
+                name="loop-profiler",
+                daemon=True,
+            )
+            logger.info(f"Profiling the event loop for {seconds:g}s every {interval * 1000:g}ms")
+            sampler.start()
+            stacks: Counter[str] = await done
+        finally:
+            stop.set()  # a cancelled request stops the sampler too
+            self._running = False
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    @staticmethod
+    def _sample(
+        loop: asyncio.AbstractEventLoop,
+        thread_id: int,
+        seconds: float,
+        interval: float,
+        stop: threading.Event,
+        done: asyncio.Future,
+    ) -> None:
+        stacks: Counter[str] = Counter()
+        deadline = time.monotonic() + seconds
+        try:
+            while time.monotonic() < deadline and not stop.is_set():
+                frame = sys._current_frames().get(thread_id)
+                if frame is not None:
+                    stacks[collapse(frame, asyncio.current_task(loop))] += 1
+                    del frame
+                stop.wait(interval)
+        finally:
+            loop.call_soon_threadsafe(_resolve, done, stacks)
+
+
+def _resolve(done: asyncio.Future, stacks: Counter[str]) -> None:
+    if not done.done():
+        done.set_result(stacks)
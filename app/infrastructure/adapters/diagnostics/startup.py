@@ -0,0 +1,45 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from app.domain.dto.diagnostics import StartupPhase
+
+
+class StartupProfile:
+    """
+    Wall time of the steps between process start and serving: dependencies
+    resolved by ``lifecycle.started``, the optional adapters they import on
+    first use and the connections they open. Steps nest, a provider's row includes
+    the imports and connections made while building it. Startup is
+    sequential, so one depth counter is enough to keep the tree.
+    """
+
+    def __init__(self):
+        self._phases: list[StartupPhase] = []
+        self._depth = 0
+
+    @contextmanager
+    def measure(self, kind: str, name: str) -> Iterator[None]:
+        phase = StartupPhase(kind=kind, name=name, seconds=0.0, depth=self._depth)
+        self._phases.append(phase)
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            phase.seconds = time.perf_counter() - started
+            self._depth -= 1
+
+    def phases(self) -> list[StartupPhase]:
+        return list(self._phases)
+
+    def report(self) -> str:
+        total = sum(phase.seconds for phase in self._phases if phase.depth == 0)
+        lines = [f"Startup took {total * 1000:.0f}ms"]
+        for phase in self._phases:
+            label = f"{'  ' * phase.depth}{phase.kind} {phase.name}"
+            lines.append(f"  {label:<56}{phase.seconds * 1000:>8.1f}ms")
+        return "\n".join(lines)
+
+
+STARTUP = StartupProfile()
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import os
+from pathlib import Path
+
+import msgspec
+
+from .metrics import REGISTRY, MetricSnapshot, MetricsRegistry, Sample
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "metrics-"
+
+
+class ProcessSnapshot(msgspec.Struct):
+    pid: int
+    metrics: list[MetricSnapshot]
+
+
+class MetricsExporter:
+    """
+    Serves the registry of this process, or of every worker when a
+    multiprocess directory is configured. Forked workers each write their
+    snapshot to ``<directory>/metrics-<pid>.msgpack`` every ``flush_interval``
+    seconds, off the recording path, and the worker answering a scrape merges
+    the other workers' files with its own live registry: counters and
+    histograms are summed over every file, so a restarted worker's totals
+    never go backwards, gauges only over live processes. A scrape only reads
+    the directory. The directory has to be emptied when the deployment starts.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        flush_interval: float = 1.0,
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self._directory = Path(directory) if directory else None
+        self._flush_interval = flush_interval
+        self._registry = registry
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder(ProcessSnapshot)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._directory is None or self._task is not None:
+            return
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._flush()
+
+    def collect(self) -> list[MetricSnapshot]:
+        local = self._registry.snapshot()
+        if self._directory is None:
+            return local
+        # This process's own file may lag by a flush interval, the registry is current
+        pid = os.getpid()
+        others = [(snapshot, alive) for snapshot, alive in self._read_all() if snapshot.pid != pid]
+        return self._merge([(ProcessSnapshot(pid=pid, metrics=local), True), *others])
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            self._flush()
+
+    def _flush(self) -> None:
+        try:
+            self._write(self._registry.snapshot())
+        except OSError:
+            logger.warning("Metrics snapshot write failed", exc_info=True)
+
+    def _write(self, metrics: list[MetricSnapshot]) -> None:
+        pid = os.getpid()
+        path = self._directory / f"{SNAPSHOT_PREFIX}{pid}.msgpack"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(self._encoder.encode(ProcessSnapshot(pid=pid, metrics=metrics)))
+        os.replace(tmp, path)  # readers never see a partial file
+
+    def _read_all(self) -> list[tuple[ProcessSnapshot, bool]]:
+        snapshots = []
+        try:
+            paths = list(self._directory.glob(f"{SNAPSHOT_PREFIX}*.msgpack"))
+        except OSError:
+            logger.warning("Metrics snapshot directory unreadable, serving this process only", exc_info=True)
+            return snapshots
+        for path in paths:
+            try:
+                snapshot = self._decoder.decode(path.read_bytes())
+            except (OSError, msgspec.DecodeError):
+                continue
+            snapshots.append((snapshot, _is_alive(snapshot.pid)))
+        return snapshots
+
+    @staticmethod
+    def _merge(snapshots: list[tuple[ProcessSnapshot, bool]]) -> list[MetricSnapshot]:
+        merged: dict[str, MetricSnapshot] = {}
+        samples: dict[str, dict[tuple[str, ...], Sample]] = {}
+        for snapshot, alive in snapshots:
+            for metric in snapshot.metrics:
+                if metric.kind == "gauge" and not alive:
+                    continue
+                if metric.name not in merged:
+                    merged[metric.name] = msgspec.structs.replace(metric, samples=[])
+                    samples[metric.name] = {}
+                by_labels = samples[metric.name]
+                for sample in metric.samples:
+                    total = by_labels.get(sample.labels)
+                    if total is None:
+                        by_labels[sample.labels] = Sample(sample.labels, sample.value, list(sample.counts))
+                        continue
+                    total.value += sample.value
+                    for i, count in enumerate(sample.counts):
+                        total.counts[i] += count
+
+        for name, metric in merged.items():
+            metric.samples = list(samples[name].values())
+        return list(merged.values())
+
+
+def _is_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
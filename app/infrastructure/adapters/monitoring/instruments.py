@@ -0,0 +1,203 @@
+"""
+Application metrics. Conventions:
+
+- names are ``app_<subsystem>_<what>_<unit>``, counters end in ``_total``,
+  durations are in seconds;
+- label values come from small closed sets: handler class names, cache
+  operations and results, Kafka topics and partitions, outcomes. Never
+  GUIDs, slugs, paths, client ids or error messages, each distinct value is
+  a new time series in every worker.
+"""
+import time
+from typing import Any, Callable
+
+import asyncpg
+
+from app.domain.errors.base import DomainError
+from app.infrastructure.ports.amqp import MessageBrokerPort
+
+from .metrics import Counter, Gauge, Histogram
+
+HANDLER_DURATION = Histogram(
+    "app_handler_duration_seconds",
+    "Use case handler latency",
+    ("handler", "outcome"),  # outcome: ok | domain_error | error
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "app_db_pool_connections",
+    "asyncpg pool connections",
+    ("state",),  # state: idle | in_use | max
+)
+DB_POOL_ACQUIRE_DURATION = Histogram(
+    "app_db_pool_acquire_seconds",
+    "Wait for a pooled connection",
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+CACHE_REQUESTS = Counter(
+    "app_cache_requests_total",
+    "Product cache lookups",
+    ("operation", "result"),  # result: hit | miss | negative | error
+)
+
+KAFKA_PUBLISHED = Counter(
+    "app_kafka_published_total",
+    "Messages published to Kafka",
+    ("topic", "outcome"),  # outcome: ok | error
+)
+KAFKA_PUBLISH_DURATION = Histogram(
+    "app_kafka_publish_duration_seconds",
+    "Kafka publish latency until the broker acknowledged",
+    ("topic",),
+)
+KAFKA_CONSUMED = Counter(
+    "app_kafka_consumed_total",
+    "Messages consumed from Kafka",
+    ("topic", "outcome"),  # outcome: ok | error | unhandled
+)
+KAFKA_CONSUMER_LAG = Gauge(
+    "app_kafka_consumer_lag",
+    "Messages behind the high watermark not yet committed, per assigned partition",
+    ("topic", "partition"),
+)
+KAFKA_CONSUMER_OFFSET = Gauge(
+    "app_kafka_consumer_offset",
+    "Offsets of assigned partitions",
+    ("topic", "partition", "kind"),  # kind: committed | position | high_watermark
+)
+KAFKA_CONSUMER_RATE = Gauge(
+    "app_kafka_consumer_messages_per_second",
+    "Processing rate per assigned partition",
+    ("topic", "partition"),
+)
+KAFKA_HANDLER_DURATION = Histogram(
+    "app_kafka_handler_duration_seconds",
+    "Message delivery to ack or nack",
+    ("topic", "partition"),
+)
+
+LOKI_RECORDS = Counter(
+    "app_loki_records_total",
+    "Log records handled by the Loki sink",
+    ("outcome",),  # outcome: sent | dropped | failed
+)
+LOKI_PUSHES = Counter(
+    "app_loki_pushes_total",
+    "HTTP pushes to Loki",
+    ("outcome",),  # outcome: ok | retry
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "app_event_loop_lag_seconds",
+    "Delay of the loop monitor's heartbeat past its due time",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_STALLS = Counter(
+    "app_event_loop_stalls_total",
+    "Callbacks that blocked the event loop longer than the stall threshold",
+)
+
+
+class CacheOperationMetrics:
+    """Pre-bound children of CACHE_REQUESTS for one cache operation."""
+
+    __slots__ = ("hit", "miss", "negative", "error")
+
+    def __init__(self, operation: str):
+        self.hit = CACHE_REQUESTS.labels(operation, "hit")
+        self.miss = CACHE_REQUESTS.labels(operation, "miss")
+        self.negative = CACHE_REQUESTS.labels(operation, "negative")
+        self.error = CACHE_REQUESTS.labels(operation, "error")
+
+
+def pool_collector(pool: asyncpg.Pool) -> Callable[[], None]:
+    idle = DB_POOL_CONNECTIONS.labels("idle")
+    in_use = DB_POOL_CONNECTIONS.labels("in_use")
+    maximum = DB_POOL_CONNECTIONS.labels("max")
+
+    def collect() -> None:
+        size, free = pool.get_size(), pool.get_idle_size()
+        idle.set(free)
+        in_use.set(size - free)
+        maximum.set(pool.get_max_size())
+
+    return collect
+
+
+def loki_collector(stats: Any) -> Callable[[], None]:
+    """Mirrors a ``LokiSinkStats``, which the sink's thread keeps as plain counters."""
+    children = {
+        "sent": LOKI_RECORDS.labels("sent"),
+        "dropped": LOKI_RECORDS.labels("dropped"),
+        "failed": LOKI_RECORDS.labels("failed"),
+        "pushes": LOKI_PUSHES.labels("ok"),
+        "retries": LOKI_PUSHES.labels("retry"),
+    }
+
+    def collect() -> None:
+        for field, child in children.items():
+            child.value = getattr(stats, field)
+
+    return collect
+
+
+def partition_collector(broker: MessageBrokerPort) -> Callable[[], None]:
+    """Mirrors ``broker.partition_stats()``; series of revoked partitions are dropped."""
+    exported: set[tuple[str, str]] = set()
+
+    def collect() -> None:
+        current = set()
+        for stats in broker.partition_stats():
+            labels = (stats.topic, str(stats.partition))
+            current.add(labels)
+            KAFKA_CONSUMER_RATE.labels(*labels).set(stats.messages_per_second)
+            for kind in ("committed", "position", "high_watermark"):
+                value = getattr(stats, kind)
+                if value is None:
+                    KAFKA_CONSUMER_OFFSET.remove(*labels, kind)
+                else:
+                    KAFKA_CONSUMER_OFFSET.labels(*labels, kind).set(value)
+            if stats.lag is None:
+                KAFKA_CONSUMER_LAG.remove(*labels)
+            else:
+                KAFKA_CONSUMER_LAG.labels(*labels).set(stats.lag)
+
+        for labels in exported - current:
+            KAFKA_CONSUMER_LAG.remove(*labels)
+            KAFKA_CONSUMER_RATE.remove(*labels)
+            for kind in ("committed", "position", "high_watermark"):
+                KAFKA_CONSUMER_OFFSET.remove(*labels, kind)
+        exported.clear()
+        exported.update(current)
+
+    return collect
+
+
+class InstrumentedHandler:
+    """Records every ``handle`` call of a use case handler in HANDLER_DURATION."""
+
+    __slots__ = ("_handler", "_ok", "_domain_error", "_error")
+
+    def __init__(self, handler: Any):
+        name = type(handler).__name__
+        self._handler = handler
+        self._ok = HANDLER_DURATION.labels(name, "ok")
+        self._domain_error = HANDLER_DURATION.labels(name, "domain_error")
+        self._error = HANDLER_DURATION.labels(name, "error")
+
+    async def handle(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await self._handler.handle(*args, **kwargs)
+        except DomainError:
+            self._domain_error.observe(time.perf_counter() - started)
+            raise
+        except Exception:
+            self._error.observe(time.perf_counter() - started)
+            raise
+        self._ok.observe(time.perf_counter() - started)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._handler, name)
@@ -0,0 +1,221 @@
+import math
+from bisect import bisect_left
+from typing import Callable, ClassVar, Iterable
+
+import msgspec
+
+# Seconds, from a cache hit to a slow export page
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Sample(msgspec.Struct, array_like=True):
+    labels: tuple[str, ...]
+    value: float  # histogram: sum of observations
+    counts: list[int] = []  # histogram: per bucket, not cumulative, +Inf last
+
+
+class MetricSnapshot(msgspec.Struct):
+    name: str
+    kind: str
+    documentation: str
+    labelnames: tuple[str, ...]
+    buckets: tuple[float, ...] = ()
+    samples: list[Sample] = []
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric:
+    """
+    Children are plain slot objects updated in place, no locks: every update
+    happens on the event loop thread, and a snapshot taken mid-update is off
+    by one observation at worst. Hot paths keep the child returned by
+    ``labels`` instead of looking it up per call.
+    """
+
+    kind: ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        registry: "MetricsRegistry | None" = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        (registry or REGISTRY).register(self)
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def remove(self, *values: str) -> None:
+        """Drops a label set, for series whose subject went away (a revoked partition)."""
+        self._children.pop(values, None)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def snapshot(self) -> MetricSnapshot:
+        return MetricSnapshot(
+            name=self.name,
+            kind=self.kind,
+            documentation=self.documentation,
+            labelnames=self.labelnames,
+            samples=[Sample(labels, child.value) for labels, child in list(self._children.items())],
+        )
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        registry: "MetricsRegistry | None" = None,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def snapshot(self) -> MetricSnapshot:
+        return MetricSnapshot(
+            name=self.name,
+            kind=self.kind,
+            documentation=self.documentation,
+            labelnames=self.labelnames,
+            buckets=self.buckets,
+            samples=[
+                Sample(labels, child.sum, list(child.counts))
+                for labels, child in list(self._children.items())
+            ],
+        )
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], None]) -> Callable[[], None]:
+        """``collector`` runs before every snapshot, to set gauges read from elsewhere (pool sizes)."""
+        self._collectors.append(collector)
+        return collector
+
+    def remove_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.remove(collector)
+
+    def snapshot(self) -> list[MetricSnapshot]:
+        for collector in self._collectors:
+            collector()
+        return [metric.snapshot() for metric in self._metrics.values()]
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(snapshots: Iterable[MetricSnapshot]) -> str:
+    """Prometheus text exposition format 0.0.4."""
+    lines: list[str] = []
+    for metric in snapshots:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for sample in metric.samples:
+            if metric.kind != "histogram":
+                lines.append(f"{metric.name}{_labels(metric.labelnames, sample.labels)} {_number(sample.value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*metric.buckets, math.inf), sample.counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{metric.name}_bucket{_labels(metric.labelnames, sample.labels, le)} {cumulative}")
+            labels = _labels(metric.labelnames, sample.labels)
+            lines.append(f"{metric.name}_sum{labels} {_number(sample.value)}")
+            lines.append(f"{metric.name}_count{labels} {cumulative}")
+    lines.append("")
+    return "\n".join(lines)
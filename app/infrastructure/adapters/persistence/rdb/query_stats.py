@@ -0,0 +1,182 @@
+import hashlib
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Any, ClassVar, Iterable
+
+import asyncpg
+
+from app.domain.dto.diagnostics import QueryStats
+from app.infrastructure.ports.diagnostics import QueryStatsPort
+
+logger = logging.getLogger(__name__)
+
+# Latencies kept per fingerprint for the p99, the most recent ones
+LATENCY_SAMPLES = 1024
+OTHER_FINGERPRINT = "other"
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_LISTS = re.compile(r"\(\s*(?:\?|\$\d+)(?:\s*,\s*(?:\?|\$\d+))+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(query: str) -> tuple[str, str]:
+    """
+    Identifier and normalized text of a query: comments dropped, literals
+    replaced by ``?``, parameter lists collapsed and whitespace squeezed, so
+    the same statement written with different literals or layout shares one
+    entry. Queries are mostly constant strings, so this runs once per query.
+    """
+    text = _COMMENTS.sub(" ", query)
+    text = _STRINGS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _LISTS.sub("(...)", text)
+    text = _SPACES.sub(" ", text).strip()
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest(), text
+
+
+def redact(args: Iterable[Any]) -> str:
+    """Parameters as their types only, values may be personal data or secrets."""
+    return ", ".join(f"${index}=<{type(arg).__name__}>" for index, arg in enumerate(args, 1))
+
+
+def _rows(result: Any) -> int:
+    if isinstance(result, str):  # execute() status, e.g. "UPDATE 3" or "INSERT 0 1"
+        count = result.rpartition(" ")[2]
+        return int(count) if count.isdigit() else 0
+    if isinstance(result, list):
+        return len(result)
+    return 0 if result is None else 1
+
+
+class _FingerprintStats:
+    __slots__ = ("query", "calls", "errors", "total", "max", "rows", "latencies", "next")
+
+    def __init__(self, query: str):
+        self.query = query
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.latencies: list[float] = []
+        self.next = 0
+
+    def add(self, elapsed: float, rows: int, failed: bool) -> None:
+        self.calls += 1
+        self.errors += failed
+        self.total += elapsed
+        self.rows += rows
+        if elapsed > self.max:
+            self.max = elapsed
+        if len(self.latencies) < LATENCY_SAMPLES:
+            self.latencies.append(elapsed)
+        else:
+            self.latencies[self.next] = elapsed
+            self.next = (self.next + 1) % LATENCY_SAMPLES
+
+
+class QueryStatsRecorder(QueryStatsPort):
+    """
+    Per-fingerprint query statistics kept in process: calls, errors, total
+    time, rows and a p99 over the last LATENCY_SAMPLES executions, plus a
+    warning with redacted parameters for every query slower than
+    ``slow_threshold``. Fingerprints past ``max_fingerprints`` are counted
+    under ``other``, so dynamically built SQL cannot grow it without bound.
+    """
+
+    def __init__(self, slow_threshold: float, max_fingerprints: int):
+        self._slow_threshold = slow_threshold
+        self._max_fingerprints = max_fingerprints
+        self._stats: dict[str, _FingerprintStats] = {}
+
+    def record(self, query: str, args: Iterable[Any], elapsed: float, rows: int, failed: bool = False) -> None:
+        key, text = fingerprint(query)
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= self._max_fingerprints:
+                key, text = OTHER_FINGERPRINT, OTHER_FINGERPRINT
+                stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _FingerprintStats(text)
+        stats.add(elapsed, rows, failed)
+
+        if elapsed >= self._slow_threshold:
+            logger.warning(
+                f"Slow query {key} took {elapsed * 1000:.0f}ms, {rows} rows"
+                f"{' (failed)' if failed else ''}: {text} [{redact(args)}]"
+            )
+
+    def snapshot(self) -> list[QueryStats]:
+        snapshot = []
+        for key, stats in self._stats.items():
+            latencies = sorted(stats.latencies)
+            snapshot.append(QueryStats(
+                fingerprint=key,
+                query=stats.query,
+                calls=stats.calls,
+                errors=stats.errors,
+                total_seconds=stats.total,
+                mean_seconds=stats.total / stats.calls,
+                p99_seconds=latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+                max_seconds=stats.max,
+                rows=stats.rows,
+            ))
+        snapshot.sort(key=lambda entry: entry.total_seconds, reverse=True)
+        return snapshot
+
+
+class NullQueryStats(QueryStatsPort):
+    def snapshot(self) -> list[QueryStats]:
+        return []
+
+
+class QueryStatsConnection(asyncpg.Connection):
+    """
+    Pool ``connection_class`` timing every query method into ``query_stats``,
+    bound by subclassing per pool (asyncpg builds connections itself, so the
+    recorder cannot be passed in). Statements asyncpg issues on its own, such
+    as a transaction's BEGIN and COMMIT, go through ``execute`` and count too.
+    """
+
+    query_stats: ClassVar[QueryStatsRecorder]
+
+    async def _timed(self, method, query: str, args: Iterable[Any], *call_args, **kwargs) -> Any:
+        started = time.perf_counter()
+        try:
+            result = await method(query, *call_args, **kwargs)
+        except BaseException:
+            self.query_stats.record(query, args, time.perf_counter() - started, 0, failed=True)
+            raise
+        self.query_stats.record(query, args, time.perf_counter() - started, _rows(result))
+        return result
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        return await self._timed(super().execute, query, args, *args, **kwargs)
+
+    async def executemany(self, command: str, args, **kwargs) -> Any:
+        return await self._timed(super().executemany, command, (), args, **kwargs)
+
+    async def fetch(self, query: str, *args, **kwargs) -> list:
+        return await self._timed(super().fetch, query, args, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs) -> Any:
+        return await self._timed(super().fetchval, query, args, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs) -> Any:
+        return await self._timed(super().fetchrow, query, args, *args, **kwargs)
+
+    async def fetchmany(self, query: str, args, **kwargs) -> list:
+        return await self._timed(super().fetchmany, query, (), args, **kwargs)
+
+
+def stats_connection_class(
+    recorder: QueryStatsRecorder, base: type[asyncpg.Connection] = asyncpg.Connection
+) -> type[asyncpg.Connection]:
+    """``QueryStatsConnection`` bound to ``recorder``, innermost under ``base``'s own overrides."""
+    bases = (QueryStatsConnection,) if base is asyncpg.Connection else (base, QueryStatsConnection)
+    return type(f"{base.__name__}WithStats", bases, {"query_stats": recorder})
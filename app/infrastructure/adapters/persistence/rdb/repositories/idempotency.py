@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+import asyncpg
+
+from app.domain.common.constants import MAX_RETRIES
+from app.domain.dto.idempotency import IdempotencyRecord
+from app.domain.errors.idempotency import IdempotencyKeyUnavailableError
+from app.domain.ports.repositories.idempotency import IdempotencyRepositoryPort
+
+logger = logging.getLogger(__name__)
+
+
+class RDBIdempotencyRepository(IdempotencyRepositoryPort):
+    """Must share the connection of the unit of work that performs the write."""
+
+    def __init__(self, conn: asyncpg.Connection):
+        self._conn = conn
+
+    async def claim(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: bytes,
+        ttl: timedelta,
+    ) -> IdempotencyRecord | None:
+        # A key held by an uncommitted transaction blocks the insert until that
+        # transaction ends. An expired key is taken over by the upsert; a live
+        # one leaves the upsert with no row, and the committed response is read
+        # by the next statement, which sees it under READ COMMITTED.
+        claim = """
+            INSERT INTO idempotency_keys (scope, key, fingerprint, response, created_at)
+            VALUES ($1, $2, $3, NULL, now() AT TIME ZONE 'utc')
+            ON CONFLICT (scope, key) DO UPDATE
+                SET fingerprint = EXCLUDED.fingerprint, response = NULL, created_at = EXCLUDED.created_at
+                WHERE idempotency_keys.created_at < EXCLUDED.created_at - $4::interval
+            RETURNING 1
+        """
+        stored = "SELECT fingerprint, response FROM idempotency_keys WHERE scope = $1 AND key = $2"
+        for _ in range(MAX_RETRIES):
+            if await self._conn.fetchval(claim, scope, key, fingerprint, ttl) is not None:
+                return None
+            row = await self._conn.fetchrow(stored, scope, key)
+            if row is None:
+                continue  # purged between the two statements, claim it again
+            if row["response"] is None:
+                # Committed without a response, there is nothing to replay until it expires
+                raise IdempotencyKeyUnavailableError(key)
+            return IdempotencyRecord(fingerprint=row["fingerprint"], response=row["response"])
+        raise IdempotencyKeyUnavailableError(key)
+
+    async def complete(self, scope: str, key: str, response: bytes) -> None:
+        query = "UPDATE idempotency_keys SET response = $3 WHERE scope = $1 AND key = $2"
+        await self._conn.execute(query, scope, key, response)
+
+    async def purge_expired(self, ttl: timedelta, limit: int) -> int:
+        # SKIP LOCKED leaves keys being taken over to their claim, and lets
+        # every process purge at once without waiting on each other
+        query = """
+            DELETE FROM idempotency_keys WHERE ctid = ANY(ARRAY(
+                SELECT ctid FROM idempotency_keys
+                WHERE created_at < now() AT TIME ZONE 'utc' - $1::interval
+                LIMIT $2 FOR UPDATE SKIP LOCKED
+            ))
+        """
+        status = await self._conn.execute(query, ttl, limit)
+        return int(status.rpartition(" ")[2])
+
+
+class IdempotencyKeyPurger:
+    """
+    Deletes expired idempotency keys every ``interval`` seconds, in batches of
+    ``batch_size`` rows with the connection returned to the pool in between.
+    Claims already ignore expired keys, this only keeps the table small.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, ttl: timedelta, interval: float, batch_size: int):
+        self._pool = pool
+        self._ttl = ttl
+        self._interval = interval
+        self._batch_size = batch_size
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def purge(self) -> int:
+        purged = 0
+        while True:
+            async with self._pool.acquire() as conn:
+                deleted = await RDBIdempotencyRepository(conn).purge_expired(self._ttl, self._batch_size)
+            purged += deleted
+            if deleted < self._batch_size:
+                return purged
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                purged = await self.purge()
+            except Exception:
+                logger.warning("Idempotency key purge failed", exc_info=True)
+                continue
+            if purged:
+                logger.info(f"Purged {purged} expired idempotency keys")
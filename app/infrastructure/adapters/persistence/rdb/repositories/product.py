@@ -6,19 +6,24 @@ from typing import AsyncIterator, Sequence
 import asyncpg
 
 from app.domain.dto.product import Product
-from app.domain.ports.repositories.product import ProductRepositoryPort
+from app.domain.ports.repositories.product import ProductCatalogReaderPort, ProductRepositoryPort
+from app.infrastructure.ports.product_cache import ProductCacheInvalidatorPort
 
 
 class RDBProductRepository(ProductRepositoryPort):
-    def __init__(self, conn: asyncpg.Connection):
+    def __init__(
+        self,
+        conn: asyncpg.Connection,
+        invalidator: ProductCacheInvalidatorPort | None = None,
+    ):
         self._conn = conn
+        self._invalidator = invalidator
 
     async def add(self, product: Product) -> None:
         query = """
             INSERT INTO products (guid, name, slug, price_cents, description, created_at, updated_at)
             VALUES ($1, $2, $3, $4, $5, $6, $7)
         """
-        print(product.created_at, product.updated_at)
         await self._conn.execute(
             query,
             product.guid,
@@ -26,9 +31,11 @@ class RDBProductRepository(ProductRepositoryPort):
             product.slug,
             product.price_cents,
             product.description,
-            product.created_at,
-            product.updated_at,
+            self._to_db_timestamp(product.created_at),
+            self._to_db_timestamp(product.updated_at),
         )
+        if self._invalidator is not None:
+            self._invalidator.track_created(product.guid, product.slug)
 
     async def get_by_guid(self, guid: uuid.UUID) -> Product | None:
         query = """
@@ -46,60 +53,88 @@ class RDBProductRepository(ProductRepositoryPort):
         row = await self._conn.fetchrow(query, slug)
         return self._row_to_entity(row) if row else None
 
-    async def list_newer_than(
-        self, cursor: datetime | None = None, limit: int = 100
+    async def get_many_by_guids(self, guids: Sequence[uuid.UUID]) -> list[Product]:
+        query = """
+            SELECT guid, name, slug, price_cents, description, created_at, updated_at
+            FROM products WHERE guid = ANY($1::uuid[])
+        """
+        rows = await self._conn.fetch(query, list(guids))
+        return [self._row_to_entity(row) for row in rows]
+
+    async def list_newest_first(
+        self, cursor: tuple[datetime, uuid.UUID] | None = None, limit: int = 100
     ) -> AsyncIterator[Product]:
+        # guid breaks created_at ties, so equal timestamps never skip or repeat rows
         if cursor is None:
             query = """
                 SELECT guid, name, slug, price_cents, description, created_at, updated_at
-                FROM products ORDER BY created_at DESC LIMIT $1
+                FROM products ORDER BY created_at DESC, guid DESC LIMIT $1
             """
             rows = await self._conn.fetch(query, limit)
         else:
             query = """
                 SELECT guid, name, slug, price_cents, description, created_at, updated_at
                 FROM products
-                WHERE created_at > $1 ORDER BY created_at DESC LIMIT $2
+                WHERE (created_at, guid) < ($1, $2) ORDER BY created_at DESC, guid DESC LIMIT $3
             """
-            rows = await self._conn.fetch(query, cursor, limit)
+            rows = await self._conn.fetch(query, *cursor, limit)
 
         for row in rows:
             yield self._row_to_entity(row)
 
-    async def list_older_than(
-        self, cursor: datetime | None = None, limit: int = 100
+    async def list_oldest_first(
+        self, cursor: tuple[datetime, uuid.UUID] | None = None, limit: int = 100
     ) -> AsyncIterator[Product]:
         if cursor is None:
             query = """
                 SELECT guid, name, slug, price_cents, description, created_at, updated_at
-                FROM products ORDER BY created_at ASC LIMIT $1
+                FROM products ORDER BY created_at, guid LIMIT $1
             """
             rows = await self._conn.fetch(query, limit)
         else:
             query = """
                 SELECT guid, name, slug, price_cents, description, created_at, updated_at
                 FROM products
-                WHERE created_at < $1 ORDER BY created_at ASC LIMIT $2
+                WHERE (created_at, guid) > ($1, $2) ORDER BY created_at, guid LIMIT $3
             """
-            rows = await self._conn.fetch(query, cursor, limit)
+            rows = await self._conn.fetch(query, *cursor, limit)
 
         for row in rows:
             yield self._row_to_entity(row)
 
     async def update(self, product: Product) -> None:
-        now = datetime.now(tz=timezone.utc)
+        now = self._to_db_timestamp(datetime.now(tz=timezone.utc))
+        # previous.slug is read under the row lock, so a renamed product
+        # invalidates both its old and new slug entries
         query = """
-            UPDATE products SET
+            UPDATE products AS p SET
                 name = $2, slug = $3, price_cents = $4, description = $5, updated_at = $6
-            WHERE guid = $1
+            FROM (SELECT guid, slug FROM products WHERE guid = $1 FOR UPDATE) AS previous
+            WHERE p.guid = previous.guid
+            RETURNING previous.slug
         """
-        await self._conn.execute(query,
-                                 product.guid, product.name, product.slug,
-                                 product.price_cents, product.description, now
-                                 )
+        previous_slug = await self._conn.fetchval(query,
+                                                  product.guid, product.name, product.slug,
+                                                  product.price_cents, product.description, now
+                                                  )
+        if previous_slug is not None:
+            self._track(product.guid, previous_slug, product.slug)
 
     async def delete(self, guid: uuid.UUID) -> None:
-        await self._conn.execute("DELETE FROM products WHERE guid = $1", guid)
+        slug = await self._conn.fetchval("DELETE FROM products WHERE guid = $1 RETURNING slug", guid)
+        if slug is not None:
+            self._track(guid, slug)
+
+    def _track(self, guid: uuid.UUID, *slugs: str) -> None:
+        if self._invalidator is not None:
+            self._invalidator.track(guid, *slugs)
+
+    @staticmethod
+    def _to_db_timestamp(value: datetime) -> datetime:
+        # Columns are TIMESTAMP holding UTC; asyncpg rejects aware datetimes for them
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
 
     @staticmethod
     def _row_to_entity(row: asyncpg.Record) -> Product:
@@ -112,3 +147,64 @@ class RDBProductRepository(ProductRepositoryPort):
             created_at=row["created_at"],
             updated_at=row["updated_at"],
         )
+
+
+class PooledProductReader(ProductCatalogReaderPort):
+    """
+    Read-only access for work that runs outside a request scope (cache refresh,
+    warmup, export). Each call holds a pooled connection only for its own query.
+    """
+
+    def __init__(self, pool: asyncpg.Pool):
+        self._pool = pool
+
+    async def get_by_guid(self, guid: uuid.UUID) -> Product | None:
+        async with self._pool.acquire() as conn:
+            return await RDBProductRepository(conn).get_by_guid(guid)
+
+    async def list_newest_first(
+        self, cursor: tuple[datetime, uuid.UUID] | None = None, limit: int = 100
+    ) -> list[Product]:
+        async with self._pool.acquire() as conn:
+            return [product async for product in RDBProductRepository(conn).list_newest_first(cursor, limit)]
+
+    async def iter_guids(self, batch_size: int = 10_000) -> AsyncIterator[list[uuid.UUID]]:
+        """Yields every product GUID in primary key order, one batch per connection checkout."""
+        query = "SELECT guid FROM products WHERE guid > $1 ORDER BY guid LIMIT $2"
+        cursor = uuid.UUID(int=0)
+        while True:
+            async with self._pool.acquire() as conn:
+                guids = [row["guid"] for row in await conn.fetch(query, cursor, batch_size)]
+            if not guids:
+                return
+            yield guids
+            cursor = guids[-1]
+
+    async def iter_catalog(self, batch_size: int = 1000) -> AsyncIterator[list[Product]]:
+        """
+        Seeks on (created_at, guid) so equal timestamps never skip or repeat rows.
+        The connection goes back to the pool before each page is yielded, so a
+        slow consumer never pins it; cancelling the consumer cancels the query.
+        """
+        first_page = """
+            SELECT guid, name, slug, price_cents, description, created_at, updated_at
+            FROM products ORDER BY created_at, guid LIMIT $1
+        """
+        next_page = """
+            SELECT guid, name, slug, price_cents, description, created_at, updated_at
+            FROM products
+            WHERE (created_at, guid) > ($1, $2) ORDER BY created_at, guid LIMIT $3
+        """
+        cursor: tuple[datetime, uuid.UUID] | None = None
+        while True:
+            async with self._pool.acquire() as conn:
+                if cursor is None:
+                    rows = await conn.fetch(first_page, batch_size)
+                else:
+                    rows = await conn.fetch(next_page, *cursor, batch_size)
+            if not rows:
+                return
+            yield [RDBProductRepository._row_to_entity(row) for row in rows]
+            if len(rows) < batch_size:
+                return
+            cursor = rows[-1]["created_at"], rows[-1]["guid"]
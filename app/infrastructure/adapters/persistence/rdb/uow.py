@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, Sequence
 
 import asyncpg.transaction as tx
 import asyncpg
 
 from app.domain.errors.adapters import UoWError
+from app.domain.ports.repositories.idempotency import IdempotencyRepositoryPort
 from app.domain.ports.repositories.product import ProductRepositoryPort
-from app.infrastructure.ports.uow import UnitOfWorkPort
+from app.infrastructure.ports.uow import AfterCommitCallback, TransactionHookPort, UnitOfWorkPort
 
 logger = logging.getLogger(__name__)
 
@@ -19,17 +20,31 @@ class RDBUnitOfWork(UnitOfWorkPort):
         self,
         conn: asyncpg.Connection,
         products: ProductRepositoryPort,
+        idempotency: IdempotencyRepositoryPort,
+        hooks: Sequence[TransactionHookPort] = (),
     ):
         self._conn = conn
         self._tx: tx.Transaction | None = None
         self._in_transaction = False
+        self._hooks = tuple(hooks)
+        self._after_commit: list[AfterCommitCallback] = []
 
         self.products = products
+        self.idempotency = idempotency
 
     @property
     def in_transaction(self) -> bool:
         return self._in_transaction
 
+    def register_after_commit(self, callback: AfterCommitCallback) -> None:
+        """
+        Run ``callback`` once the current transaction commits.
+        Callbacks are dropped on rollback and never see uncommitted state.
+        """
+        if not self._in_transaction:
+            raise UoWError("After-commit callbacks require an active transaction")
+        self._after_commit.append(callback)
+
     async def __aenter__(self) -> "RDBUnitOfWork":
         if self._in_transaction:
             logger.error("Attempted to start nested transaction")
@@ -77,10 +92,13 @@ class RDBUnitOfWork(UnitOfWorkPort):
             logger.info("Transaction committed successfully")
         except Exception as exc:
             logger.error("Failed to commit transaction", exc_info=True)
+            self._discard_after_commit()
             raise UoWError("Transaction commit failed") from exc
         finally:
             self._in_transaction = False
 
+        await self._run_after_commit()
+
     async def rollback(self) -> None:
         if not self._in_transaction or not self._tx:
             logger.warning("Attempted to rollback outside of active transaction")
@@ -95,3 +113,25 @@ class RDBUnitOfWork(UnitOfWorkPort):
             raise UoWError("Failed to rollback transaction") from exc
         finally:
             self._in_transaction = False
+            self._discard_after_commit()
+
+    async def _run_after_commit(self) -> None:
+        # The transaction is already durable here, so callback failures are
+        # logged instead of being reported as a failed unit of work.
+        callbacks, self._after_commit = self._after_commit, []
+        for hook in self._hooks:
+            try:
+                await hook.after_commit()
+            except Exception:
+                logger.error(f"After-commit hook {hook.__class__.__name__} failed", exc_info=True)
+
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.error("After-commit callback failed", exc_info=True)
+
+    def _discard_after_commit(self) -> None:
+        self._after_commit.clear()
+        for hook in self._hooks:
+            hook.after_rollback()
@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Optional, Sequence
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.domain.common.enums import CacheKey
+from app.domain.core.config.settings import RateLimitConfig, RateLimitRule
+from app.infrastructure.adapters.cache.sharding import RedisShardRouter
+from app.infrastructure.ports.rate_limit import Bucket, RateLimiterPort
+
+logger = logging.getLogger(__name__)
+
+# Token buckets refilled from the elapsed time on every call, clocked by the
+# Redis server so replicas with skewed clocks share one timeline. KEYS[i] is
+# a bucket with ARGV[3i-2..3i] = rate, burst and the tokens wanted (a lease).
+# Tokens are granted only when every bucket has one, so a request denied by
+# one bucket costs nothing in the others. Returns {granted, retry_after_ms}
+# per bucket; retry_after_ms is set for the empty ones.
+_TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+local buckets = {}
+local denied = false
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[3 * i - 2])
+    local burst = tonumber(ARGV[3 * i - 1])
+    local wanted = tonumber(ARGV[3 * i])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(bucket[1])
+    local ts = tonumber(bucket[2])
+    if tokens == nil then
+        tokens = burst
+        ts = now
+    end
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+    local granted = math.min(wanted, math.floor(tokens))
+    if granted == 0 then
+        denied = true
+    end
+    buckets[i] = {rate = rate, burst = burst, tokens = tokens, granted = granted}
+end
+
+local result = {}
+for i, key in ipairs(KEYS) do
+    local bucket = buckets[i]
+    local retry_after = 0
+    if bucket.granted == 0 then
+        retry_after = math.ceil((1 - bucket.tokens) * 1000 / bucket.rate)
+    end
+    if denied then
+        bucket.granted = 0
+    end
+    local tokens = bucket.tokens - bucket.granted
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(bucket.burst * 1000 / bucket.rate) + 1000)
+    result[i] = {bucket.granted, retry_after}
+end
+return result
+"""
+
+# Upper bound on locally tracked clients, the oldest entries go first
+MAX_LOCAL_ENTRIES = 100_000
+# Longest time leased tokens may be spent, keeps replicas from hoarding them
+MAX_LEASE_SECONDS = 1.0
+
+
+class RedisTokenBucketLimiter(RateLimiterPort):
+    """
+    Token buckets in Redis shared by all replicas. All buckets of a request
+    that need Redis are taken in one atomic script call, or one per node
+    when the shard router places them on different nodes; those calls run
+    concurrently. Each replica takes a small lease of ``lease_share * burst``
+    tokens at once and spends it locally, so a client well under its limit
+    reaches Redis once per lease rather than once per request; a denial is
+    cached locally until its retry time. Over all replicas a client may run
+    ahead of its rate by at most the tokens leased but not yet spent.
+    Client identities are hashed into the key, so no address or key is
+    stored in Redis. Redis errors fail open.
+    """
+
+    def __init__(self, router: RedisShardRouter, config: RateLimitConfig):
+        self._router = router
+        self._lease_share = config.lease_share
+        self._script = router.clients[0].register_script(_TOKEN_BUCKET_SCRIPT)
+        self._prefix = CacheKey.RATE_LIMIT.value
+        # key -> (tokens left, usable until); zero tokens with a future time is a cached denial
+        self._local: dict[str, tuple[int, float]] = {}
+
+    async def hit(self, buckets: Sequence[Bucket]) -> Optional[tuple[RateLimitRule, float]]:
+        now = time.monotonic()
+        leased: list[str] = []
+        remote: list[tuple[RateLimitRule, str]] = []
+        for rule, client in buckets:
+            key = f"{self._prefix}{rule.name}:{hashlib.blake2b(client.encode(), digest_size=16).hexdigest()}"
+            local = self._local.get(key)
+            if local is None or now >= local[1]:
+                remote.append((rule, key))
+            elif not local[0]:
+                return rule, local[1] - now
+            else:
+                leased.append(key)
+
+        if remote:
+            try:
+                results = await self._take(remote)
+            except RedisError:
+                logger.warning(f"Rate limit check failed for {len(remote)} buckets, allowing", exc_info=True)
+                results = None
+
+            if results is not None:
+                denied = None
+                for (rule, key), (granted, retry_after_ms) in zip(remote, results):
+                    self._remember(key, now, granted, retry_after_ms / 1000, rule)
+                    if denied is None and retry_after_ms:
+                        denied = rule, retry_after_ms / 1000
+                if denied is not None:
+                    return denied
+
+        # Leased tokens are only spent once every other bucket has granted one
+        for key in leased:
+            local = self._local.get(key)
+            if local is None:
+                continue  # a concurrent request spent the lease while Redis answered
+            tokens, until = local
+            if tokens > 1:
+                self._local[key] = (tokens - 1, until)
+            else:
+                del self._local[key]
+        return None
+
+    async def _take(self, buckets: list[tuple[RateLimitRule, str]]) -> list[tuple[int, int]]:
+        """Runs the script once per node holding any of ``buckets``, results in bucket order."""
+        results: dict[str, tuple[int, int]] = {}
+
+        async def take(node: Redis, node_buckets: list[tuple[RateLimitRule, str]]) -> None:
+            args: list[float | int] = []
+            for rule, _ in node_buckets:
+                args += [rule.rate, rule.burst, max(1, int(rule.burst * self._lease_share))]
+            replies = await self._script(keys=[key for _, key in node_buckets], args=args, client=node)
+            for (_, key), (granted, retry_after_ms) in zip(node_buckets, replies):
+                results[key] = (int(granted), int(retry_after_ms))
+
+        grouped = self._router.group(buckets, lambda bucket: bucket[1])
+        await asyncio.gather(*(take(node, node_buckets) for node, node_buckets in grouped.items()))
+        return [results[key] for _, key in buckets]
+
+    def _remember(self, key: str, now: float, granted: int, retry_after: float, rule: RateLimitRule) -> None:
+        self._local.pop(key, None)
+        if granted > 1:
+            self._local[key] = (granted - 1, now + min(MAX_LEASE_SECONDS, granted / rule.rate))
+        elif retry_after > 0:
+            self._local[key] = (0, now + retry_after)
+        else:
+            return
+        if len(self._local) > MAX_LOCAL_ENTRIES:
+            del self._local[next(iter(self._local))]
+
+
+class NullRateLimiter(RateLimiterPort):
+    async def hit(self, buckets: Sequence[Bucket]) -> Optional[tuple[RateLimitRule, float]]:
+        return None
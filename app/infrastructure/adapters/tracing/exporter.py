@@ -0,0 +1,175 @@
+import gzip
+import logging
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Sequence
+
+import msgspec
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_ATTEMPTS = 3
+
+
+class _Event(msgspec.Struct, rename="camel", omit_defaults=True):
+    time_unix_nano: str
+    name: str
+    attributes: list[dict[str, Any]] = []
+
+
+class _Status(msgspec.Struct, omit_defaults=True):
+    code: int = 0
+    message: str = ""
+
+
+class _Span(msgspec.Struct, rename="camel", omit_defaults=True):
+    trace_id: str
+    span_id: str
+    name: str
+    kind: int
+    start_time_unix_nano: str
+    end_time_unix_nano: str
+    parent_span_id: str = ""
+    attributes: list[dict[str, Any]] = []
+    events: list[_Event] = []
+    status: _Status | None = None
+
+
+class _Scope(msgspec.Struct, omit_defaults=True):
+    name: str
+    version: str = ""
+
+
+class _ScopeSpans(msgspec.Struct, rename="camel"):
+    scope: _Scope
+    spans: list[_Span]
+
+
+class _Resource(msgspec.Struct):
+    attributes: list[dict[str, Any]]
+
+
+class _ResourceSpans(msgspec.Struct, rename="camel"):
+    resource: _Resource
+    scope_spans: list[_ScopeSpans]
+
+
+class _ExportRequest(msgspec.Struct, rename="camel"):
+    resource_spans: list[_ResourceSpans]
+
+
+def _value(value: Any) -> dict[str, Any]:
+    # bool first: it is an int subclass. 64-bit ints travel as strings in OTLP/JSON
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: Any) -> list[dict[str, Any]]:
+    if not attributes:
+        return []
+    return [{"key": key, "value": _value(value)} for key, value in attributes.items()]
+
+
+def _span(span: ReadableSpan) -> _Span:
+    ctx = span.context
+    return _Span(
+        trace_id=format(ctx.trace_id, "032x"),
+        span_id=format(ctx.span_id, "016x"),
+        parent_span_id=format(span.parent.span_id, "016x") if span.parent else "",
+        name=span.name,
+        # SDK kinds start at INTERNAL=0, OTLP reserves 0 for unspecified
+        kind=span.kind.value + 1,
+        start_time_unix_nano=str(span.start_time),
+        end_time_unix_nano=str(span.end_time),
+        attributes=_attributes(span.attributes),
+        events=[
+            _Event(time_unix_nano=str(event.timestamp), name=event.name, attributes=_attributes(event.attributes))
+            for event in span.events
+        ],
+        status=_Status(code=span.status.status_code.value, message=span.status.description or ""),
+    )
+
+
+def encode_spans(spans: Sequence[ReadableSpan]) -> bytes:
+    """Builds an OTLP ``ExportTraceServiceRequest`` in its JSON encoding."""
+    grouped: dict[int, tuple[Any, dict[tuple[str, str], list[_Span]]]] = {}
+    for span in spans:
+        resource, scopes = grouped.setdefault(id(span.resource), (span.resource, {}))
+        scope = span.instrumentation_scope
+        key = (scope.name, scope.version or "") if scope else ("", "")
+        scopes.setdefault(key, []).append(_span(span))
+
+    return msgspec.json.encode(_ExportRequest(resource_spans=[
+        _ResourceSpans(
+            resource=_Resource(attributes=_attributes(resource.attributes)),
+            scope_spans=[
+                _ScopeSpans(scope=_Scope(name=name, version=version), spans=encoded)
+                for (name, version), encoded in scopes.items()
+            ],
+        )
+        for resource, scopes in grouped.values()
+    ]))
+
+
+class OTLPJsonSpanExporter(SpanExporter):
+    """
+    Sends spans to an OTLP/HTTP collector as gzipped JSON with the standard
+    library, so tracing needs no protobuf or HTTP client dependency. It runs
+    on the BatchSpanProcessor worker thread, never on the event loop.
+    Throttling and gateway errors are retried a couple of times inside the
+    export timeout; anything else fails the batch, which the processor drops.
+    """
+
+    def __init__(self, endpoint: str, timeout: float = 10.0, headers: dict[str, str] | None = None):
+        self._endpoint = endpoint
+        self._timeout = timeout
+        self._headers = {
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+            **(headers or {}),
+        }
+        self._shutdown = False
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self._shutdown:
+            return SpanExportResult.FAILURE
+
+        body = gzip.compress(encode_spans(spans), compresslevel=5)
+        deadline = time.monotonic() + self._timeout
+        for attempt in range(MAX_ATTEMPTS):
+            request = urllib.request.Request(self._endpoint, data=body, headers=self._headers, method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=max(deadline - time.monotonic(), 0.1)) as response:
+                    response.read()
+                return SpanExportResult.SUCCESS
+            except urllib.error.HTTPError as e:
+                if e.code not in RETRY_STATUSES:
+                    logger.warning(f"Span export rejected with HTTP {e.code}, dropping {len(spans)} spans")
+                    return SpanExportResult.FAILURE
+            except (urllib.error.URLError, OSError):
+                pass
+
+            backoff = 0.5 * 2 ** attempt
+            if time.monotonic() + backoff >= deadline:
+                break
+            time.sleep(backoff)
+
+        logger.warning(f"Span export failed after retries, dropping {len(spans)} spans")
+        return SpanExportResult.FAILURE
+
+    def shutdown(self) -> None:
+        self._shutdown = True
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
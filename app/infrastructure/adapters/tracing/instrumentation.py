@@ -0,0 +1,92 @@
+from contextlib import AbstractContextManager
+from typing import Any
+
+import asyncpg
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from app.infrastructure.adapters.tracing.spans import NOT_TRACED, in_sampled_trace
+
+tracer = trace.get_tracer(__name__)
+
+
+def _operation(query: str) -> str:
+    head = query.lstrip().split(None, 1)
+    return head[0].upper() if head else "QUERY"
+
+
+def _query_span(query: str) -> AbstractContextManager:
+    if not in_sampled_trace():
+        return NOT_TRACED
+    operation = _operation(query)
+    return tracer.start_as_current_span(operation, kind=SpanKind.CLIENT, attributes={
+        "db.system.name": "postgresql",
+        "db.operation.name": operation,
+        "db.query.text": query,
+    })
+
+
+def _command_span(name: str, **attributes: Any) -> AbstractContextManager:
+    if not in_sampled_trace():
+        return NOT_TRACED
+    return tracer.start_as_current_span(name, kind=SpanKind.CLIENT, attributes={
+        "db.system.name": "redis",
+        "db.operation.name": name,
+        **attributes,
+    })
+
+
+class TracedConnection(asyncpg.Connection):
+    """
+    Pool ``connection_class`` that wraps every query method in a client span
+    named after the SQL operation, inside sampled traces. Query text is
+    recorded, parameters never are. Used only with tracing enabled, the plain
+    Connection otherwise.
+    """
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        with _query_span(query):
+            return await super().execute(query, *args, **kwargs)
+
+    async def executemany(self, command: str, args, **kwargs) -> Any:
+        with _query_span(command):
+            return await super().executemany(command, args, **kwargs)
+
+    async def fetch(self, query: str, *args, **kwargs) -> list:
+        with _query_span(query):
+            return await super().fetch(query, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs) -> Any:
+        with _query_span(query):
+            return await super().fetchval(query, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs) -> Any:
+        with _query_span(query):
+            return await super().fetchrow(query, *args, **kwargs)
+
+    async def fetchmany(self, query: str, args, **kwargs) -> list:
+        with _query_span(query):
+            return await super().fetchmany(query, args, **kwargs)
+
+
+class TracedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        name = "MULTI" if self.is_transaction else "PIPELINE"
+        with _command_span(name, **{"db.operation.batch.size": len(self.command_stack)}):
+            return await super().execute(raise_on_error)
+
+
+class TracedRedis(Redis):
+    """
+    Redis client with a client span per command, named after the command, and
+    one span per executed pipeline. Keys and arguments are not recorded.
+    """
+
+    async def execute_command(self, *args, **options) -> Any:
+        with _command_span(str(args[0]).upper()):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return TracedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
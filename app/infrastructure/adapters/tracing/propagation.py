@@ -0,0 +1,22 @@
+from typing import Mapping
+
+from opentelemetry import propagate
+from opentelemetry.context import Context
+
+
+def inject_headers(headers: Mapping[str, str] | None = None) -> dict[str, str]:
+    """
+    Returns a copy of ``headers`` carrying the current trace context
+    (``traceparent``/``tracestate`` with the default W3C propagator). With
+    tracing disabled there is no valid span context and nothing is added.
+    """
+    carrier = dict(headers or {})
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(headers: Mapping[str, str] | None) -> Context | None:
+    """The remote parent carried by message headers, ``None`` when there is none."""
+    if not headers:
+        return None
+    return propagate.extract(headers)
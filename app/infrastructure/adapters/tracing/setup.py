@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from opentelemetry import trace
+
+from app.domain.core.config.settings import TracingConfig
+from app.infrastructure.adapters.diagnostics.startup import STARTUP
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import TracerProvider
+
+logger = logging.getLogger(__name__)
+
+
+def build_tracer_provider(config: TracingConfig) -> TracerProvider:
+    """
+    Root spans are kept with probability ``sample_ratio``; every other span
+    follows its parent's decision, remote parents from ``traceparent``
+    included, so a trace is either exported whole or not at all. Finished
+    spans wait in a bounded queue and are exported in batches from the
+    processor's thread. The SDK is imported here, so processes with tracing
+    off load the API only.
+    """
+    with STARTUP.measure("import", "opentelemetry.sdk"):
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        from app.infrastructure.adapters.tracing.exporter import OTLPJsonSpanExporter
+
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: config.service_name}),
+        sampler=ParentBased(TraceIdRatioBased(config.sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(
+        OTLPJsonSpanExporter(config.endpoint, timeout=config.export_timeout_seconds),
+        max_queue_size=config.max_queue_size,
+        max_export_batch_size=config.batch_size,
+        schedule_delay_millis=config.schedule_delay_seconds * 1000,
+        export_timeout_millis=config.export_timeout_seconds * 1000,
+    ))
+    return provider
+
+
+def setup_tracing(config: TracingConfig) -> trace.TracerProvider:
+    """
+    Installs the global tracer provider. With tracing disabled the API's
+    no-op provider stays in place and spans are non-recording, costing a
+    context attach and nothing else. Module-level tracers are proxies, so
+    they pick the provider up whenever it is installed.
+    """
+    if not config.enabled:
+        return trace.NoOpTracerProvider()
+
+    provider = build_tracer_provider(config)
+    trace.set_tracer_provider(provider)
+    logger.info(
+        f"Tracing enabled: exporting to {config.endpoint}, sampling {config.sample_ratio:.0%} of root traces"
+    )
+    return provider
+
+
+def shutdown_tracing(provider: trace.TracerProvider) -> None:
+    """Flushes the queued spans of an SDK provider, a no-op provider has none."""
+    if not isinstance(provider, trace.NoOpTracerProvider):
+        provider.shutdown()
@@ -0,0 +1,22 @@
+from contextlib import nullcontext
+
+from opentelemetry import trace
+
+# Reusable stand-in for a span that is not started
+NOT_TRACED = nullcontext()
+
+
+def in_sampled_trace() -> bool:
+    """
+    True inside a span that will be exported. Client calls outside one are
+    not traced at all: an unsampled parent would make their spans
+    non-recording anyway, and background loops (cache warmup, the change
+    feed) do not start a trace per query.
+    """
+    return trace.get_current_span().is_recording()
+
+
+def in_unsampled_trace() -> bool:
+    """True inside a trace that was sampled out, where child spans would only cost time."""
+    ctx = trace.get_current_span().get_span_context()
+    return ctx.is_valid and not ctx.trace_flags.sampled
@@ -0,0 +1,13 @@
+from typing import Protocol
+
+from app.domain.common.enums import RequestClass
+
+
+class ConcurrencyLimiterPort(Protocol):
+    async def acquire(self, request_class: RequestClass, budget: float) -> None:
+        """Waits for a slot at most ``budget`` seconds, raises ServiceOverloadedError otherwise."""
+        raise NotImplementedError
+
+    def release(self, request_class: RequestClass, latency: float | None, *, overloaded: bool = False) -> None:
+        """Frees the slot; ``latency`` is None when the request gave no usable sample."""
+        raise NotImplementedError
@@ -1,6 +1,6 @@
 from typing import Protocol, AsyncIterator, Sequence, Any
 
-from app.domain.dto.broker import BrokerMessage
+from app.domain.dto.broker import BrokerMessage, PartitionStats
 
 
 class MessageBrokerPort(Protocol):
@@ -35,3 +35,6 @@ class MessageBrokerPort(Protocol):
 
     async def reject(self, message: BrokerMessage, *, requeue: bool = False) -> None:
         ...
+
+    def partition_stats(self) -> list[PartitionStats]:
+        ...
@@ -0,0 +1,21 @@
+from typing import Protocol
+
+from app.domain.dto.diagnostics import LoopStall, QueryStats
+
+
+class LoopMonitorPort(Protocol):
+    def stalls(self) -> list[LoopStall]:
+        """The most recent event loop stalls, oldest first."""
+        raise NotImplementedError
+
+
+class LoopProfilerPort(Protocol):
+    async def profile(self, seconds: float, interval: float) -> str:
+        """Samples the event loop thread for ``seconds``, returns collapsed stacks."""
+        raise NotImplementedError
+
+
+class QueryStatsPort(Protocol):
+    def snapshot(self) -> list[QueryStats]:
+        """Statistics per query fingerprint, most total time first."""
+        raise NotImplementedError
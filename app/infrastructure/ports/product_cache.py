@@ -1,16 +1,83 @@
 import uuid
+from enum import Enum
 
-from typing import Protocol, Optional
+from typing import Awaitable, Callable, Collection, Literal, Protocol, Optional
 
-from app.domain.dto.product import Product
+from app.domain.dto.product import Product, ProductValidator
+
+
+ProductLoader = Callable[[uuid.UUID], Awaitable[Product | None]]
+
+
+class CacheMarker(Enum):
+    NOT_FOUND = "not_found"  # negative entry: the product is known not to exist
 
 
 class ProductCachePort(Protocol):
-    async def put(self, *, product_guid: uuid.UUID, product: Product) -> None:
+    async def put(
+        self,
+        *,
+        product_guid: uuid.UUID,
+        product: Product,
+        recompute_time: float | None = None,
+    ) -> None:
         raise NotImplementedError
 
-    async def get(self, product_guid: uuid.UUID) -> Optional[Product]:
+    async def put_many(self, products: Collection[Product]) -> None:
+        raise NotImplementedError
+
+    async def put_missing(self, product_guid: uuid.UUID) -> None:
+        raise NotImplementedError
+
+    async def put_missing_many(self, product_guids: Collection[uuid.UUID]) -> None:
+        raise NotImplementedError
+
+    async def get(self, product_guid: uuid.UUID) -> Optional[Product | Literal[CacheMarker.NOT_FOUND]]:
+        raise NotImplementedError
+
+    async def get_many(
+        self, product_guids: Collection[uuid.UUID]
+    ) -> dict[uuid.UUID, Product | Literal[CacheMarker.NOT_FOUND]]:
+        raise NotImplementedError
+
+    async def get_validator(self, product_guid: uuid.UUID) -> Optional[ProductValidator]:
+        raise NotImplementedError
+
+    async def get_by_slug(self, slug: str) -> Optional[Product]:
         raise NotImplementedError
 
     async def delete(self, product_guid: uuid.UUID) -> None:
         raise NotImplementedError
+
+    async def invalidate(
+        self,
+        *,
+        guids: Collection[uuid.UUID] = (),
+        slugs: Collection[str] = (),
+    ) -> None:
+        raise NotImplementedError
+
+
+class ProductCacheInvalidatorPort(Protocol):
+    def track(self, guid: uuid.UUID, *slugs: str) -> None:
+        raise NotImplementedError
+
+    def track_created(self, guid: uuid.UUID, slug: str) -> None:
+        raise NotImplementedError
+
+    def schedule_second_pass(self, delay: float | None = None) -> None:
+        raise NotImplementedError
+
+
+class ProductExistenceFilterPort(Protocol):
+    def might_exist(self, product_guid: uuid.UUID) -> bool:
+        raise NotImplementedError
+
+    async def confirm_missing(self, product_guids: Collection[uuid.UUID]) -> set[uuid.UUID]:
+        raise NotImplementedError
+
+    async def add(self, product_guids: Collection[uuid.UUID]) -> None:
+        raise NotImplementedError
+
+    async def rebuild(self) -> None:
+        raise NotImplementedError
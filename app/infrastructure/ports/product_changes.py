@@ -0,0 +1,18 @@
+from contextlib import AbstractAsyncContextManager
+from typing import Optional, Protocol
+
+
+class ProductChangeSubscriptionPort(Protocol):
+    evicted: bool  # set when the subscriber fell behind and was dropped
+
+    async def get(self) -> Optional[str]:
+        """Next encoded change, None once the subscription is closed or evicted."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class ProductChangeFeedPort(Protocol):
+    def subscribe(self) -> AbstractAsyncContextManager[ProductChangeSubscriptionPort]:
+        raise NotImplementedError
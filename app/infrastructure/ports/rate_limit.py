@@ -0,0 +1,16 @@
+from typing import Optional, Protocol, Sequence
+
+from app.domain.core.config.settings import RateLimitRule
+
+# A rule and the client identity it is applied to
+Bucket = tuple[RateLimitRule, str]
+
+
+class RateLimiterPort(Protocol):
+    async def hit(self, buckets: Sequence[Bucket]) -> Optional[tuple[RateLimitRule, float]]:
+        """
+        Takes one token from every bucket, or none when any of them is empty.
+        Returns None when allowed, else the first empty bucket's rule and the
+        seconds until it has a token again.
+        """
+        raise NotImplementedError
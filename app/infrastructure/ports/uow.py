@@ -1,9 +1,22 @@
-from typing import Protocol
+from typing import Awaitable, Callable, Protocol
+from app.domain.ports.repositories.idempotency import IdempotencyRepositoryPort
 from app.domain.ports.repositories.product import ProductRepositoryPort
 
 
+AfterCommitCallback = Callable[[], Awaitable[None]]
+
+
+class TransactionHookPort(Protocol):
+    async def after_commit(self) -> None:
+        raise NotImplementedError
+
+    def after_rollback(self) -> None:
+        raise NotImplementedError
+
+
 class UnitOfWorkPort(Protocol):
     products: ProductRepositoryPort
+    idempotency: IdempotencyRepositoryPort
 
     async def __aenter__(self) -> "UnitOfWorkPort":
         raise NotImplementedError
@@ -17,6 +30,9 @@ class UnitOfWorkPort(Protocol):
     async def rollback(self) -> None:
         raise NotImplementedError
 
+    def register_after_commit(self, callback: AfterCommitCallback) -> None:
+        raise NotImplementedError
+
     @property
     def in_transaction(self) -> bool:
         raise NotImplementedError
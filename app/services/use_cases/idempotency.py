@@ -0,0 +1,41 @@
+import hashlib
+from typing import Generic, TypeVar
+
+import msgspec
+
+from app.domain.common.constants import IDEMPOTENCY_KEY_MAX_LENGTH, IDEMPOTENCY_KEY_TTL
+from app.domain.errors.idempotency import IdempotencyKeyReusedError, InvalidIdempotencyKeyError
+from app.domain.ports.repositories.idempotency import IdempotencyRepositoryPort
+
+Resp = TypeVar("Resp")
+
+
+class IdempotentWrite(Generic[Resp]):
+    """
+    Replays the stored response of a write use case for a repeated
+    Idempotency-Key. Both calls run inside the handler's unit of work, so the
+    response is stored by the same transaction that performs the write and a
+    replay never touches the use case's own tables.
+    """
+
+    _encoder = msgspec.msgpack.Encoder()
+
+    def __init__(self, scope: str, response_type: type[Resp]):
+        self._scope = scope
+        self._decoder = msgspec.msgpack.Decoder(response_type)
+
+    async def replay(self, repo: IdempotencyRepositoryPort, key: str, request: msgspec.Struct) -> Resp | None:
+        """None when this request owns the key and has to run; blocks while a duplicate is in flight."""
+        if not 0 < len(key) <= IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise InvalidIdempotencyKeyError()
+
+        fingerprint = hashlib.sha256(self._encoder.encode(request)).digest()
+        record = await repo.claim(self._scope, key, fingerprint, IDEMPOTENCY_KEY_TTL)
+        if record is None:
+            return None
+        if record.fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError(key)
+        return self._decoder.decode(record.response)
+
+    async def complete(self, repo: IdempotencyRepositoryPort, key: str, response: Resp) -> None:
+        await repo.complete(self._scope, key, self._encoder.encode(response))
@@ -1,6 +1,7 @@
 from app.domain.common.handlers import RequestHandler
 from app.domain.dto import Product
 from app.infrastructure.ports.uow import UnitOfWorkPort
+from app.services.use_cases.idempotency import IdempotentWrite
 
 from .request import AddProductRequest
 from .response import AddProductResponse
@@ -9,29 +10,44 @@ from .response import AddProductResponse
 class AddProductHandler(
     RequestHandler[AddProductRequest, AddProductResponse]
 ):
+    _idempotency = IdempotentWrite("products.add", AddProductResponse)
+
     def __init__(
         self,
         uow: UnitOfWorkPort,
     ) -> None:
         self._uow = uow
 
-    async def handle(self, request: AddProductRequest) -> AddProductResponse:
+    async def handle(
+        self,
+        request: AddProductRequest,
+        idempotency_key: str | None = None,
+    ) -> AddProductResponse:
         async with self._uow as uow:
+            if idempotency_key is not None:
+                replayed = await self._idempotency.replay(uow.idempotency, idempotency_key, request)
+                if replayed is not None:
+                    return replayed
+
             product_repo = uow.products
             product = Product(
-                    request.name,
-                    request.slug,
-                    request.price_cents,
-                    request.description
+                    name=request.name,
+                    slug=request.slug,
+                    price_cents=request.price_cents,
+                    description=request.description,
                 )
 
             await product_repo.add(product)
 
-        return AddProductResponse(
-            guid=product.guid,
-            name=product.name,
-            slug=product.slug,
-            price_cents=product.price_cents,
-            created_at=product.created_at,
-            updated_at=product.updated_at
-        )
+            response = AddProductResponse(
+                guid=product.guid,
+                name=product.name,
+                slug=product.slug,
+                price_cents=product.price_cents,
+                created_at=product.created_at,
+                updated_at=product.updated_at
+            )
+            if idempotency_key is not None:
+                await self._idempotency.complete(uow.idempotency, idempotency_key, response)
+
+        return response
@@ -0,0 +1,5 @@
+from .request import BatchGetProductsRequest
+
+__all__ = [
+    "BatchGetProductsRequest",
+]
@@ -0,0 +1,83 @@
+import uuid
+
+from app.domain.common.handlers import RequestHandler
+from app.domain.dto import Product
+from app.infrastructure.ports.product_cache import CacheMarker, ProductCachePort, ProductExistenceFilterPort
+from app.infrastructure.ports.uow import UnitOfWorkPort
+from app.services.use_cases.products.get.response import GetProductResponse
+
+from .request import BatchGetProductsRequest
+from .response import BatchGetProductsResponse, BatchProductItem
+
+
+class BatchGetProductsHandler(
+    RequestHandler[BatchGetProductsRequest, BatchGetProductsResponse]
+):
+    """Resolves up to MAX_BATCH_SIZE products: filter, one cache round, one DB query for the misses."""
+
+    def __init__(
+        self,
+        uow: UnitOfWorkPort,
+        cache: ProductCachePort,
+        existence_filter: ProductExistenceFilterPort,
+    ) -> None:
+        self._uow = uow
+        self._cache = cache
+        self._existence_filter = existence_filter
+
+    async def handle(self, request: BatchGetProductsRequest) -> BatchGetProductsResponse:
+        guids = list(dict.fromkeys(request.guids))
+        # The local filter lags inserts on other replicas, the shared one has them
+        absent = [guid for guid in guids if not self._existence_filter.might_exist(guid)]
+        missing = await self._existence_filter.confirm_missing(absent) if absent else set()
+        candidates = [guid for guid in guids if guid not in missing]
+
+        products: dict[uuid.UUID, Product] = {}
+        misses: list[uuid.UUID] = []
+        if candidates:
+            cached = await self._cache.get_many(candidates)
+            for guid in candidates:
+                entry = cached.get(guid)
+                if entry is None:
+                    misses.append(guid)
+                elif entry is not CacheMarker.NOT_FOUND:
+                    products[guid] = entry
+
+        if misses:
+            products.update(await self._load(misses))
+
+        return BatchGetProductsResponse(
+            items=[self._to_item(guid, products.get(guid)) for guid in request.guids]
+        )
+
+    async def _load(self, guids: list[uuid.UUID]) -> dict[uuid.UUID, Product]:
+        async with self._uow as uow:
+            loaded = await uow.products.get_many_by_guids(guids)
+
+        found = {product.guid: product for product in loaded}
+        if loaded:
+            await self._cache.put_many(loaded)
+
+        missing = [guid for guid in guids if guid not in found]
+        if missing:
+            await self._cache.put_missing_many(missing)
+        return found
+
+    @staticmethod
+    def _to_item(guid: uuid.UUID, product: Product | None) -> BatchProductItem:
+        if product is None:
+            return BatchProductItem(guid=guid, found=False)
+
+        return BatchProductItem(
+            guid=guid,
+            found=True,
+            product=GetProductResponse(
+                guid=product.guid,
+                name=product.name,
+                slug=product.slug,
+                price_cents=product.price_cents,
+                description=product.description,
+                created_at=product.created_at,
+                updated_at=product.updated_at,
+            ),
+        )
@@ -0,0 +1,10 @@
+import uuid
+from typing import Annotated
+
+import msgspec
+
+from app.domain.common.constants import MAX_BATCH_SIZE
+
+
+class BatchGetProductsRequest(msgspec.Struct, frozen=True, gc=False):
+    guids: Annotated[list[uuid.UUID], msgspec.Meta(min_length=1, max_length=MAX_BATCH_SIZE)]
@@ -0,0 +1,15 @@
+import uuid
+
+import msgspec
+
+from app.services.use_cases.products.get.response import GetProductResponse
+
+
+class BatchProductItem(msgspec.Struct, frozen=True, gc=False):
+    guid: uuid.UUID
+    found: bool
+    product: GetProductResponse | None = None
+
+
+class BatchGetProductsResponse(msgspec.Struct, frozen=True):
+    items: list[BatchProductItem]
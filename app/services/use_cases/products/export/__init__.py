@@ -0,0 +1,5 @@
+from .request import ExportProductsRequest
+
+__all__ = [
+    "ExportProductsRequest",
+]
@@ -0,0 +1,26 @@
+from typing import AsyncIterator, ClassVar
+
+import msgspec
+
+from app.domain.common.handlers import RequestHandler
+from app.domain.ports.repositories.product import ProductCatalogReaderPort
+
+from .request import ExportProductsRequest
+
+
+class ExportProductsHandler(
+    RequestHandler[ExportProductsRequest, AsyncIterator[bytes]]
+):
+    """Streams the catalog as NDJSON, one encoded chunk per page, so memory stays at one page."""
+
+    _encoder: ClassVar[msgspec.json.Encoder] = msgspec.json.Encoder()
+
+    def __init__(self, reader: ProductCatalogReaderPort) -> None:
+        self._reader = reader
+
+    async def handle(self, request: ExportProductsRequest) -> AsyncIterator[bytes]:
+        return self._stream(request.batch_size)
+
+    async def _stream(self, batch_size: int) -> AsyncIterator[bytes]:
+        async for page in self._reader.iter_catalog(batch_size):
+            yield self._encoder.encode_lines(page)
@@ -0,0 +1,9 @@
+from typing import Annotated
+
+import msgspec
+
+from app.domain.common.constants import EXPORT_BATCH_SIZE
+
+
+class ExportProductsRequest(msgspec.Struct, frozen=True, gc=False):
+    batch_size: Annotated[int, msgspec.Meta(ge=1, le=EXPORT_BATCH_SIZE * 10)] = EXPORT_BATCH_SIZE
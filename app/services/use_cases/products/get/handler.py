@@ -1,5 +1,9 @@
+import time
+
 from app.domain.common.handlers import RequestHandler
+from app.domain.dto import Product
 from app.domain.errors.product import ProductNotFoundError
+from app.infrastructure.ports.product_cache import CacheMarker, ProductCachePort, ProductExistenceFilterPort
 from app.infrastructure.ports.uow import UnitOfWorkPort
 
 from .request import GetProductRequest
@@ -9,19 +13,31 @@ from .response import GetProductResponse
 class GetProductHandler(
     RequestHandler[GetProductRequest, GetProductResponse]
 ):
-    def __init__(self, uow: UnitOfWorkPort) -> None:
+    def __init__(
+        self,
+        uow: UnitOfWorkPort,
+        cache: ProductCachePort,
+        existence_filter: ProductExistenceFilterPort,
+    ) -> None:
         self._uow = uow
+        self._cache = cache
+        self._existence_filter = existence_filter
 
     async def handle(self, request: GetProductRequest) -> GetProductResponse:
-        async with self._uow as uow:
-            product_repo = uow.products
+        # The local filter lags inserts on other replicas, the shared one has them
+        if (
+            not self._existence_filter.might_exist(request.guid)
+            and await self._existence_filter.confirm_missing([request.guid])
+        ):
+            raise ProductNotFoundError(guid=request.guid)
 
-            product = await product_repo.get_by_guid(request.guid)
+        product = await self._cache.get(request.guid)
 
-            if product is None:
-                raise ProductNotFoundError(
-                    guid=request.guid,
-                )
+        if product is CacheMarker.NOT_FOUND:
+            raise ProductNotFoundError(guid=request.guid)
+
+        if product is None:
+            product = await self._load(request)
 
         return GetProductResponse(
             guid=product.guid,
@@ -32,3 +48,23 @@ class GetProductHandler(
             created_at=product.created_at,
             updated_at=product.updated_at,
         )
+
+    async def _load(self, request: GetProductRequest) -> Product:
+        started = time.perf_counter()
+        async with self._uow as uow:
+            product_repo = uow.products
+
+            product = await product_repo.get_by_guid(request.guid)
+
+        if product is None:
+            await self._cache.put_missing(request.guid)
+            raise ProductNotFoundError(
+                guid=request.guid,
+            )
+
+        await self._cache.put(
+            product_guid=product.guid,
+            product=product,
+            recompute_time=time.perf_counter() - started,
+        )
+        return product
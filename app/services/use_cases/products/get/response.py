@@ -3,7 +3,7 @@ from datetime import datetime
 import msgspec
 
 
-class GetProductResponse(msgspec.Struct, frozen=True, gc=False):
+class GetProductResponse(msgspec.Struct, frozen=True, gc=False, kw_only=True):
     guid: uuid.UUID
     name: str
     slug: str
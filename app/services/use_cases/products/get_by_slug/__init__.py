@@ -0,0 +1,5 @@
+from .request import GetProductBySlugRequest
+
+__all__ = [
+    "GetProductBySlugRequest",
+]
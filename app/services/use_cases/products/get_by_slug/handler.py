@@ -0,0 +1,49 @@
+import time
+
+from app.domain.common.handlers import RequestHandler
+from app.domain.dto import Product
+from app.domain.errors.product import ProductNotFoundError
+from app.infrastructure.ports.product_cache import ProductCachePort
+from app.infrastructure.ports.uow import UnitOfWorkPort
+from app.services.use_cases.products.get.response import GetProductResponse
+
+from .request import GetProductBySlugRequest
+
+
+class GetProductBySlugHandler(
+    RequestHandler[GetProductBySlugRequest, GetProductResponse]
+):
+    def __init__(self, uow: UnitOfWorkPort, cache: ProductCachePort) -> None:
+        self._uow = uow
+        self._cache = cache
+
+    async def handle(self, request: GetProductBySlugRequest) -> GetProductResponse:
+        product = await self._cache.get_by_slug(request.slug)
+
+        if product is None:
+            product = await self._load(request)
+
+        return GetProductResponse(
+            guid=product.guid,
+            name=product.name,
+            slug=product.slug,
+            price_cents=product.price_cents,
+            description=product.description,
+            created_at=product.created_at,
+            updated_at=product.updated_at,
+        )
+
+    async def _load(self, request: GetProductBySlugRequest) -> Product:
+        started = time.perf_counter()
+        async with self._uow as uow:
+            product = await uow.products.find_by_slug(request.slug)
+
+        if product is None:
+            raise ProductNotFoundError(slug=request.slug)
+
+        await self._cache.put(
+            product_guid=product.guid,
+            product=product,
+            recompute_time=time.perf_counter() - started,
+        )
+        return product
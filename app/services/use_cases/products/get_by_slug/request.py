@@ -0,0 +1,5 @@
+import msgspec
+
+
+class GetProductBySlugRequest(msgspec.Struct, frozen=True, gc=False):
+    slug: str
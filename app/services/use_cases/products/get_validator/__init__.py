@@ -0,0 +1,5 @@
+from .request import GetProductValidatorRequest
+
+__all__ = [
+    "GetProductValidatorRequest",
+]
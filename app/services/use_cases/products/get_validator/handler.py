@@ -0,0 +1,19 @@
+from typing import Optional
+
+from app.domain.common.handlers import RequestHandler
+from app.domain.dto import ProductValidator
+from app.infrastructure.ports.product_cache import ProductCachePort
+
+from .request import GetProductValidatorRequest
+
+
+class GetProductValidatorHandler(
+    RequestHandler[GetProductValidatorRequest, Optional[ProductValidator]]
+):
+    """Cache-only: a miss returns None and the caller falls back to a full read."""
+
+    def __init__(self, cache: ProductCachePort) -> None:
+        self._cache = cache
+
+    async def handle(self, request: GetProductValidatorRequest) -> Optional[ProductValidator]:
+        return await self._cache.get_validator(request.guid)
@@ -0,0 +1,6 @@
+import uuid
+import msgspec
+
+
+class GetProductValidatorRequest(msgspec.Struct, frozen=True, gc=False):
+    guid: uuid.UUID
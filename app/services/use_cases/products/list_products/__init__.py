@@ -0,0 +1,7 @@
+from .request import ListProductsRequest
+from .response import ListProductsPage
+
+__all__ = [
+    "ListProductsRequest",
+    "ListProductsPage",
+]
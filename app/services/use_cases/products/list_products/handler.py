@@ -0,0 +1,29 @@
+from typing import AsyncIterator
+
+from app.domain.common.handlers import RequestHandler
+from app.domain.ports.repositories.product import ProductCatalogReaderPort
+
+from .request import ListProductsRequest
+from .response import ListProductsPage
+
+
+class ListProductsHandler(
+    RequestHandler[ListProductsRequest, AsyncIterator[ListProductsPage]]
+):
+    """Pages through the catalog oldest first; each page is a separate keyset query."""
+
+    def __init__(self, reader: ProductCatalogReaderPort) -> None:
+        self._reader = reader
+
+    async def handle(self, request: ListProductsRequest) -> AsyncIterator[ListProductsPage]:
+        return self._pages(request)
+
+    async def _pages(self, request: ListProductsRequest) -> AsyncIterator[ListProductsPage]:
+        remaining = request.limit
+        async for page in self._reader.iter_catalog(request.page_size):
+            if remaining is not None:
+                page = page[:remaining]
+                remaining -= len(page)
+            yield ListProductsPage(items=page)
+            if remaining == 0:
+                return
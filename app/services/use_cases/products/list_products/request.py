@@ -0,0 +1,10 @@
+from typing import Annotated
+
+import msgspec
+
+from app.domain.common.constants import EXPORT_BATCH_SIZE
+
+
+class ListProductsRequest(msgspec.Struct, frozen=True, gc=False):
+    page_size: Annotated[int, msgspec.Meta(ge=1, le=EXPORT_BATCH_SIZE)] = 500
+    limit: Annotated[int, msgspec.Meta(ge=1)] | None = None  # whole catalog when unset
@@ -0,0 +1,7 @@
+import msgspec
+
+from app.domain.dto import Product
+
+
+class ListProductsPage(msgspec.Struct, frozen=True):
+    items: list[Product]
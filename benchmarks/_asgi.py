@@ -0,0 +1,57 @@
+"""Minimal in-process ASGI driver, so benchmarks measure the app and not an HTTP client."""
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+ASGIApp = Callable[..., Awaitable[None]]
+
+
+def http_scope(method: str, path: str, headers: list[tuple[bytes, bytes]] | None = None) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json"), *(headers or [])],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+        "state": {},
+    }
+
+
+async def call(app: ASGIApp, scope: dict, body: bytes = b"") -> tuple[int, bytes]:
+    status = 0
+    chunks: list[bytes] = []
+    delivered = False
+
+    async def receive() -> dict:
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()  # never disconnects
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(dict(scope), receive, send)
+    return status, b"".join(chunks)
+
+
+async def measure(app: ASGIApp, scope: dict, body: bytes = b"", requests: int = 5_000) -> float:
+    """Returns mean microseconds per request after a short warmup."""
+    for _ in range(min(500, requests)):
+        await call(app, scope, body)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(app, scope, body)
+    return (time.perf_counter() - started) / requests * 1e6
@@ -0,0 +1,118 @@
+"""
+Throughput and latency of GET product over gRPC versus the HTTP endpoint on
+the same machine. Each server runs in its own process with the in-memory stub
+handlers from ``http_endpoints``; one client process drives it over loopback
+with a fixed number of concurrent callers, so client-side cost (httpx versus
+grpcio) is part of each number. Needs uvicorn and httpx.
+
+    python -m benchmarks.grpc_vs_http [seconds] [concurrency]
+"""
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable
+
+import grpc
+import httpx
+import msgspec
+from dishka import make_async_container
+
+from app.application.api.v1.grpc.server import create_server
+from app.application.api.v1.http.app import create_app
+from app.services.use_cases.products.get.request import GetProductRequest
+from app.services.use_cases.products.get.response import GetProductResponse
+
+from .http_endpoints import GUID, StubProvider
+
+HTTP_PORT = 58080
+GRPC_PORT = 58051
+
+
+def run_http() -> None:
+    import uvicorn
+
+    app = create_app(make_async_container(StubProvider()))
+    uvicorn.run(app, host="127.0.0.1", port=HTTP_PORT, log_level="warning", access_log=False)
+
+
+def run_grpc() -> None:
+    async def serve() -> None:
+        server = create_server(make_async_container(StubProvider()), f"127.0.0.1:{GRPC_PORT}")
+        await server.start()
+        await server.wait_for_termination()
+
+    asyncio.run(serve())
+
+
+async def drive(call: Callable[[], Awaitable[None]], seconds: float, concurrency: int) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+
+    async def worker() -> None:
+        while (started := time.perf_counter()) < deadline:
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def report(name: str, latencies: list[float], seconds: float) -> None:
+    ms = sorted(value * 1e3 for value in latencies)
+    p99 = ms[int(len(ms) * 0.99) - 1]
+    print(f"{name:<8}{len(ms) / seconds:>10.0f}{statistics.median(ms):>10.2f}{p99:>10.2f}")
+
+
+async def wait_ready(probe: Callable[[], Awaitable[None]]) -> None:
+    for _ in range(100):
+        try:
+            await probe()
+            return
+        except Exception:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def main(seconds: float, concurrency: int) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with (
+        httpx.AsyncClient(base_url=f"http://127.0.0.1:{HTTP_PORT}", limits=limits) as client,
+        grpc.aio.insecure_channel(f"127.0.0.1:{GRPC_PORT}") as channel,
+    ):
+        get_grpc = channel.unary_unary(
+            "/products.v1.ProductService/Get",
+            request_serializer=msgspec.msgpack.encode,
+            response_deserializer=msgspec.msgpack.Decoder(GetProductResponse).decode,
+        )
+        request = GetProductRequest(guid=GUID)
+        decoder = msgspec.json.Decoder(GetProductResponse)
+
+        async def call_http() -> None:
+            response = await client.get(f"/api/v1/products/{GUID}")
+            decoder.decode(response.content)
+
+        async def call_grpc() -> None:
+            await get_grpc(request)
+
+        await wait_ready(call_http)
+        await wait_ready(call_grpc)
+
+        print(f"{'api':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, call in (("http", call_http), ("grpc", call_grpc)):
+            await drive(call, 1.0, concurrency)  # warmup
+            report(name, await drive(call, seconds, concurrency), seconds)
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    servers = [multiprocessing.Process(target=target, daemon=True) for target in (run_http, run_grpc)]
+    for server in servers:
+        server.start()
+    try:
+        asyncio.run(main(seconds, concurrency))
+    finally:
+        for server in servers:
+            server.terminate()
@@ -0,0 +1,201 @@
+"""
+Per-request overhead of the product HTTP endpoints, msgspec controllers
+versus the same routes written the default FastAPI way (pydantic body and
+response_model). Handlers are in-memory stubs resolved through dishka, so
+the numbers cover routing, DI scope, decoding and encoding only.
+
+    python -m benchmarks.http_endpoints [requests]
+"""
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timezone
+
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.integrations.fastapi import DishkaRoute, FromDishka, setup_dishka
+from fastapi import APIRouter, FastAPI
+from opentelemetry.trace import NoOpTracerProvider, TracerProvider
+from pydantic import BaseModel
+
+from app.application.api.v1.http.app import create_app
+from app.application.api.v1.http.middleware import (
+    AdmissionControlMiddleware,
+    RateLimitMiddleware,
+    TracingMiddleware,
+)
+from app.domain.common.enums import ReadinessStatus
+from app.domain.core.config.settings import AdmissionConfig, RateLimitConfig
+from app.infrastructure.adapters.admission.limiter import AdaptiveConcurrencyLimiter
+from app.infrastructure.adapters.rate_limit.limiter import NullRateLimiter
+from app.infrastructure.adapters.cache.warmup import ProductCacheWarmer
+from app.infrastructure.adapters.diagnostics.loop_monitor import NullLoopMonitor
+from app.infrastructure.adapters.monitoring.exporter import MetricsExporter
+from app.infrastructure.adapters.persistence.rdb.repositories.idempotency import IdempotencyKeyPurger
+from app.infrastructure.ports.admission import ConcurrencyLimiterPort
+from app.infrastructure.ports.diagnostics import LoopMonitorPort
+from app.infrastructure.ports.rate_limit import RateLimiterPort
+from app.services.use_cases.products.add import AddProductResponse
+from app.services.use_cases.products.add.handler import AddProductHandler
+from app.services.use_cases.products.get.handler import GetProductHandler
+from app.services.use_cases.products.get.response import GetProductResponse
+from app.services.use_cases.products.get_by_slug.handler import GetProductBySlugHandler
+from app.services.use_cases.products.get_validator.handler import GetProductValidatorHandler
+
+from ._asgi import http_scope, measure
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+GUID = uuid.uuid4()
+PRODUCT = GetProductResponse(
+    guid=GUID,
+    name="iPhone 16 Pro",
+    slug="iphone-16-pro",
+    price_cents=149_990,
+    description="A" * 400,
+    created_at=NOW,
+    updated_at=NOW,
+)
+ADD_BODY = b'{"name":"iPhone 16 Pro","slug":"iphone-16-pro","price_cents":149990,"description":"phone"}'
+
+
+class StubGetHandler:
+    async def handle(self, request) -> GetProductResponse:
+        return PRODUCT
+
+
+class StubAddHandler:
+    async def handle(self, request, idempotency_key=None) -> AddProductResponse:
+        return AddProductResponse(
+            guid=GUID, name=request.name, slug=request.slug,
+            price_cents=request.price_cents, created_at=NOW, updated_at=NOW,
+        )
+
+
+class StubValidatorHandler:
+    async def handle(self, request) -> None:
+        return None
+
+
+class StubWarmer:
+    status = ReadinessStatus.READY
+
+
+class StubPurger:
+    pass
+
+
+class StubProvider(Provider):
+    scope = Scope.REQUEST
+
+    @provide
+    def get_product(self) -> GetProductHandler:
+        return StubGetHandler()
+
+    @provide
+    def get_product_by_slug(self) -> GetProductBySlugHandler:
+        return StubGetHandler()
+
+    @provide
+    def add_product(self) -> AddProductHandler:
+        return StubAddHandler()
+
+    @provide
+    def get_product_validator(self) -> GetProductValidatorHandler:
+        return StubValidatorHandler()
+
+    @provide(scope=Scope.APP)
+    def warmer(self) -> ProductCacheWarmer:
+        return StubWarmer()
+
+    @provide(scope=Scope.APP)
+    def idempotency_purger(self) -> IdempotencyKeyPurger:
+        return StubPurger()
+
+    @provide(scope=Scope.APP)
+    def admission_config(self) -> AdmissionConfig:
+        return AdmissionConfig()
+
+    @provide(scope=Scope.APP)
+    def limiter(self, config: AdmissionConfig) -> ConcurrencyLimiterPort:
+        return AdaptiveConcurrencyLimiter(config)
+
+    @provide(scope=Scope.APP)
+    def rate_limit_config(self) -> RateLimitConfig:
+        return RateLimitConfig(enabled=False)
+
+    @provide(scope=Scope.APP)
+    def rate_limiter(self) -> RateLimiterPort:
+        # No Redis here: the middleware and rule matching are measured, not the script
+        return NullRateLimiter()
+
+    @provide(scope=Scope.APP)
+    def metrics_exporter(self) -> MetricsExporter:
+        return MetricsExporter()
+
+    @provide(scope=Scope.APP)
+    def tracer_provider(self) -> TracerProvider:
+        return NoOpTracerProvider()
+
+    @provide(scope=Scope.APP)
+    def loop_monitor(self) -> LoopMonitorPort:
+        return NullLoopMonitor()
+
+
+class AddBody(BaseModel):
+    name: str
+    slug: str
+    price_cents: int
+    description: str | None = None
+
+
+class ProductOut(BaseModel):
+    guid: uuid.UUID
+    name: str
+    slug: str
+    price_cents: int
+    description: str | None = None
+    created_at: datetime
+    updated_at: datetime | None = None
+
+
+def pydantic_app() -> FastAPI:
+    router = APIRouter(prefix="/api/v1/products", route_class=DishkaRoute)
+
+    @router.get("/{guid}", response_model=ProductOut)
+    async def get_product(guid: uuid.UUID, handler: FromDishka[GetProductHandler]):
+        product = await handler.handle(guid)
+        return ProductOut(**{f: getattr(product, f) for f in product.__struct_fields__})
+
+    @router.post("", response_model=ProductOut, status_code=201)
+    async def add_product(body: AddBody, handler: FromDishka[AddProductHandler]):
+        product = await handler.handle(body)
+        return ProductOut(**{f: getattr(product, f) for f in product.__struct_fields__})
+
+    container = make_async_container(StubProvider())
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(AdmissionControlMiddleware, container=container)
+    app.add_middleware(RateLimitMiddleware, container=container)
+    app.add_middleware(TracingMiddleware)
+    setup_dishka(container, app)
+    return app
+
+
+async def main(requests: int) -> None:
+    variants = {
+        "msgspec": create_app(make_async_container(StubProvider())),
+        "pydantic": pydantic_app(),
+    }
+    cases = [
+        ("GET /products/{guid}", http_scope("GET", f"/api/v1/products/{GUID}"), b""),
+        ("POST /products", http_scope("POST", "/api/v1/products"), ADD_BODY),
+    ]
+
+    print(f"{'endpoint':<24}{'variant':<10}{'us/req':>10}{'req/s':>10}")
+    for name, scope, body in cases:
+        for variant, app in variants.items():
+            us = await measure(app, scope, body, requests)
+            print(f"{name:<24}{variant:<10}{us:>10.1f}{1e6 / us:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000))
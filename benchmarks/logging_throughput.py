@@ -0,0 +1,143 @@
+"""
+Logging cost per record for the console (JSON), file and Loki handler
+configs, with LoggerConfig.fast off (loguru serialize=True) and on (msgspec
+records). Reports caller-side latency of a logger call and records/sec
+until every queued record is written and the handlers are removed. Console output goes to /dev/null,
+Loki pushes go to a local HTTP stub. The storm rows log one exception
+repeatedly to the console, without and with sampling.
+
+    python -m benchmarks.logging_throughput [records]
+"""
+import http.server
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from loguru import logger
+
+from app.infrastructure.adapters._logging.config import (
+    ConsoleHandlerConfig,
+    FileHandlerConfig,
+    LoggerConfig,
+    LokiHandlerConfig,
+    SamplingConfig,
+)
+
+
+class LokiStub(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def configs(log_dir: str, loki_url: str) -> dict[str, LoggerConfig]:
+    off = {"enabled": False}
+    # Sampling would collapse the repeated benchmark records, every record is written here
+    sampling = SamplingConfig(**off)
+    return {
+        "console": LoggerConfig(
+            console=ConsoleHandlerConfig(colorful=False),
+            file=FileHandlerConfig(**off),
+            loki=LokiHandlerConfig(**off),
+            sampling=sampling,
+        ),
+        "file": LoggerConfig(
+            console=ConsoleHandlerConfig(**off),
+            file=FileHandlerConfig(path=os.path.join(log_dir, "app.log"), compression=None),
+            loki=LokiHandlerConfig(**off),
+            sampling=sampling,
+        ),
+        "loki": LoggerConfig(
+            console=ConsoleHandlerConfig(**off),
+            file=FileHandlerConfig(**off),
+            loki=LokiHandlerConfig(url=loki_url),
+            sampling=sampling,
+        ),
+    }
+
+
+def run(config: LoggerConfig, records: int) -> tuple[float, float, float]:
+    config.setup()
+    stdlib = logging.getLogger("benchmarks.library")
+    latencies = []
+    start = time.perf_counter()
+    for i in range(records):
+        began = time.perf_counter_ns()
+        if i % 2:
+            logger.info("Product cached", guid="5a1f0c2e", attempt=i)
+        else:
+            stdlib.info("Pool connection released %s", i)
+        stdlib.debug("Below every handler level %s", i)
+        latencies.append(time.perf_counter_ns() - began)
+    logger.remove()  # stops every handler once its queue is drained
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (
+        latencies[len(latencies) // 2] / 1000,
+        latencies[int(len(latencies) * 0.99)] / 1000,
+        records / elapsed,
+    )
+
+
+def storm(config: LoggerConfig, records: int) -> tuple[float, float, float]:
+    """The same error with its traceback in a tight loop, as in entrypoint.py."""
+    config.setup()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(records):
+        began = time.perf_counter_ns()
+        try:
+            raise ConnectionError("Connection refused")
+        except ConnectionError:
+            logger.exception("Failed to reach the database")
+        latencies.append(time.perf_counter_ns() - began)
+    logger.remove()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (
+        latencies[len(latencies) // 2] / 1000,
+        latencies[int(len(latencies) * 0.99)] / 1000,
+        records / elapsed,
+    )
+
+
+def main(records: int) -> None:
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), LokiStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    loki_url = f"http://127.0.0.1:{server.server_address[1]}/loki/api/v1/push"
+
+    stderr = sys.stderr
+    results = []
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        sys.stderr = devnull  # the console handler picks its stream up in setup
+        try:
+            for name, config in configs(log_dir, loki_url).items():
+                for fast in (False, True):
+                    config.fast = fast
+                    results.append((name, "fast" if fast else "default", records, *run(config, records)))
+            console = configs(log_dir, loki_url)["console"]
+            for enabled in (False, True):
+                console.sampling = SamplingConfig(enabled=enabled)
+                mode = "sampled" if enabled else "fast"
+                results.append(("storm", mode, records, *storm(console, records)))
+        finally:
+            sys.stderr = stderr
+    server.shutdown()
+
+    print(f"{'handler':<9} {'mode':<8} {'records':>8} {'p50 us':>9} {'p99 us':>9} {'records/s':>10}")
+    for name, mode, count, p50, p99, rate in results:
+        print(f"{name:<9} {mode:<8} {count:>8} {p50:>9.1f} {p99:>9.1f} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,85 @@
+"""
+Import time of the process entry points against the budget below, and a
+check that importing them leaves the lazily loaded adapters unloaded. Each
+round imports every entry point in a fresh interpreter with -X importtime,
+and the best round counts. The breakdown is self time per top-level package,
+so it adds up without counting a package twice.
+
+    python -m benchmarks.startup_budget [rounds]
+
+Exits non-zero when an entry point goes over its budget or imports one of
+LAZY_MODULES.
+"""
+import subprocess
+import sys
+from collections import defaultdict
+
+ROUNDS = 5
+# Milliseconds on a 1-vCPU runner, about 1.3x the measured import time. Loading
+# Redis or Kafka eagerly again would add 70-120ms and go over.
+BUDGET_MS = {
+    "app.application.api.v1.http.app": 480.0,  # the HTTP app factory
+    "app.infrastructure.adapters.di.main": 310.0,  # workers building the container
+    "entrypoint": 140.0,
+}
+# Imported by the DI providers that need them, never by importing an entry point
+LAZY_MODULES = (
+    "redis",
+    "aiokafka",
+    "opentelemetry.sdk",
+    "app.infrastructure.adapters._logging.loki",
+    "dotenv",
+    "requests",
+)
+TOP_PACKAGES = 8
+
+_CHECK = "import sys; print(','.join(m for m in {lazy!r} if m in sys.modules))"
+
+
+def import_profile(module: str) -> tuple[float, dict[str, float], list[str]]:
+    """Cumulative import time of ``module`` in ms, self ms per package and the lazy modules it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}; {_CHECK.format(lazy=LAZY_MODULES)}"],
+        check=True, capture_output=True, text=True,
+    )
+    total = 0.0
+    packages: dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        packages[name.strip().split(".")[0]] += int(self_us) / 1000
+        if name.strip() == module and not name[1:].startswith(" "):
+            total = int(cumulative_us) / 1000
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return total, packages, loaded
+
+
+def main(rounds: int) -> int:
+    best: dict[str, tuple[float, dict[str, float], list[str]]] = {}
+    for _ in range(rounds):
+        for module in BUDGET_MS:
+            profile = import_profile(module)
+            if module not in best or profile[0] < best[module][0]:
+                best[module] = profile
+
+    failed = False
+    print(f"{'entry point':<40}{'import ms':>10}{'budget ms':>11}")
+    for module, budget in BUDGET_MS.items():
+        total, _, loaded = best[module]
+        over = total > budget
+        failed = failed or over or bool(loaded)
+        print(f"{module:<40}{total:>10.1f}{budget:>11.1f} {'OVER' if over else 'ok'}")
+        if loaded:
+            print(f"  imports lazy adapters eagerly: {', '.join(loaded)}")
+
+    for module in BUDGET_MS:
+        packages = sorted(best[module][1].items(), key=lambda item: item[1], reverse=True)
+        print(f"\n{module}, self ms per package")
+        for package, ms in packages[:TOP_PACKAGES]:
+            print(f"  {package:<30}{ms:>8.1f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else ROUNDS))
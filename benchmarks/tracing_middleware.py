@@ -0,0 +1,106 @@
+"""
+Per-request overhead of TracingMiddleware: the previous BaseHTTPMiddleware
+implementation against the pure ASGI one, on a bare Starlette endpoint so
+the middleware dominates. Also checks that a streamed body reaches the
+client chunk by chunk.
+
+    python -m benchmarks.tracing_middleware [requests]
+"""
+import asyncio
+import sys
+from uuid import uuid4
+
+from opentelemetry import trace
+from opentelemetry.propagate import inject
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.application.api.v1.http.middleware import TracingMiddleware
+from app.infrastructure.adapters._logging.context import set_request_id
+
+from ._asgi import http_scope, measure
+
+
+class LegacyTracingMiddleware(BaseHTTPMiddleware):
+    """The implementation TracingMiddleware replaced, kept here for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        req_id = request.headers.get("x-request-id") or str(uuid4())
+        set_request_id(req_id)
+        tracer = trace.get_tracer(__name__)
+        with tracer.start_as_current_span(
+            name=f"{request.method} {request.url.path}",
+            attributes={
+                "http.method": request.method,
+                "http.route": request.url.path,
+                "http.url": str(request.url),
+                "request.id": req_id,
+            },
+        ) as span:
+            headers = {}
+            inject(headers)
+            headers["x-request-id"] = req_id
+            response = await call_next(request)
+            response.headers["x-request-id"] = req_id
+            if response.status_code >= 400:
+                span.record_exception(Exception(f"HTTP {response.status_code}"))
+                span.set_attribute("http.status_code", response.status_code)
+            return response
+
+
+async def ok(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+async def stream(request: Request) -> StreamingResponse:
+    async def chunks():
+        for i in range(3):
+            yield f"chunk-{i}\n".encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def build(middleware: list[Middleware]) -> Starlette:
+    return Starlette(routes=[Route("/ok", ok), Route("/stream", stream)], middleware=middleware)
+
+
+async def streamed_chunks(app: Starlette) -> list[bytes]:
+    chunks: list[bytes] = []
+    delivered = False
+
+    async def receive() -> dict:
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks.append(message["body"])
+
+    await app(http_scope("GET", "/stream"), receive, send)
+    return chunks
+
+
+async def main(requests: int) -> None:
+    variants = {
+        "none": build([]),
+        "BaseHTTPMiddleware": build([Middleware(LegacyTracingMiddleware)]),
+        "pure ASGI": build([Middleware(TracingMiddleware)]),
+    }
+    baseline = None
+    print(f"{'middleware':<20}{'us/req':>10}{'overhead us':>14}{'stream chunks':>15}")
+    for name, app in variants.items():
+        us = await measure(app, http_scope("GET", "/ok"), requests=requests)
+        baseline = us if baseline is None else baseline
+        chunks = await streamed_chunks(app)
+        print(f"{name:<20}{us:>10.1f}{us - baseline:>14.1f}{len(chunks):>15}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
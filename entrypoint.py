@@ -1,11 +1,6 @@
 import asyncio
-import logging
 
-import requests
-
-from app.domain.core.config.provider import EnvSourceProvider
 from app.infrastructure.adapters._logging import get_logger
-from app.infrastructure.adapters.di.main import build_container
 from app.infrastructure.ports.uow import UnitOfWorkPort
 
 
@@ -0,0 +1,2 @@
+
+DROP INDEX IF EXISTS idx_products_created_at_guid;
@@ -0,0 +1,5 @@
+-- depends: 000001_products
+
+CREATE INDEX IF NOT EXISTS idx_products_created_at_guid
+    ON products(created_at, guid);
+COMMENT ON INDEX idx_products_created_at_guid IS 'Keyset pagination in both directions, guid breaks created_at ties';
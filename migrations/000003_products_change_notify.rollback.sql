@@ -0,0 +1,3 @@
+
+DROP TRIGGER IF EXISTS products_change_notify ON products;
+DROP FUNCTION IF EXISTS notify_product_change();
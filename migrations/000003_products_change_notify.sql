@@ -0,0 +1,29 @@
+-- depends: 000002_products_created_at_guid_index
+
+-- Publishes every committed product change on the product_changes channel.
+-- The payload stays far below the 8000 byte NOTIFY limit: no description.
+CREATE OR REPLACE FUNCTION notify_product_change() RETURNS trigger AS $$
+DECLARE
+    row products%ROWTYPE;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row := OLD;
+    ELSE
+        row := NEW;
+    END IF;
+
+    PERFORM pg_notify('product_changes', json_build_object(
+        'kind', CASE TG_OP WHEN 'INSERT' THEN 'created' WHEN 'UPDATE' THEN 'updated' ELSE 'deleted' END,
+        'guid', row.guid,
+        'name', row.name,
+        'slug', row.slug,
+        'price_cents', row.price_cents,
+        'changed_at', CASE TG_OP WHEN 'DELETE' THEN timezone('UTC', now()) ELSE row.updated_at END
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER products_change_notify
+    AFTER INSERT OR UPDATE OR DELETE ON products
+    FOR EACH ROW EXECUTE FUNCTION notify_product_change();
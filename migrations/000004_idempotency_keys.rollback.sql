@@ -0,0 +1,2 @@
+
+DROP TABLE IF EXISTS idempotency_keys;
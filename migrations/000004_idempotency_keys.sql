@@ -0,0 +1,22 @@
+-- depends: 000003_products_change_notify
+
+-- Responses of completed write requests, keyed by the client's Idempotency-Key.
+-- The row is inserted when the request starts and filled in by the same
+-- transaction that performs the write, so a duplicate blocks on the primary
+-- key until the first request commits (replay) or rolls back (runs again).
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    scope VARCHAR(64) NOT NULL,
+    -- Use case the key belongs to (e.g. "products.add")
+
+    key VARCHAR(255) NOT NULL,
+
+    fingerprint BYTEA NOT NULL,
+    -- SHA-256 of the request, a reused key with another payload is rejected
+
+    response BYTEA,
+    -- msgpack-encoded response, NULL until the request completes
+
+    created_at TIMESTAMP NOT NULL,
+
+    PRIMARY KEY (scope, key)
+);
@@ -0,0 +1 @@
+DROP INDEX IF EXISTS idx_idempotency_keys_created_at;
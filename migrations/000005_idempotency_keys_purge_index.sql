@@ -0,0 +1,5 @@
+-- depends: 000004_idempotency_keys
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created_at
+    ON idempotency_keys(created_at);
+COMMENT ON INDEX idx_idempotency_keys_created_at IS 'Finds expired keys for the periodic purge';
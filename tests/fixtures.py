@@ -0,0 +1,65 @@
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+
+class FakeRedis:
+    """In-memory stand-in for the few ``redis.asyncio.Redis`` calls the adapters make, TTLs ignored."""
+
+    def __init__(self, fail: bool = False):
+        self.data: dict[str, bytes] = {}
+        self.fail = fail
+
+    def _check(self) -> None:
+        if self.fail:
+            raise RedisConnectionError("redis is down")
+
+    async def get(self, key: str) -> bytes | None:
+        self._check()
+        return self.data.get(key)
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes | str, ex: int | None = None, nx: bool = False) -> bool:
+        self._check()
+        if nx and key in self.data:
+            return False
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        self._check()
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def getbit(self, key: str, offset: int) -> int:
+        self._check()
+        value = self.data.get(key, b"")
+        byte = offset >> 3
+        return int(byte < len(value) and bool(value[byte] & (0x80 >> (offset & 7))))
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self)
+
+    def register_script(self, script: str):
+        return None
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._calls: list[tuple[str, tuple, dict]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+    def set(self, *args, **kwargs) -> None:
+        self._calls.append(("set", args, kwargs))
+
+    def getbit(self, *args, **kwargs) -> None:
+        self._calls.append(("getbit", args, kwargs))
+
+    async def execute(self) -> list:
+        return [await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._calls]
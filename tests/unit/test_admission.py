@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from app.application.api.v1.http.middleware import AdmissionControlMiddleware
+from app.domain.common.enums import RequestClass
+from app.domain.core.config.settings import AdmissionConfig
+from app.domain.errors.admission import ServiceOverloadedError
+from app.infrastructure.adapters.admission.limiter import AdaptiveConcurrencyLimiter
+from app.infrastructure.ports.admission import ConcurrencyLimiterPort
+
+SCOPE = {"type": "http", "path": "/api/v1/products", "method": "GET", "headers": []}
+
+
+class RecordingLimiter(ConcurrencyLimiterPort):
+    def __init__(self):
+        self.released: list[tuple[float | None, bool]] = []
+
+    async def acquire(self, request_class: RequestClass, budget: float) -> None:
+        return None
+
+    def release(self, request_class: RequestClass, latency: float | None, *, overloaded: bool = False) -> None:
+        self.released.append((latency, overloaded))
+
+
+class StubContainer:
+    def __init__(self, limiter: ConcurrencyLimiterPort):
+        self._objects = {AdmissionConfig: AdmissionConfig(), ConcurrencyLimiterPort: limiter}
+
+    async def get(self, dependency):
+        return self._objects[dependency]
+
+
+def run_request(app) -> RecordingLimiter:
+    limiter = RecordingLimiter()
+    middleware = AdmissionControlMiddleware(app, StubContainer(limiter))
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        return None
+
+    try:
+        asyncio.run(middleware(dict(SCOPE), receive, send))
+    except BaseException:
+        pass
+    return limiter
+
+
+def responding(status: int):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+def raising(exc: BaseException):
+    async def app(scope, receive, send):
+        raise exc
+    return app
+
+
+@pytest.mark.parametrize("status, overloaded", [(200, False), (500, False), (503, True), (504, True)])
+def test_only_overload_statuses_count(status, overloaded):
+    [(latency, flagged)] = run_request(responding(status)).released
+    assert latency is not None and flagged is overloaded
+
+
+@pytest.mark.parametrize("exc, overloaded", [
+    (TimeoutError(), True),  # pool acquire timeout
+    (RuntimeError("bug"), False),
+    (OSError("send failed"), False),
+])
+def test_only_saturation_errors_count(exc, overloaded):
+    [(latency, flagged)] = run_request(raising(exc)).released
+    assert latency is not None and flagged is overloaded
+
+
+def test_cancelled_request_gives_no_sample():
+    assert run_request(raising(asyncio.CancelledError())).released == [(None, False)]
+
+
+def make_limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(AdmissionConfig(**{"initial_limit": 10, "min_limit": 2, **overrides}))
+
+
+def test_overload_cuts_the_limit_and_steady_latency_grows_it():
+    async def run():
+        limiter = make_limiter()
+        await limiter.acquire(RequestClass.WRITE, 1.0)
+        limiter.release(RequestClass.WRITE, 0.01, overloaded=True)
+        cut = limiter.limit
+
+        for _ in range(200):
+            await asyncio.gather(*(limiter.acquire(RequestClass.WRITE, 1.0) for _ in range(limiter.limit)))
+            for _ in range(limiter.limit):
+                limiter.release(RequestClass.WRITE, 0.01)
+        return cut, limiter.limit
+
+    cut, grown = asyncio.run(run())
+    assert cut == 9
+    assert grown > 10
+
+
+def test_rising_latency_cuts_the_limit():
+    async def run():
+        limiter = make_limiter()
+        for latency in [0.01] * 50 + [0.1] * 50:
+            await asyncio.gather(*(limiter.acquire(RequestClass.WRITE, 1.0) for _ in range(limiter.limit)))
+            limiter._last_decrease = 0.0  # one cut per service time, let every round count
+            for _ in range(limiter.limit):
+                limiter.release(RequestClass.WRITE, latency)
+        return limiter.limit
+
+    assert asyncio.run(run()) < 10
+
+
+def test_shed_first_class_is_rejected_past_its_share():
+    async def run():
+        limiter = make_limiter(shed_first=RequestClass.READ, shed_share=0.5)
+        for _ in range(5):
+            await limiter.acquire(RequestClass.READ, 1.0)
+        with pytest.raises(ServiceOverloadedError):
+            await limiter.acquire(RequestClass.READ, 0.0)
+        await limiter.acquire(RequestClass.WRITE, 0.0)  # the protected class still has room
+        return limiter.inflight
+
+    assert asyncio.run(run()) == 6
@@ -0,0 +1,29 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock
+
+from app.domain.core.config.settings import CacheConfig
+from app.domain.dto.product import Product
+from app.infrastructure.adapters.cache.existence_filter import NullExistenceFilter
+from app.infrastructure.adapters.cache.product_cache import RedisProductCache
+from app.infrastructure.adapters.cache.sharding import RedisShardRouter
+from app.services.use_cases.products.batch_get.handler import BatchGetProductsHandler
+from app.services.use_cases.products.batch_get.request import BatchGetProductsRequest
+from tests.fixtures import FakeRedis
+
+
+def test_batch_get_serves_from_the_database_when_redis_is_down():
+    product = Product(name="Lamp", slug="lamp", price_cents=1999)
+    absent = uuid.uuid4()
+    uow = AsyncMock()
+    uow.__aenter__.return_value = uow
+    uow.products.get_many_by_guids.return_value = [product]
+    cache = RedisProductCache(
+        RedisShardRouter({"main": FakeRedis(fail=True)}),
+        CacheConfig(host="localhost", port=6379, db=0),
+    )
+    handler = BatchGetProductsHandler(uow=uow, cache=cache, existence_filter=NullExistenceFilter())
+
+    response = asyncio.run(handler.handle(BatchGetProductsRequest(guids=[product.guid, absent])))
+
+    assert [(item.guid, item.found) for item in response.items] == [(product.guid, True), (absent, False)]
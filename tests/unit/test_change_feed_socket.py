@@ -0,0 +1,60 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from starlette.websockets import WebSocket
+
+from app.application.api.v1.websocket.controllers.products import ProductChangesController
+
+
+class QueueSubscription:
+    def __init__(self):
+        self.evicted = False
+        self.closed = False
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    async def get(self):
+        return await self._queue.get()
+
+    def close(self):
+        self.closed = True
+        self._queue.put_nowait(None)
+
+
+class SingleFeed:
+    def __init__(self, subscription: QueueSubscription):
+        self._subscription = subscription
+
+    @asynccontextmanager
+    async def subscribe(self):
+        yield self._subscription
+
+
+def test_client_frames_are_ignored_until_it_disconnects():
+    sent: list[dict] = []
+
+    async def run():
+        subscription = QueueSubscription()
+        incoming: asyncio.Queue = asyncio.Queue()
+        for message in (
+            {"type": "websocket.connect"},
+            {"type": "websocket.receive", "bytes": b"\x00\x01"},
+            {"type": "websocket.receive", "text": "ping"},
+        ):
+            incoming.put_nowait(message)
+
+        async def send(message):
+            sent.append(message)
+
+        websocket = WebSocket({"type": "websocket", "path": "/", "headers": []}, incoming.get, send)
+        handler = asyncio.create_task(ProductChangesController().changes(websocket, SingleFeed(subscription)))
+        await asyncio.sleep(0.05)
+        # Still subscribed after a binary and a text frame
+        assert not handler.done() and not subscription.closed
+
+        incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(handler, timeout=1)
+        return subscription
+
+    subscription = asyncio.run(run())
+    assert subscription.closed
+    assert sent == [{"type": "websocket.accept", "subprotocol": None, "headers": []}]
@@ -0,0 +1,49 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from app.infrastructure.adapters.changes import postgres
+from app.infrastructure.adapters.changes.postgres import PostgresProductChangeListener
+
+
+def test_listener_reconnects_after_any_error(monkeypatch):
+    monkeypatch.setattr(postgres, "RECONNECT_DELAY", 0.001)
+    attempts = []
+
+    async def listen():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise TimeoutError("connect timed out")
+        if len(attempts) == 2:
+            raise RuntimeError("unexpected protocol state")
+        await asyncio.Event().wait()
+
+    async def run():
+        listener = PostgresProductChangeListener("postgresql://unused", Mock())
+        monkeypatch.setattr(listener, "_listen", listen)
+        await listener.start()
+        for _ in range(100):
+            if len(attempts) == 3:
+                break
+            await asyncio.sleep(0.001)
+        task = listener._task
+        await listener.close()
+        return task
+
+    task = asyncio.run(run())
+    assert attempts == [0, 1, 2]
+    assert task.cancelled()
+
+
+def test_listener_lets_cancellation_through():
+    async def run():
+        listener = PostgresProductChangeListener("postgresql://unused", Mock())
+        listener._listen = lambda: asyncio.Event().wait()
+        task = asyncio.create_task(listener._run())
+        await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run())
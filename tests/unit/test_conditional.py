@@ -0,0 +1,78 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from starlette.requests import Request
+
+from app.application.api.v1.http import conditional
+from app.domain.dto import ProductValidator
+
+VALIDATOR = ProductValidator.from_timestamp(uuid.uuid4(), datetime(2025, 3, 1, 12, 30, 15, 250_000))
+ETAG = conditional.etag_for(VALIDATOR)
+LAST_MODIFIED = "Sat, 01 Mar 2025 12:30:15 GMT"
+
+
+def request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_validator_headers():
+    headers = conditional.validator_headers(VALIDATOR)
+    assert headers == {"ETag": ETAG, "Last-Modified": LAST_MODIFIED, "Cache-Control": "public, no-cache"}
+
+
+def test_etag_changes_with_the_microsecond():
+    later = ProductValidator(guid=VALIDATOR.guid, version=VALIDATOR.version + 1)
+    assert conditional.etag_for(later) != ETAG
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (ETAG, True),
+        (f'"stale", {ETAG}', True),
+        (f"W/{ETAG}", True),
+        (f'"stale",W/{ETAG} ', True),
+        ("*", True),
+        ('"stale"', False),
+        (ETAG.upper(), False),
+    ],
+)
+def test_if_none_match(if_none_match, expected):
+    assert conditional.is_not_modified(request(if_none_match=if_none_match), VALIDATOR) is expected
+
+
+@pytest.mark.parametrize(
+    "if_modified_since, expected",
+    [
+        (LAST_MODIFIED, True),  # the header drops the microseconds
+        ("Sat, 01 Mar 2025 12:30:16 GMT", True),
+        ("Sat, 01 Mar 2025 12:30:14 GMT", False),
+        ("Sat, 01 Mar 2025 12:30:15 -0000", False),  # no zone, cannot be compared
+        ("yesterday", False),
+    ],
+)
+def test_if_modified_since(if_modified_since, expected):
+    assert conditional.is_not_modified(request(if_modified_since=if_modified_since), VALIDATOR) is expected
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    stale = request(if_none_match='"stale"', if_modified_since=LAST_MODIFIED)
+    assert conditional.is_not_modified(stale, VALIDATOR) is False
+
+
+def test_unconditional_request():
+    plain = request()
+    assert not conditional.is_conditional(plain)
+    assert conditional.is_not_modified(plain, VALIDATOR) is False
+    assert conditional.is_conditional(request(if_modified_since=LAST_MODIFIED))
+
+
+def test_not_modified_repeats_the_validators_without_a_body():
+    response = conditional.not_modified(VALIDATOR)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == ETAG
+    assert response.headers["last-modified"] == LAST_MODIFIED
+    assert response.headers["cache-control"] == "public, no-cache"
@@ -0,0 +1,143 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from dishka import Provider, Scope, make_async_container
+
+from app.application.api.v1.http.app import create_app
+from app.domain.core.config.settings import DiagnosticsConfig
+from app.domain.dto.diagnostics import LoopStall
+from app.domain.errors.diagnostics import ProfilerBusyError
+from app.infrastructure.adapters.diagnostics.loop_monitor import LoopLagMonitor
+from app.infrastructure.adapters.diagnostics.profiler import LoopProfiler
+from app.infrastructure.ports.diagnostics import LoopMonitorPort, LoopProfilerPort
+
+TOKEN = "s3cret"
+STALL = LoopStall(started_at=1700000000.0, duration_seconds=0.25, task="warmup", stack=["  File x.py"])
+
+
+def block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def test_loop_monitor_records_the_blocking_task_and_its_stack():
+    async def warmup():
+        await asyncio.sleep(0.05)
+        block_the_loop(0.3)
+        await asyncio.sleep(0.1)  # the heartbeat comes back and records the duration
+
+    async def run():
+        monitor = LoopLagMonitor(threshold=0.1, interval=0.02)
+        monitor.start()
+        try:
+            await asyncio.create_task(warmup(), name="warmup")
+        finally:
+            monitor.stop()
+        return monitor.stalls()
+
+    [stall] = asyncio.run(run())
+    assert stall.task == "warmup"
+    assert any("block_the_loop" in line for line in stall.stack)
+    assert stall.duration_seconds >= 0.25
+
+
+def test_profiler_attributes_samples_to_the_running_task():
+    async def busy():
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            block_the_loop(0.01)
+            await asyncio.sleep(0)
+
+    async def run():
+        profiler = LoopProfiler()
+        task = asyncio.create_task(busy(), name="busy")
+        profile = asyncio.create_task(profiler.profile(0.2, 0.005))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ProfilerBusyError):
+            await profiler.profile(0.1, 0.005)
+        stacks = await profile
+        await task
+        return stacks
+
+    lines = asyncio.run(run()).splitlines()
+    busy_samples = [line for line in lines if line.startswith("task:busy;")]
+    assert busy_samples
+    assert any("block_the_loop" in line for line in busy_samples)
+    # Every line is "stack count", most sampled first
+    counts = [int(line.rsplit(" ", 1)[1]) for line in lines]
+    assert counts == sorted(counts, reverse=True)
+
+
+class StubMonitor:
+    def stalls(self) -> list[LoopStall]:
+        return [STALL]
+
+
+class StubProfiler:
+    def __init__(self):
+        self.calls: list[tuple[float, float]] = []
+
+    async def profile(self, seconds: float, interval: float) -> str:
+        self.calls.append((seconds, interval))
+        return "task:warmup;app.cache:warm 3\n"
+
+
+class Client:
+    """Requests straight into the ASGI app; the lifespan (and its startup work) never runs."""
+
+    def __init__(self, app):
+        self._transport = httpx.ASGITransport(app=app)
+
+    def get(self, url: str, headers: dict | None = None) -> httpx.Response:
+        async def send():
+            async with httpx.AsyncClient(transport=self._transport, base_url="http://test") as http:
+                return await http.get(url, headers=headers)
+
+        return asyncio.run(send())
+
+
+def client(admin_token: str) -> tuple[Client, StubProfiler]:
+    profiler = StubProfiler()
+    provider = Provider(scope=Scope.APP)
+    provider.provide(lambda: DiagnosticsConfig(admin_token=admin_token, profile_max_seconds=30), provides=DiagnosticsConfig)
+    provider.provide(lambda: StubMonitor(), provides=LoopMonitorPort)
+    provider.provide(lambda: profiler, provides=LoopProfilerPort)
+    return Client(create_app(make_async_container(provider))), profiler
+
+
+def test_diagnostics_are_not_found_without_an_admin_token():
+    http, _ = client(admin_token="")
+    response = http.get("/debug/loop/stalls", headers={"Authorization": f"Bearer {TOKEN}"})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", f"Basic {TOKEN}"])
+def test_diagnostics_require_the_admin_token(authorization):
+    http, _ = client(admin_token=TOKEN)
+    headers = {"Authorization": authorization} if authorization else {}
+    assert http.get("/debug/loop/stalls", headers=headers).status_code == 403
+
+
+def test_stalls_endpoint():
+    http, _ = client(admin_token=TOKEN)
+    response = http.get("/debug/loop/stalls", headers={"Authorization": f"Bearer {TOKEN}"})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"started_at": 1700000000.0, "duration_seconds": 0.25, "task": "warmup", "stack": ["  File x.py"]}
+    ]
+
+
+def test_profile_endpoint_returns_collapsed_stacks():
+    http, profiler = client(admin_token=TOKEN)
+    auth = {"Authorization": f"Bearer {TOKEN}"}
+    response = http.get("/debug/loop/profile?seconds=2&interval_ms=0.1", headers=auth)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; charset=utf-8"
+    assert response.text == "task:warmup;app.cache:warm 3\n"
+    assert profiler.calls == [(2.0, 0.001)]  # the interval is clamped to 1ms
+
+    assert http.get("/debug/loop/profile?seconds=31", headers=auth).status_code == 400
+    assert http.get("/debug/loop/profile?seconds=0", headers=auth).status_code == 400
@@ -0,0 +1,105 @@
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.domain.common.enums import CacheKey
+from app.domain.core.config.settings import CacheConfig
+from app.domain.dto.product import Product
+from app.infrastructure.adapters.cache.existence_filter import RedisBloomExistenceFilter
+from app.infrastructure.ports.product_cache import ProductExistenceFilterPort
+from app.services.use_cases.products.get.handler import GetProductHandler
+from app.services.use_cases.products.get.request import GetProductRequest
+from tests.fixtures import FakeRedis
+
+BITS = 1024
+
+
+def make_filter(redis: FakeRedis) -> RedisBloomExistenceFilter:
+    config = CacheConfig(host="localhost", port=6379, db=0, existence_filter_bits=BITS, existence_filter_hashes=3)
+    return RedisBloomExistenceFilter(redis, config, Mock())
+
+
+def set_bits(bitmap: bytearray, positions: list[int]) -> None:
+    for pos in positions:
+        bitmap[pos >> 3] |= 0x80 >> (pos & 7)
+
+
+def test_local_miss_set_in_redis_is_not_missing():
+    redis = FakeRedis()
+    bloom = make_filter(redis)
+    elsewhere, absent = uuid.uuid4(), uuid.uuid4()
+    # Another replica added ``elsewhere`` after this one synced an empty filter
+    bloom._local = bytearray(BITS // 8)
+    shared = bytearray(BITS // 8)
+    set_bits(shared, bloom._positions(elsewhere))
+    redis.data[CacheKey.PRODUCT_FILTER.value] = bytes(shared)
+
+    assert not bloom.might_exist(elsewhere)
+    assert asyncio.run(bloom.confirm_missing([elsewhere, absent])) == {absent}
+    assert bloom.might_exist(elsewhere)  # copied into the local bitmap
+
+
+def test_nothing_confirmed_when_redis_fails():
+    bloom = make_filter(FakeRedis(fail=True))
+    bloom._local = bytearray(BITS // 8)
+
+    assert asyncio.run(bloom.confirm_missing([uuid.uuid4()])) == set()
+
+
+def test_sync_rebuilds_an_oversized_bitmap():
+    redis = FakeRedis()
+    bloom = make_filter(redis)
+    redis.data[CacheKey.PRODUCT_FILTER.value] = b"\xff" * (BITS // 4)
+
+    async def run():
+        await bloom._sync()
+        scheduled = bloom._rebuild_task is not None
+        await bloom.close()
+        return scheduled
+
+    assert asyncio.run(run())
+    assert bloom._local is None
+    assert bloom.might_exist(uuid.uuid4())
+
+
+def test_get_falls_through_when_the_shared_filter_has_the_product():
+    product = Product(name="Lamp", slug="lamp", price_cents=1999)
+    existence_filter = Mock(spec=ProductExistenceFilterPort)
+    existence_filter.might_exist.return_value = False
+    existence_filter.confirm_missing = AsyncMock(return_value=set())
+    cache = AsyncMock()
+    cache.get.return_value = product
+    handler = GetProductHandler(uow=AsyncMock(), cache=cache, existence_filter=existence_filter)
+
+    response = asyncio.run(handler.handle(GetProductRequest(guid=product.guid)))
+
+    assert response.guid == product.guid
+    existence_filter.confirm_missing.assert_awaited_once_with([product.guid])
+
+
+def test_failed_add_discards_the_filter_instead_of_reporting_the_product_missing():
+    redis = FakeRedis()
+    bloom = make_filter(redis)
+    bloom._add_script = AsyncMock(side_effect=RedisConnectionError("redis is down"))
+    bloom.rebuild = AsyncMock()
+    bloom._local = bytearray(BITS // 8)
+    redis.data[CacheKey.PRODUCT_FILTER.value] = bytes(BITS // 8)
+    product = Product(name="Lamp", slug="lamp", price_cents=1999)
+    cache = AsyncMock()
+    cache.get.return_value = product
+    handler = GetProductHandler(uow=AsyncMock(), cache=cache, existence_filter=bloom)
+
+    async def run():
+        await bloom.add([product.guid])
+        await bloom._sync()  # the bitmap without the product is not loaded back
+        await asyncio.sleep(0)  # lets the scheduled rebuild run
+        return await handler.handle(GetProductRequest(guid=product.guid)), await bloom.confirm_missing([product.guid])
+
+    response, missing = asyncio.run(run())
+
+    assert response.guid == product.guid
+    assert missing == set()
+    assert CacheKey.PRODUCT_FILTER.value not in redis.data
+    bloom.rebuild.assert_awaited_once()
@@ -0,0 +1,97 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+import msgspec
+import pytest
+
+from app.domain.dto.idempotency import IdempotencyRecord
+from app.domain.errors.idempotency import IdempotencyKeyReusedError, IdempotencyKeyUnavailableError
+from app.infrastructure.adapters.persistence.rdb.repositories.idempotency import (
+    IdempotencyKeyPurger,
+    RDBIdempotencyRepository,
+)
+from app.services.use_cases.idempotency import IdempotentWrite
+
+TTL = timedelta(hours=24)
+
+
+class Body(msgspec.Struct):
+    name: str
+
+
+def claim(conn) -> IdempotencyRecord | None:
+    return asyncio.run(RDBIdempotencyRepository(conn).claim("products.add", "key-1", b"fp", TTL))
+
+
+def test_claim_owns_a_new_key():
+    conn = AsyncMock()
+    conn.fetchval.return_value = 1
+    assert claim(conn) is None
+
+
+def test_claim_returns_the_stored_response():
+    conn = AsyncMock()
+    conn.fetchval.return_value = None
+    conn.fetchrow.return_value = {"fingerprint": b"fp", "response": b"stored"}
+    assert claim(conn) == IdempotencyRecord(fingerprint=b"fp", response=b"stored")
+
+
+def test_claim_rejects_a_committed_key_without_response():
+    conn = AsyncMock()
+    conn.fetchval.return_value = None
+    conn.fetchrow.return_value = {"fingerprint": b"fp", "response": None}
+    with pytest.raises(IdempotencyKeyUnavailableError):
+        claim(conn)
+    assert conn.fetchval.await_count == 1
+
+
+def test_claim_gives_up_when_the_key_keeps_vanishing():
+    conn = AsyncMock()
+    conn.fetchval.return_value = None
+    conn.fetchrow.return_value = None
+    with pytest.raises(IdempotencyKeyUnavailableError):
+        claim(conn)
+    assert conn.fetchval.await_count == 3
+
+
+def test_replay_decodes_the_stored_response_and_rejects_another_payload():
+    write = IdempotentWrite("products.add", Body)
+    first = Body(name="lamp")
+    captured = {}
+
+    async def run():
+        repo = AsyncMock()
+        repo.claim.return_value = None
+        assert await write.replay(repo, "key-1", first) is None
+        captured["fingerprint"] = repo.claim.await_args.args[2]
+
+        repo.claim.return_value = IdempotencyRecord(
+            fingerprint=captured["fingerprint"], response=msgspec.msgpack.encode(first)
+        )
+        assert await write.replay(repo, "key-1", first) == first
+        with pytest.raises(IdempotencyKeyReusedError):
+            await write.replay(repo, "key-1", Body(name="chair"))
+
+    asyncio.run(run())
+
+
+class StubPool:
+    def __init__(self, conn):
+        self._conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self._conn
+
+
+def test_purge_deletes_in_batches_until_a_short_one():
+    conn = AsyncMock()
+    conn.execute.side_effect = ["DELETE 100", "DELETE 100", "DELETE 7"]
+    purger = IdempotencyKeyPurger(StubPool(conn), ttl=TTL, interval=60, batch_size=100)
+
+    assert asyncio.run(purger.purge()) == 207
+    query, ttl, limit = conn.execute.await_args.args
+    assert "FOR UPDATE SKIP LOCKED" in query
+    assert (ttl, limit) == (TTL, 100)
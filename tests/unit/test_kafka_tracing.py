@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from aiokafka.structs import ConsumerRecord
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON
+from opentelemetry.trace import SpanKind
+
+from app.infrastructure.adapters.amqp import consumer, kafka
+from app.infrastructure.adapters.amqp.consumer import MessageWorker
+from app.infrastructure.adapters.amqp.kafka import KafkaMessageBroker
+from app.infrastructure.adapters.tracing.propagation import extract_context, inject_headers
+
+
+class RecordingProducer:
+    def __init__(self):
+        self.sent: list[dict] = []
+
+    async def send_and_wait(self, **kwargs):
+        self.sent.append(kwargs)
+
+
+def provider_for(sampler) -> tuple[TracerProvider, InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(sampler=sampler)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider, exporter
+
+
+@pytest.fixture
+def exporter(monkeypatch) -> InMemorySpanExporter:
+    provider, exporter = provider_for(ALWAYS_ON)
+    monkeypatch.setattr(kafka, "tracer", provider.get_tracer("test"))
+    monkeypatch.setattr(consumer, "tracer", provider.get_tracer("test"))
+    return exporter
+
+
+def make_broker() -> tuple[KafkaMessageBroker, RecordingProducer]:
+    broker = KafkaMessageBroker("localhost:9092", "test")
+    producer = RecordingProducer()
+    broker._producer = producer
+    return broker, producer
+
+
+def received(broker: KafkaMessageBroker, sent: dict):
+    record = ConsumerRecord(
+        topic=sent["topic"], partition=0, offset=7, timestamp=0, timestamp_type=0, key=None,
+        value=sent["value"], checksum=None, serialized_key_size=0, serialized_value_size=0,
+        headers=sent["headers"],
+    )
+    return broker._to_broker_message(record)
+
+
+def test_nothing_is_injected_outside_a_trace():
+    assert inject_headers({"x-source": "api"}) == {"x-source": "api"}
+    assert extract_context(None) is None
+    assert extract_context({}) is None
+
+
+def test_consumer_span_continues_the_producer_trace(exporter):
+    broker, producer = make_broker()
+    handled = []
+
+    async def handler(message):
+        handled.append(message)
+
+    worker = MessageWorker(broker, ["products"])
+    worker.register_handler("products", handler)
+
+    async def run():
+        await broker.publish("products", "created", headers={"x-source": "api"})
+        [sent] = producer.sent
+        await worker._handle_message("products", received(broker, sent))
+
+    asyncio.run(run())
+
+    send, process = exporter.get_finished_spans()
+    assert (send.name, send.kind) == ("send products", SpanKind.PRODUCER)
+    assert (process.name, process.kind) == ("process products", SpanKind.CONSUMER)
+    assert process.context.trace_id == send.context.trace_id
+    assert process.parent.span_id == send.context.span_id
+    assert process.attributes["messaging.destination.name"] == "products"
+    [message] = handled
+    assert message.headers["x-source"] == "api"
+    assert "traceparent" in message.headers
+
+
+def test_publish_in_a_sampled_out_trace_propagates_the_parent_without_a_span(exporter):
+    broker, producer = make_broker()
+    provider, _ = provider_for(ALWAYS_OFF)
+
+    async def run():
+        with provider.get_tracer("test").start_as_current_span("request") as parent:
+            await broker.publish("products", b"created")
+        return parent
+
+    parent = asyncio.run(run())
+
+    assert exporter.get_finished_spans() == ()
+    headers = received(broker, producer.sent[0]).headers
+    trace_id, span_id, flags = headers["traceparent"].split("-")[1:]
+    assert int(trace_id, 16) == parent.get_span_context().trace_id
+    assert int(span_id, 16) == parent.get_span_context().span_id
+    assert not int(flags, 16) & 0x01  # not sampled
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from opentelemetry.trace import TracerProvider
+
+from app.application.api.v1.grpc.server import serve
+from app.application.api.v1.http.app import create_app
+from app.infrastructure.adapters.cache.warmup import ProductCacheWarmer
+from app.infrastructure.adapters.di.lifecycle import started
+from app.infrastructure.adapters.monitoring.exporter import MetricsExporter
+from app.infrastructure.adapters.persistence.rdb.repositories.idempotency import IdempotencyKeyPurger
+from app.infrastructure.ports.diagnostics import LoopMonitorPort
+
+STARTED = [TracerProvider, LoopMonitorPort, ProductCacheWarmer, IdempotencyKeyPurger, MetricsExporter]
+
+
+class StubContainer:
+    def __init__(self):
+        self.resolved: list[type] = []
+        self.closed = False
+
+    async def get(self, dependency):
+        self.resolved.append(dependency)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_started_resolves_the_components_and_closes_the_container_on_error():
+    container = StubContainer()
+
+    async def run():
+        async with started(container):
+            assert container.resolved == STARTED
+            raise RuntimeError("server crashed")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert container.closed
+
+
+def test_http_lifespan_starts_the_components():
+    container = StubContainer()
+    app = create_app(container)
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            assert container.resolved == STARTED
+
+    asyncio.run(run())
+    assert container.closed
+
+
+def test_grpc_server_starts_the_same_components():
+    container = StubContainer()
+
+    async def run():
+        server = asyncio.create_task(serve(container, "127.0.0.1:0"))
+        while not container.resolved:
+            await asyncio.sleep(0.01)
+        server.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server
+
+    asyncio.run(asyncio.wait_for(run(), timeout=10))
+    assert container.resolved == STARTED
+    assert container.closed
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+from loguru import logger
+
+from app.infrastructure.adapters._logging import sampling
+from app.infrastructure.adapters._logging.sampling import REPEATED_KEY, LogSampler
+
+LEVELS = {"INFO": 20, "WARNING": 30, "CRITICAL": 50}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(sampling.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def summaries() -> list[dict]:
+    records: list[dict] = []
+    handler_id = logger.add(lambda message: records.append(message.record), filter=lambda r: REPEATED_KEY in r["extra"])
+    yield records
+    logger.remove(handler_id)
+
+
+def record(message: str, level: str = "WARNING", line: int = 10) -> dict:
+    return {
+        "level": SimpleNamespace(name=level, no=LEVELS[level]),
+        "name": "app.worker",
+        "function": "run",
+        "line": line,
+        "message": message,
+        "extra": {},
+    }
+
+
+def kept(sampler: LogSampler, *records: dict) -> int:
+    for entry in records:
+        sampler(entry)
+    return sum(LogSampler.keep(entry) for entry in records)
+
+
+def test_dedupe_keeps_the_first_repeats_and_summarizes_the_rest(clock, summaries):
+    sampler = LogSampler({}, window=10.0, keep_first=3)
+
+    assert kept(sampler, *(record("cache miss storm") for _ in range(50))) == 3
+    assert summaries == []
+
+    clock.now += 10.0
+    assert kept(sampler, record("cache miss storm")) == 1
+    assert len(summaries) == 1
+    assert summaries[0]["extra"][REPEATED_KEY] == 47
+    assert summaries[0]["message"] == "cache miss storm (repeated 47 more times in 10.0s)"
+    assert (summaries[0]["name"], summaries[0]["line"], summaries[0]["level"].name) == ("app.worker", 10, "WARNING")
+
+
+def test_sweep_reports_bursts_of_messages_that_stopped(clock, summaries):
+    sampler = LogSampler({}, window=10.0, keep_first=1)
+    kept(sampler, *(record("broker reconnecting") for _ in range(5)))
+
+    clock.now += 10.0
+    kept(sampler, record("something else", line=20))
+
+    assert [summary["extra"][REPEATED_KEY] for summary in summaries] == [4]
+
+
+def test_distinct_messages_are_counted_apart(clock):
+    sampler = LogSampler({}, keep_first=2)
+
+    assert kept(sampler, *(record(f"order {index} failed") for index in range(10))) == 10
+
+
+def test_without_dedupe_repeats_are_sampled_at_their_level_rate(clock, monkeypatch):
+    sampler = LogSampler({"INFO": 0.25}, dedupe=False, keep_first=0)
+    draws = iter([0.1, 0.3, 0.2, 0.9])
+    monkeypatch.setattr(sampling.random, "random", lambda: next(draws))
+
+    assert kept(sampler, *(record("request served", level="INFO") for _ in range(4))) == 2
+
+
+def test_critical_records_always_pass(clock):
+    sampler = LogSampler({"CRITICAL": 0.0}, keep_first=0)
+
+    assert kept(sampler, *(record("database unreachable", level="CRITICAL") for _ in range(20))) == 20
@@ -0,0 +1,127 @@
+import gzip
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import msgspec
+import pytest
+
+from app.infrastructure.adapters._logging.loki import LokiSink, LokiSinkStats
+from app.infrastructure.adapters.monitoring.instruments import LOKI_PUSHES, LOKI_RECORDS, loki_collector
+
+
+class Message(str):
+    """What loguru hands a sink: the formatted line, with the record attached."""
+
+    record: dict
+
+
+def message(text: str, level: str = "INFO") -> Message:
+    line = Message(text + "\n")
+    line.record = {"level": SimpleNamespace(name=level), "time": datetime(2026, 1, 1, tzinfo=timezone.utc)}
+    return line
+
+
+class StubLoki:
+    """Collects push bodies, answering with the queued statuses first and 204 after."""
+
+    def __init__(self, statuses: list[int] = ()):
+        self.pushes: list[dict] = []
+        self.statuses = list(statuses)
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                assert self.headers["Content-Encoding"] == "gzip"
+                status = stub.statuses.pop(0) if stub.statuses else 204
+                if status == 204:
+                    stub.pushes.append(msgspec.json.decode(gzip.decompress(body)))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/loki/api/v1/push"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def wait_for(self, pushes: int, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while len(self.pushes) < pushes and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def lines(self) -> list[str]:
+        return [line for push in self.pushes for stream in push["streams"] for _, line in stream["values"]]
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def loki():
+    stub = StubLoki()
+    yield stub
+    stub.close()
+
+
+def test_full_batches_go_out_gzipped_and_grouped_by_level(loki):
+    sink = LokiSink(loki.url, {"service_name": "test"}, batch_size=3, flush_interval=60)
+    for index in range(3):
+        sink.write(message(f"line {index}", "ERROR" if index == 1 else "INFO"))
+    sink.write(message("line 3"))
+    sink.stop()  # the partial batch is pushed on stop
+
+    assert len(loki.pushes) == 2
+    streams = {stream["stream"]["level"]: stream for stream in loki.pushes[0]["streams"]}
+    assert streams["INFO"]["stream"] == {"service_name": "test", "level": "INFO"}
+    assert [line for _, line in streams["ERROR"]["values"]] == ["line 1"]
+    assert sorted(loki.lines()) == ["line 0", "line 1", "line 2", "line 3"]
+    assert (sink.stats.sent, sink.stats.pushes) == (4, 2)
+
+
+def test_full_buffer_drops_the_oldest(loki):
+    sink = LokiSink(loki.url, {}, batch_size=100, flush_interval=60, max_buffered=3)
+    for index in range(5):
+        sink.write(message(f"line {index}"))
+    sink.stop()
+
+    assert loki.lines() == ["line 2", "line 3", "line 4"]
+    assert sink.stats.dropped == 2
+
+
+def test_retryable_statuses_are_retried_and_rejections_are_not(loki):
+    # Pushed by a full batch: a sink that is stopping gives up instead of retrying
+    loki.statuses = [503, 429]
+    sink = LokiSink(loki.url, {}, batch_size=1, flush_interval=60)
+    sink.write(message("kept"))
+    loki.wait_for(1)
+    sink.stop()
+    assert loki.lines() == ["kept"]
+    assert (sink.stats.retries, sink.stats.failed) == (2, 0)
+
+    loki.statuses = [400]
+    sink = LokiSink(loki.url, {}, batch_size=100, flush_interval=60)
+    sink.write(message("rejected"))
+    sink.stop()
+    assert loki.lines() == ["kept"]
+    assert (sink.stats.retries, sink.stats.failed) == (0, 1)
+
+
+def test_stats_are_exported_until_the_sink_stops(loki):
+    stats = LokiSinkStats()
+    collect = loki_collector(stats)
+    stopped = []
+    sink = LokiSink(loki.url, {}, flush_interval=60, stats=stats, on_stop=lambda: stopped.append(True))
+    sink.write(message("line"))
+    sink.stop()
+    collect()
+
+    assert LOKI_RECORDS.labels("sent").value == 1
+    assert LOKI_PUSHES.labels("ok").value == 1
+    assert stopped == [True]
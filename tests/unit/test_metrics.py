@@ -0,0 +1,86 @@
+import os
+
+from app.infrastructure.adapters.monitoring.exporter import MetricsExporter, ProcessSnapshot
+from app.infrastructure.adapters.monitoring.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricSnapshot,
+    MetricsRegistry,
+    Sample,
+    render,
+)
+
+
+def test_render_counters_gauges_and_cumulative_histograms():
+    registry = MetricsRegistry()
+    requests = Counter("app_requests_total", "Requests", ("route",), registry=registry)
+    inflight = Gauge("app_inflight", "In flight", registry=registry)
+    latency = Histogram("app_latency_seconds", "Latency", buckets=(0.1, 1.0), registry=registry)
+    requests.labels('say "hi"\n').inc(3)
+    inflight.labels().set(2.5)
+    for value in (0.05, 0.5, 5.0):
+        latency.labels().observe(value)
+
+    assert render(registry.snapshot()).splitlines() == [
+        "# HELP app_requests_total Requests",
+        "# TYPE app_requests_total counter",
+        'app_requests_total{route="say \\"hi\\"\\n"} 3',
+        "# HELP app_inflight In flight",
+        "# TYPE app_inflight gauge",
+        "app_inflight 2.5",
+        "# HELP app_latency_seconds Latency",
+        "# TYPE app_latency_seconds histogram",
+        'app_latency_seconds_bucket{le="0.1"} 1',
+        'app_latency_seconds_bucket{le="1"} 2',
+        'app_latency_seconds_bucket{le="+Inf"} 3',
+        "app_latency_seconds_sum 5.55",
+        "app_latency_seconds_count 3",
+    ]
+
+
+def snapshot(pid: int, requests: float, inflight: float, counts: list[int]) -> ProcessSnapshot:
+    return ProcessSnapshot(pid=pid, metrics=[
+        MetricSnapshot("app_requests_total", "counter", "Requests", ("route",), samples=[Sample(("/a",), requests)]),
+        MetricSnapshot("app_inflight", "gauge", "In flight", (), samples=[Sample((), inflight)]),
+        MetricSnapshot(
+            "app_latency_seconds", "histogram", "Latency", (), buckets=(0.1,),
+            samples=[Sample((), 0.1 * sum(counts), counts)],
+        ),
+    ])
+
+
+def test_merge_sums_every_process_but_gauges_only_of_live_ones():
+    merged = MetricsExporter._merge([
+        (snapshot(1, requests=2, inflight=1, counts=[1, 0]), True),
+        (snapshot(2, requests=5, inflight=4, counts=[2, 3]), False),  # exited, its totals still count
+    ])
+    by_name = {metric.name: metric.samples for metric in merged}
+
+    assert by_name["app_requests_total"] == [Sample(("/a",), 7)]
+    assert by_name["app_inflight"] == [Sample((), 1)]
+    assert by_name["app_latency_seconds"][0].counts == [3, 3]
+
+
+def test_collect_merges_other_workers_with_the_live_registry(tmp_path):
+    registry = MetricsRegistry()
+    Counter("app_requests_total", "Requests", ("route",), registry=registry).labels("/a").inc()
+    exporter = MetricsExporter(str(tmp_path), registry=registry)
+    exporter._write(registry.snapshot())  # this process's file goes stale, the live registry wins
+    (tmp_path / "metrics-1.msgpack").write_bytes(exporter._encoder.encode(snapshot(1, 5, 0, [0, 0])))
+    Counter("app_other_total", "Other", registry=registry).labels().inc()
+
+    by_name = {metric.name: metric.samples for metric in exporter.collect()}
+
+    assert by_name["app_requests_total"] == [Sample(("/a",), 6)]
+    assert by_name["app_other_total"] == [Sample((), 1)]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["metrics-1.msgpack", f"metrics-{os.getpid()}.msgpack"]
+
+
+def test_collect_survives_an_unwritable_directory(tmp_path):
+    registry = MetricsRegistry()
+    Counter("app_requests_total", "Requests", registry=registry).labels().inc()
+    exporter = MetricsExporter(str(tmp_path / "missing" / "dir"), registry=registry)
+
+    exporter._flush()  # logged, not raised
+    assert [metric.name for metric in exporter.collect()] == ["app_requests_total"]
@@ -0,0 +1,116 @@
+import asyncio
+
+from aiokafka import TopicPartition
+
+from app.domain.dto.broker import BrokerMessage, PartitionStats
+from app.infrastructure.adapters.amqp.kafka import KafkaMessageBroker
+from app.infrastructure.adapters.amqp.stats import PartitionStatsTracker
+from app.infrastructure.adapters.monitoring.instruments import (
+    KAFKA_CONSUMER_LAG,
+    KAFKA_CONSUMER_OFFSET,
+    KAFKA_CONSUMER_RATE,
+    partition_collector,
+)
+
+TP = TopicPartition("products", 3)
+
+
+def test_stats_follow_delivery_and_commits():
+    stats = PartitionStatsTracker(window=10.0)
+    stats.assign({TP: 5})
+    stats.delivered(TP, 5)
+    stats.delivered(TP, 6)
+    stats.processed(TP, 5, committed=True)
+
+    [snapshot] = stats.snapshot(lambda tp: 10)
+    assert (snapshot.topic, snapshot.partition) == ("products", 3)
+    assert (snapshot.committed, snapshot.position, snapshot.high_watermark) == (6, 7, 10)
+    assert snapshot.lag == 4
+    assert 0 < snapshot.messages_per_second <= 0.1
+    assert snapshot.handler_latency_seconds >= 0
+
+
+def test_lag_is_counted_from_the_position_until_something_is_committed():
+    stats = PartitionStatsTracker()
+    stats.assign({TP: None})
+    [before] = stats.snapshot(lambda tp: 10)
+    stats.delivered(TP, 2)
+    [after] = stats.snapshot(lambda tp: 10)
+
+    assert before.lag is None
+    assert after.lag == 7
+    assert stats.snapshot(lambda tp: None)[0].lag is None
+
+
+def test_revoked_partitions_are_forgotten():
+    stats = PartitionStatsTracker()
+    stats.assign({TP: 0})
+    stats.delivered(TP, 0)
+    stats.revoke([TP])
+
+    # A late ack of a revoked partition's message changes nothing
+    stats.processed(TP, 0, committed=True)
+    assert stats.snapshot(lambda tp: 10) == []
+
+
+class RecordingConsumer:
+    def __init__(self):
+        self.commits: list[dict] = []
+
+    async def commit(self, offsets):
+        self.commits.append(offsets)
+
+    def highwater(self, tp):
+        return 20
+
+
+def test_ack_commits_the_messages_own_offset():
+    broker = KafkaMessageBroker("localhost:9092", "test")
+    consumer = broker._consumer = RecordingConsumer()
+    broker._stats.assign({TP: 10})
+    broker._stats.delivered(TP, 10)
+    broker._stats.delivered(TP, 11)  # the consumer position runs ahead
+
+    message = BrokerMessage(body="created", routing_key="products", delivery_tag=(10, 3))
+    asyncio.run(broker.ack(message))
+
+    assert consumer.commits == [{TP: 11}]
+    [snapshot] = broker.partition_stats()
+    assert (snapshot.committed, snapshot.position, snapshot.lag) == (11, 12, 9)
+
+
+class StubBroker:
+    def __init__(self, stats: list[PartitionStats]):
+        self.stats = stats
+
+    def partition_stats(self) -> list[PartitionStats]:
+        return self.stats
+
+
+def partition_stats(committed: int | None) -> PartitionStats:
+    return PartitionStats(
+        topic="collector-test", partition=0, committed=committed, position=8, high_watermark=12,
+        lag=None if committed is None else 12 - committed, messages_per_second=1.5, handler_latency_seconds=0.01,
+    )
+
+
+def test_collector_mirrors_the_stats_and_drops_revoked_partitions():
+    labels = ("collector-test", "0")
+    broker = StubBroker([partition_stats(committed=7)])
+    collect = partition_collector(broker)
+
+    collect()
+    assert KAFKA_CONSUMER_LAG.labels(*labels).value == 5
+    assert KAFKA_CONSUMER_RATE.labels(*labels).value == 1.5
+    assert KAFKA_CONSUMER_OFFSET.labels(*labels, "committed").value == 7
+
+    broker.stats = [partition_stats(committed=None)]
+    collect()
+    assert labels not in KAFKA_CONSUMER_LAG._children
+    assert (*labels, "committed") not in KAFKA_CONSUMER_OFFSET._children
+    assert KAFKA_CONSUMER_OFFSET.labels(*labels, "position").value == 8
+
+    broker.stats = []
+    collect()
+    assert labels not in KAFKA_CONSUMER_RATE._children
+    assert not [key for key in KAFKA_CONSUMER_OFFSET._children if key[:2] == labels]
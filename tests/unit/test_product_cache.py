@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import uuid
+
+import fakeredis
+import msgspec
+import pytest
+
+from app.domain.common.timezone import get_current_datetime
+from app.domain.core.config.settings import CacheConfig
+from app.domain.dto.product import Product
+from app.infrastructure.adapters.cache.product_cache import RedisProductCache
+from app.infrastructure.adapters.cache.sharding import RedisShardRouter
+from tests.fixtures import FakeRedis
+
+
+def make_cache(*nodes) -> RedisProductCache:
+    config = CacheConfig(host="localhost", port=6379, db=0, early_refresh_beta=0)
+    return RedisProductCache(RedisShardRouter({f"node-{index}": node for index, node in enumerate(nodes)}), config)
+
+
+def make_product() -> Product:
+    return Product(name="Lamp", slug="lamp", price_cents=1999, updated_at=get_current_datetime())
+
+
+def test_put_then_get_round_trips():
+    cache = make_cache(FakeRedis())
+    product = make_product()
+
+    async def run():
+        await cache.put(product_guid=product.guid, product=product)
+        return await cache.get(product.guid)
+
+    assert asyncio.run(run()) == product
+
+
+@pytest.mark.parametrize("write", ["put", "put_many"])
+def test_write_failure_is_logged_not_raised(write, caplog):
+    cache = make_cache(FakeRedis(fail=True))
+    product = make_product()
+
+    async def run():
+        if write == "put":
+            await cache.put(product_guid=product.guid, product=product)
+        else:
+            await cache.put_many([product])
+
+    with caplog.at_level(logging.WARNING):
+        asyncio.run(run())
+    assert "Cache write failed" in caplog.text
+
+
+def test_undecodable_entry_is_a_miss_and_dropped():
+    redis = FakeRedis()
+    cache = make_cache(redis)
+    guid = uuid.uuid4()
+    key = cache._make_key(guid)
+    redis.data[key] = b"\x93not a product"
+
+    async def run():
+        product = await cache.get(guid)
+        many = await cache.get_many([guid])
+        await asyncio.sleep(0)  # lets the background delete run
+        return product, many
+
+    assert asyncio.run(run()) == (None, {})
+    assert key not in redis.data
+
+
+@pytest.mark.parametrize("nodes", [1, 3])
+def test_slug_lookup_resolves_the_index_in_redis(nodes):
+    cache = make_cache(*(fakeredis.FakeAsyncRedis() for _ in range(nodes)))
+    product = make_product()
+
+    async def run():
+        await cache.put(product_guid=product.guid, product=product)
+        return await cache.get_by_slug("lamp"), await cache.get_by_slug("desk")
+
+    assert asyncio.run(run()) == (product, None)
+
+
+def test_slug_lookup_misses_when_the_product_entry_is_gone():
+    redis = fakeredis.FakeAsyncRedis()
+    cache = make_cache(redis)
+    product = make_product()
+
+    async def run():
+        await cache.put(product_guid=product.guid, product=product)
+        await redis.delete(cache._make_key(product.guid))
+        missing = await cache.get_by_slug("lamp")
+        await cache.put_missing(product.guid)
+        return missing, await cache.get_by_slug("lamp")
+
+    assert asyncio.run(run()) == (None, None)
+
+
+def test_slug_lookup_ignores_a_stale_index_entry():
+    redis = fakeredis.FakeAsyncRedis()
+    cache = make_cache(redis)
+    product = make_product()
+    renamed = msgspec.structs.replace(product, slug="desk-lamp")
+
+    async def run():
+        await cache.put(product_guid=product.guid, product=product)
+        # The rename rewrote the entry, the old slug's invalidation has not landed yet
+        await cache.put(product_guid=product.guid, product=renamed)
+        return await cache.get_by_slug("lamp"), await cache.get_by_slug("desk-lamp")
+
+    assert asyncio.run(run()) == (None, renamed)
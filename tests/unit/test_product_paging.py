@@ -0,0 +1,49 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+from app.domain.core.config.settings import CacheConfig
+from app.domain.dto.product import Product
+from app.infrastructure.adapters.cache.warmup import ProductCacheWarmer
+from app.infrastructure.adapters.persistence.rdb.repositories.product import RDBProductRepository
+
+CREATED = datetime(2026, 1, 1)
+
+
+class KeysetReader:
+    """Pages like the SQL does: (created_at, guid) descending, strictly below the cursor."""
+
+    def __init__(self, products: list[Product]):
+        self._rows = sorted(products, key=lambda product: (product.created_at, product.guid), reverse=True)
+
+    async def list_newest_first(self, cursor=None, limit=100) -> list[Product]:
+        rows = [row for row in self._rows if cursor is None or (row.created_at, row.guid) < cursor]
+        return rows[:limit]
+
+
+def test_warmup_pages_over_equal_timestamps_without_gaps():
+    # Every product shares one created_at, a created_at-only cursor stops after the first page
+    products = [Product(name=f"p{i}", slug=f"p{i}", price_cents=i, created_at=CREATED) for i in range(7)]
+    cache = AsyncMock()
+    config = CacheConfig(host="localhost", port=6379, db=0, warmup_batch_size=3, warmup_rows_per_second=0)
+    warmer = ProductCacheWarmer(KeysetReader(products), cache, config)
+
+    assert asyncio.run(warmer.warm()) == 7
+    written = [product for call in cache.put_many.await_args_list for product in call.args[0]]
+    assert sorted(product.guid for product in written) == sorted(product.guid for product in products)
+
+
+def test_list_newest_first_seeks_on_created_at_and_guid():
+    product = Product(name="Lamp", slug="lamp", price_cents=1999, created_at=CREATED)
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+
+    async def run():
+        repository = RDBProductRepository(conn)
+        return [row async for row in repository.list_newest_first((product.created_at, product.guid), 10)]
+
+    assert asyncio.run(run()) == []
+    query, *args = conn.fetch.await_args.args
+    assert "(created_at, guid) < ($1, $2)" in query
+    assert "ORDER BY created_at DESC, guid DESC" in query
+    assert args == [CREATED, product.guid, 10]
@@ -0,0 +1,70 @@
+import logging
+
+import pytest
+
+from app.infrastructure.adapters.persistence.rdb.query_stats import (
+    OTHER_FINGERPRINT,
+    QueryStatsRecorder,
+    _rows,
+    fingerprint,
+    redact,
+)
+
+
+def test_literals_layout_and_comments_share_a_fingerprint():
+    first = fingerprint("SELECT * FROM products WHERE price > 10 AND name = 'a' -- hot path")
+    second = fingerprint("SELECT *\n  FROM products\n WHERE price > 2.5 /* x */ AND name = 'it''s'")
+
+    assert first == second
+    assert first[1] == "SELECT * FROM products WHERE price > ? AND name = ?"
+
+
+def test_parameter_lists_collapse_but_identifiers_keep_their_digits():
+    key, text = fingerprint("SELECT col1 FROM t2 WHERE guid IN ($1, $2, $3) AND x = $4")
+    assert text == "SELECT col1 FROM t2 WHERE guid IN (...) AND x = $4"
+    assert key == fingerprint("SELECT col1 FROM t2 WHERE guid IN ($1,$2) AND x = $4")[0]
+    assert key != fingerprint("SELECT col1 FROM t2 WHERE guid IN ($1, $2) AND y = $4")[0]
+
+
+def test_redact_keeps_only_types():
+    assert redact(["secret@example.com", 42, None]) == "$1=<str>, $2=<int>, $3=<NoneType>"
+
+
+@pytest.mark.parametrize(
+    ("result", "rows"),
+    [("UPDATE 3", 3), ("INSERT 0 1", 1), ("BEGIN", 0), ([1, 2], 2), (None, 0), ("value", 0), (7, 1)],
+)
+def test_rows_from_query_results(result, rows):
+    assert _rows(result) == rows
+
+
+def test_recorder_aggregates_per_fingerprint_with_p99():
+    recorder = QueryStatsRecorder(slow_threshold=10.0, max_fingerprints=10)
+    for index in range(1, 101):
+        recorder.record(f"SELECT * FROM products WHERE id = {index}", (), index / 1000, rows=1, failed=index == 100)
+
+    [stats] = recorder.snapshot()
+    assert (stats.calls, stats.errors, stats.rows) == (100, 1, 100)
+    assert stats.query == "SELECT * FROM products WHERE id = ?"
+    assert stats.p99_seconds == stats.max_seconds == 0.1
+    assert stats.mean_seconds == pytest.approx(0.0505)
+
+
+def test_fingerprints_past_the_limit_count_as_other():
+    recorder = QueryStatsRecorder(slow_threshold=10.0, max_fingerprints=2)
+    for table in ("a", "b", "c", "d"):
+        recorder.record(f"SELECT * FROM {table}", (), 0.001, rows=0)
+    recorder.record("SELECT * FROM a", (), 0.001, rows=0)
+
+    calls = {stats.query: stats.calls for stats in recorder.snapshot()}
+    assert calls == {"SELECT * FROM a": 2, "SELECT * FROM b": 1, OTHER_FINGERPRINT: 2}
+
+
+def test_slow_queries_are_logged_with_redacted_parameters(caplog):
+    recorder = QueryStatsRecorder(slow_threshold=0.5, max_fingerprints=10)
+    with caplog.at_level(logging.WARNING):
+        recorder.record("SELECT * FROM users WHERE email = $1", ("secret@example.com",), 0.6, rows=1)
+        recorder.record("SELECT * FROM users WHERE email = $1", ("secret@example.com",), 0.1, rows=1)
+
+    assert len(caplog.records) == 1
+    assert "$1=<str>" in caplog.text and "secret@example.com" not in caplog.text
@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+
+import fakeredis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.application.api.v1.http.middleware import RateLimitMiddleware
+from app.domain.core.config.settings import RateLimitConfig, RateLimitRule
+from app.infrastructure.adapters.cache.sharding import RedisShardRouter
+from app.infrastructure.adapters.rate_limit.limiter import RedisTokenBucketLimiter
+from app.infrastructure.ports.rate_limit import RateLimiterPort
+from tests.fixtures import FakeRedis
+
+API_KEY = b"secret-key"
+RULE = RateLimitRule(name="default", rate=10.0, burst=100)
+PEER_RULE = RateLimitRule(name="peer", rate=200.0, burst=400)
+
+
+class RecordingLimiter(RateLimiterPort):
+    def __init__(self, deny: str | None = None):
+        self.calls: list[list[tuple[str, str]]] = []
+        self._deny = deny
+
+    async def hit(self, buckets):
+        self.calls.append([(rule.name, client) for rule, client in buckets])
+        for rule, _ in buckets:
+            if rule.name == self._deny:
+                return rule, 1.0
+        return None
+
+
+class StubContainer:
+    def __init__(self, config: RateLimitConfig, limiter: RateLimiterPort):
+        self._objects = {RateLimitConfig: config, RateLimiterPort: limiter}
+
+    async def get(self, dependency):
+        return self._objects[dependency]
+
+
+def request(limiter: RecordingLimiter, headers: list[tuple[bytes, bytes]], **config) -> list[dict]:
+    config = RateLimitConfig(api_key_hashes=[hashlib.sha256(API_KEY).hexdigest()], **config)
+    sent: list[dict] = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": "/api/v1/products", "method": "GET", "headers": headers,
+             "client": ("203.0.113.7", 50000)}
+    asyncio.run(RateLimitMiddleware(app, StubContainer(config, limiter))(scope, None, send))
+    return sent
+
+
+def test_unknown_api_key_is_limited_by_peer_address():
+    limiter = RecordingLimiter()
+    request(limiter, [(b"x-api-key", b"made-up")])
+    assert limiter.calls == [[("peer", "ip:203.0.113.7"), ("default", "ip:203.0.113.7")]]
+
+
+def test_valid_api_key_gets_its_own_bucket_next_to_the_peer_one():
+    limiter = RecordingLimiter()
+    request(limiter, [(b"x-api-key", API_KEY)])
+    assert limiter.calls == [[
+        ("peer", "ip:203.0.113.7"),
+        ("default", f"key:{hashlib.sha256(API_KEY).hexdigest()}"),
+    ]]
+
+
+def test_exhausted_bucket_rejects_with_its_rule():
+    limiter = RecordingLimiter(deny="peer")
+    sent = request(limiter, [(b"x-api-key", API_KEY)])
+    assert sent[0]["status"] == 429
+    assert (b"retry-after", b"1") in sent[0]["headers"]
+
+
+def test_peer_bucket_can_be_disabled():
+    limiter = RecordingLimiter()
+    request(limiter, [], peer_rate=0)
+    assert limiter.calls == [[("default", "ip:203.0.113.7")]]
+
+
+class BucketScript:
+    """Stands in for the Lua script: buckets that never refill, all-or-nothing like the script."""
+
+    def __init__(self, tokens: int, fail: bool = False):
+        self.tokens: dict[str, int] = {}
+        self.calls: list[list[str]] = []
+        self._initial = tokens
+        self._fail = fail
+
+    async def __call__(self, keys, args, client):
+        self.calls.append(list(keys))
+        if self._fail:
+            raise RedisConnectionError("redis is down")
+        wanted = args[2::3]
+        granted = [min(lease, self.tokens.get(key, self._initial)) for key, lease in zip(keys, wanted)]
+        if not all(granted):
+            return [(0, 0 if tokens else 500) for tokens in granted]
+        for key, tokens in zip(keys, granted):
+            self.tokens[key] = self.tokens.get(key, self._initial) - tokens
+        return [(tokens, 0) for tokens in granted]
+
+
+def make_limiter(script: BucketScript) -> RedisTokenBucketLimiter:
+    limiter = RedisTokenBucketLimiter(RedisShardRouter({"main": FakeRedis()}), RateLimitConfig(lease_share=0.05))
+    limiter._script = script
+    return limiter
+
+
+def test_leased_tokens_are_spent_locally_and_denials_cached():
+    script = BucketScript(tokens=7)
+    limiter = make_limiter(script)
+
+    async def run():
+        return [await limiter.hit([(RULE, "ip:203.0.113.7")]) for _ in range(10)]
+
+    results = asyncio.run(run())
+    # Leases of 5 tokens: one call for the first five, one for the last two, one denial
+    assert results[:7] == [None] * 7
+    assert all(rule is RULE and retry_after > 0 for rule, retry_after in results[7:])
+    assert len(script.calls) == 3
+
+
+def test_all_buckets_of_a_request_go_to_redis_in_one_call():
+    script = BucketScript(tokens=100)
+    asyncio.run(make_limiter(script).hit([(PEER_RULE, "ip:203.0.113.7"), (RULE, "key:abc")]))
+    [keys] = script.calls
+    assert [key.split(":")[1] for key in keys] == ["peer", "default"]
+
+
+def test_leased_tokens_are_not_spent_when_another_bucket_denies():
+    script = BucketScript(tokens=100)
+    limiter = make_limiter(script)
+    peer = (PEER_RULE, "ip:203.0.113.7")
+
+    async def run():
+        await limiter.hit([peer])  # leases 20 peer tokens, one spent
+        script.tokens = {key: 0 for key in script.tokens}
+        script._initial = 0
+        return await limiter.hit([peer, (RULE, "key:abc")])
+
+    rule, _ = asyncio.run(run())
+    assert rule is RULE
+    [(tokens, _)] = [local for key, local in limiter._local.items() if ":peer:" in key]
+    assert tokens == 19
+
+
+def test_redis_key_does_not_contain_the_client():
+    script = BucketScript(tokens=1)
+    asyncio.run(make_limiter(script).hit([(RULE, "ip:203.0.113.7")]))
+    [[key]] = script.calls
+    assert "203.0.113.7" not in key and key.startswith("ratelimit:default:")
+
+
+def test_redis_errors_fail_open():
+    limiter = make_limiter(BucketScript(tokens=0, fail=True))
+    assert asyncio.run(limiter.hit([(RULE, "ip:203.0.113.7")])) is None
+
+
+def test_script_denies_all_buckets_when_one_is_empty():
+    redis = fakeredis.FakeAsyncRedis()
+    # Leases of one token, so every hit reaches the script; buckets barely refill
+    limiter = RedisTokenBucketLimiter(RedisShardRouter({"main": redis}), RateLimitConfig(lease_share=0.001))
+    tight = RateLimitRule(name="tight", rate=0.001, burst=1)
+    peer = (RateLimitRule(name="peer", rate=0.001, burst=10), "ip:203.0.113.7")
+
+    async def run():
+        first = await limiter.hit([peer, (tight, "ip:203.0.113.7")])
+        second = await limiter.hit([peer, (tight, "ip:203.0.113.7")])
+        peer_key = next(key for key in await redis.keys() if b":peer:" in key)
+        return first, second, float(await redis.hget(peer_key, "tokens"))
+
+    first, (rule, retry_after), peer_tokens = asyncio.run(run())
+    assert first is None
+    assert rule is tight and retry_after > 0
+    # Only the first request took a token from the peer bucket
+    assert 9 <= peer_tokens < 9.01
@@ -0,0 +1,34 @@
+import pytest
+
+from app.infrastructure.adapters.cache.sharding import HashRing
+
+NODES = ["redis-0:6379", "redis-1:6379", "redis-2:6379", "redis-3:6379"]
+KEYS = [f"product:{index}" for index in range(20_000)]
+
+
+def test_keys_spread_evenly_over_nodes():
+    ring = HashRing(NODES)
+    shares = {node: 0 for node in NODES}
+    for key in KEYS:
+        shares[ring.node_for(key)] += 1
+
+    for node, count in shares.items():
+        assert abs(count / len(KEYS) - 1 / len(NODES)) < 0.05, (node, count)
+
+
+def test_adding_a_node_remaps_about_one_in_n_keys_all_to_it():
+    before = HashRing(NODES)
+    after = HashRing([*NODES, "redis-4:6379"])
+    moved = [key for key in KEYS if before.node_for(key) != after.node_for(key)]
+
+    assert all(after.node_for(key) == "redis-4:6379" for key in moved)
+    assert abs(len(moved) / len(KEYS) - 1 / 5) < 0.05
+
+
+def test_routing_ignores_node_order():
+    assert all(HashRing(NODES).node_for(key) == HashRing(NODES[::-1]).node_for(key) for key in KEYS[:1000])
+
+
+def test_ring_needs_a_node():
+    with pytest.raises(ValueError):
+        HashRing([])
@@ -0,0 +1,10 @@
+import pytest
+
+from benchmarks.startup_budget import BUDGET_MS, import_profile
+
+
+@pytest.mark.parametrize("module", list(BUDGET_MS))
+def test_entry_point_leaves_optional_adapters_unloaded(module):
+    # The millisecond budget is enforced by the benchmark, timings are too noisy for a unit test
+    _, _, loaded = import_profile(module)
+    assert loaded == []
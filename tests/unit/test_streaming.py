@@ -0,0 +1,62 @@
+import asyncio
+import gzip
+
+from app.application.api.v1.http.streaming import DisconnectAwareStreamingResponse, gzip_stream
+
+SCOPE = {"type": "http", "asgi": {"spec_version": "2.4"}}
+
+
+async def pages(outcome: dict, more: asyncio.Event):
+    try:
+        yield b'{"page":1}\n'
+        await more.wait()  # a page query that is still running
+        yield b'{"page":2}\n'
+    except asyncio.CancelledError:
+        outcome["cancelled"] = True
+        raise
+
+
+def test_disconnect_cancels_a_pending_page():
+    outcome: dict = {}
+    sent: list[dict] = []
+
+    async def run():
+        first_page = asyncio.Event()
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body"):
+                first_page.set()
+
+        async def receive():
+            await first_page.wait()
+            return {"type": "http.disconnect"}
+
+        response = DisconnectAwareStreamingResponse(pages(outcome, asyncio.Event()))
+        await asyncio.wait_for(response(SCOPE, receive, send), timeout=1)
+
+    asyncio.run(run())
+    assert outcome == {"cancelled": True}
+    assert [message.get("body") for message in sent[1:]] == [b'{"page":1}\n']
+
+
+def test_completes_without_disconnect():
+    sent: list[dict] = []
+
+    async def run():
+        more = asyncio.Event()
+        more.set()
+
+        async def send(message):
+            sent.append(message)
+
+        async def receive():
+            await asyncio.Event().wait()
+
+        response = DisconnectAwareStreamingResponse(gzip_stream(pages({}, more)))
+        await asyncio.wait_for(response(SCOPE, receive, send), timeout=1)
+
+    asyncio.run(run())
+    assert sent[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    assert gzip.decompress(body) == b'{"page":1}\n{"page":2}\n'
@@ -0,0 +1,158 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, StatusCode
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.application.api.v1.http import middleware
+from app.application.api.v1.http.middleware import TracingMiddleware
+
+
+class RecordingSpan:
+    def __init__(self, name: str, context=None, kind=None):
+        self.name = name
+        self.context = context
+        self.kind = kind
+        self.attributes: dict = {}
+        self.status = None
+
+    def is_recording(self) -> bool:
+        return True
+
+    def set_attributes(self, attributes: dict) -> None:
+        self.attributes.update(attributes)
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def set_status(self, status) -> None:
+        self.status = status
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.spans: list[RecordingSpan] = []
+
+    @contextmanager
+    def start_as_current_span(self, name: str, context=None, kind=None):
+        span = RecordingSpan(name, context, kind)
+        self.spans.append(span)
+        yield span
+
+
+@pytest.fixture
+def tracer(monkeypatch) -> RecordingTracer:
+    tracer = RecordingTracer()
+    monkeypatch.setattr(middleware, "tracer", tracer)
+    return tracer
+
+
+async def product(request):
+    return PlainTextResponse(request.path_params["guid"])
+
+
+async def broken(request):
+    return PlainTextResponse("down", status_code=503)
+
+
+async def export(request):
+    async def pages():
+        yield b"page 1\n"
+        yield b"page 2\n"
+
+    return StreamingResponse(pages())
+
+
+APP = TracingMiddleware(Starlette(routes=[
+    Route("/products/{guid}", product),
+    Route("/broken", broken),
+    Route("/export", export),
+]))
+
+
+def call(path: str, headers: list[tuple[bytes, bytes]] = ()) -> list[dict]:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": list(headers), "client": ("127.0.0.1", 50000), "server": ("test", 80),
+    }
+    sent: list[dict] = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # the client stays connected
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(APP(scope, receive, send))
+    return sent
+
+
+def test_span_is_named_after_the_route_template(tracer):
+    sent = call("/products/0b7e3e4c")
+
+    [span] = tracer.spans
+    assert span.name == "GET /products/{guid}"
+    assert span.attributes["http.route"] == "/products/{guid}"
+    assert span.attributes["http.target"] == "/products/0b7e3e4c"
+    assert span.attributes["http.status_code"] == 200
+    assert span.status is None
+    assert sent[-1]["body"] == b"0b7e3e4c"
+
+
+def test_unmatched_path_keeps_the_method_as_name_and_is_not_an_error(tracer):
+    sent = call("/nowhere")
+
+    [span] = tracer.spans
+    assert sent[0]["status"] == 404
+    assert span.name == "GET"
+    assert "http.route" not in span.attributes
+    assert span.status is None
+
+
+def test_server_errors_mark_the_span_as_failed(tracer):
+    call("/broken")
+
+    [span] = tracer.spans
+    assert span.attributes["http.status_code"] == 503
+    assert span.status.status_code is StatusCode.ERROR
+
+
+def test_streamed_body_passes_through_and_carries_the_request_id(tracer):
+    sent = call("/export", [(b"x-request-id", b"req-1")])
+
+    assert (b"x-request-id", b"req-1") in sent[0]["headers"]
+    assert [(message.get("body"), message.get("more_body")) for message in sent[1:]] == [
+        (b"page 1\n", True),
+        (b"page 2\n", True),
+        (b"", False),
+    ]
+    assert tracer.spans[0].attributes["request.id"] == "req-1"
+
+
+def test_incoming_traceparent_becomes_the_parent(tracer):
+    traceparent = b"00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    call("/products/0b7e3e4c", [(b"traceparent", traceparent)])
+
+    [span] = tracer.spans
+    assert span.kind is SpanKind.SERVER
+    parent = trace.get_current_span(span.context).get_span_context()
+    assert parent.is_remote and parent.trace_flags.sampled
+    assert parent.trace_id == 0x0AF7651916CD43DD8448EB211C80319C
+    assert parent.span_id == 0xB7AD6B7169203331
+
+
+def test_request_without_traceparent_starts_a_new_trace(tracer):
+    call("/products/0b7e3e4c")
+
+    assert tracer.spans[0].context is None
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import uuid
+
+import pytest
+
+from app.domain.dto.product import Product
+from app.domain.errors.adapters import UoWError
+from app.infrastructure.adapters.cache.invalidation import ProductCacheInvalidator
+from app.infrastructure.adapters.persistence.rdb.repositories.idempotency import RDBIdempotencyRepository
+from app.infrastructure.adapters.persistence.rdb.repositories.product import RDBProductRepository
+from app.infrastructure.adapters.persistence.rdb.uow import RDBUnitOfWork
+
+
+class FakeTransaction:
+    def __init__(self, log: list[str], fail_commit: bool):
+        self._log = log
+        self._fail_commit = fail_commit
+
+    async def start(self):
+        self._log.append("begin")
+
+    async def commit(self):
+        if self._fail_commit:
+            raise ConnectionError("connection lost")
+        self._log.append("commit")
+
+    async def rollback(self):
+        self._log.append("rollback")
+
+
+class FakeConnection:
+    """Enough of asyncpg.Connection for the unit of work and the repository's writes."""
+
+    def __init__(self, returning: str | None = None, fail_commit: bool = False):
+        self.log: list[str] = []
+        self._returning = returning
+        self._fail_commit = fail_commit
+
+    def transaction(self) -> FakeTransaction:
+        return FakeTransaction(self.log, self._fail_commit)
+
+    async def execute(self, query, *args):
+        return "INSERT 0 1"
+
+    async def fetchval(self, query, *args):
+        return self._returning
+
+
+class RecordingHook:
+    def __init__(self, log: list[str], fail: bool = False):
+        self._log = log
+        self._fail = fail
+
+    async def after_commit(self):
+        self._log.append("hook")
+        if self._fail:
+            raise RuntimeError("hook failed")
+
+    def after_rollback(self):
+        self._log.append("hook rollback")
+
+
+class RecordingCache:
+    def __init__(self):
+        self.invalidated: list[tuple[set[uuid.UUID], set[str]]] = []
+
+    async def invalidate(self, *, guids=(), slugs=()):
+        self.invalidated.append((set(guids), set(slugs)))
+
+
+class RecordingFilter:
+    def __init__(self):
+        self.added: list[set[uuid.UUID]] = []
+
+    async def add(self, product_guids):
+        self.added.append(set(product_guids))
+
+
+def make_uow(conn: FakeConnection, *hooks) -> RDBUnitOfWork:
+    return RDBUnitOfWork(conn, RDBProductRepository(conn), RDBIdempotencyRepository(conn), hooks=hooks)
+
+
+def test_hooks_and_callbacks_run_after_the_commit():
+    conn = FakeConnection()
+    uow = make_uow(conn, RecordingHook(conn.log))
+
+    async def callback():
+        conn.log.append("callback")
+
+    async def run():
+        async with uow:
+            uow.register_after_commit(callback)
+            conn.log.append("work")
+
+    asyncio.run(run())
+    assert conn.log == ["begin", "work", "commit", "hook", "callback"]
+
+
+def test_rollback_discards_pending_callbacks():
+    conn = FakeConnection()
+    uow = make_uow(conn, RecordingHook(conn.log))
+
+    async def callback():
+        conn.log.append("callback")
+
+    async def run():
+        async with uow:
+            uow.register_after_commit(callback)
+            raise ValueError("handler failed")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert conn.log == ["begin", "rollback", "hook rollback"]
+
+
+def test_failed_commit_discards_pending_callbacks():
+    conn = FakeConnection(fail_commit=True)
+    uow = make_uow(conn, RecordingHook(conn.log))
+
+    async def callback():
+        conn.log.append("callback")
+
+    async def run():
+        async with uow:
+            uow.register_after_commit(callback)
+
+    with pytest.raises(UoWError):
+        asyncio.run(run())
+    assert conn.log == ["begin", "hook rollback"]
+
+
+def test_failing_hook_is_logged_and_does_not_fail_the_commit(caplog):
+    conn = FakeConnection()
+    uow = make_uow(conn, RecordingHook(conn.log, fail=True))
+
+    async def callback():
+        conn.log.append("callback")
+
+    async def run():
+        async with uow:
+            uow.register_after_commit(callback)
+
+    with caplog.at_level(logging.ERROR):
+        asyncio.run(run())
+    assert conn.log == ["begin", "commit", "hook", "callback"]
+    assert "After-commit hook RecordingHook failed" in caplog.text
+
+
+def test_register_after_commit_outside_a_transaction_is_an_error():
+    async def callback():
+        pass
+
+    with pytest.raises(UoWError):
+        make_uow(FakeConnection()).register_after_commit(callback)
+
+
+def test_invalidator_drops_updated_and_deleted_products_after_commit():
+    cache = RecordingCache()
+    invalidator = ProductCacheInvalidator(cache, RecordingFilter())
+    conn = FakeConnection(returning="old-lamp")
+    products = RDBProductRepository(conn, invalidator)
+    uow = RDBUnitOfWork(conn, products, RDBIdempotencyRepository(conn), hooks=[invalidator])
+    updated = Product(name="Lamp", slug="lamp", price_cents=1999)
+    deleted = uuid.uuid4()
+
+    async def run():
+        async with uow:
+            await products.update(updated)
+            await products.delete(deleted)
+            assert cache.invalidated == []
+
+    asyncio.run(run())
+    assert cache.invalidated == [({updated.guid, deleted}, {"old-lamp", "lamp"})]
+
+
+def test_invalidator_clears_negative_entries_of_created_products_and_adds_them_to_the_filter():
+    cache = RecordingCache()
+    existence_filter = RecordingFilter()
+    invalidator = ProductCacheInvalidator(cache, existence_filter)
+    conn = FakeConnection()
+    products = RDBProductRepository(conn, invalidator)
+    uow = RDBUnitOfWork(conn, products, RDBIdempotencyRepository(conn), hooks=[invalidator])
+    created = Product(name="Lamp", slug="lamp", price_cents=1999)
+
+    async def run():
+        async with uow:
+            await products.add(created)
+            assert existence_filter.added == []
+
+    asyncio.run(run())
+    assert existence_filter.added == [{created.guid}]
+    assert cache.invalidated == [({created.guid}, {"lamp"})]
+
+
+def test_invalidator_forgets_tracked_products_on_rollback():
+    cache = RecordingCache()
+    existence_filter = RecordingFilter()
+    invalidator = ProductCacheInvalidator(cache, existence_filter)
+    conn = FakeConnection(returning="lamp")
+    products = RDBProductRepository(conn, invalidator)
+    uow = RDBUnitOfWork(conn, products, RDBIdempotencyRepository(conn), hooks=[invalidator])
+
+    async def run():
+        async with uow:
+            await products.add(Product(name="Desk", slug="desk", price_cents=9999))
+            await products.delete(uuid.uuid4())
+            raise ValueError("handler failed")
+
+    async def run_next():
+        async with uow:
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    # The next transaction on the same request scope starts clean
+    asyncio.run(run_next())
+    assert cache.invalidated == []
+    assert existence_filter.added == []